@@ -1,5 +1,6 @@
-from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+import asyncio
+from typing import AsyncIterator, Callable, Generator, Optional
+from fastapi import Depends, HTTPException, Query, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
 from sqlalchemy.orm import Session
@@ -9,9 +10,13 @@ from app.core.security import decode_token
 from app.core.config import settings
 from app.models.user import User
 from app.schemas.user import TokenPayload
+from app.services.deadlines import Deadline, deadline_scope
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"/api/auth/login", auto_error=False)
 
+# Seconds between checks for a closed client connection while a query runs
+DISCONNECT_POLL_SECONDS = 0.25
+
 
 def get_current_user(
     db: Session = Depends(get_db),
@@ -89,3 +94,37 @@ def get_current_active_superuser(
             detail="Not enough privileges"
         )
     return current_user
+
+
+async def _watch_disconnect(request: Request, deadline: Deadline) -> None:
+    """Cancel a deadline once the client closes its connection."""
+    while not await request.is_disconnected():
+        await asyncio.sleep(DISCONNECT_POLL_SECONDS)
+    deadline.cancel()
+
+
+def query_deadline(endpoint: str) -> Callable[..., AsyncIterator[Deadline]]:
+    """Build the dependency giving an endpoint's queries a deadline.
+    
+    The limit is ``QUERY_TIMEOUTS[endpoint]`` if set, else ``QUERY_TIMEOUT``,
+    and a request may choose its own with the ``timeout`` parameter, up to
+    ``QUERY_TIMEOUT_MAX``. The deadline is current while the endpoint runs
+    and is cancelled if the client disconnects.
+    """
+    async def dependency(
+        request: Request,
+        timeout: Optional[float] = Query(None, gt=0, description="Seconds the query may run")
+    ) -> AsyncIterator[Deadline]:
+        limit = settings.QUERY_TIMEOUTS.get(endpoint, settings.QUERY_TIMEOUT)
+        if timeout is not None:
+            limit = min(timeout, settings.QUERY_TIMEOUT_MAX) if settings.QUERY_TIMEOUT_MAX else timeout
+        
+        deadline = Deadline(limit)
+        watcher = asyncio.create_task(_watch_disconnect(request, deadline))
+        try:
+            with deadline_scope(deadline):
+                yield deadline
+        finally:
+            watcher.cancel()
+    
+    return dependency
@@ -0,0 +1,47 @@
+import base64
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from app.models.dataset import Dataset
+from app.services.dataset_cache import canonical, dataset_version
+
+
+def query_fingerprint(dataset: Dataset, params: Dict[str, Any]) -> str:
+    """Identify a query over one version of a dataset."""
+    digest = hashlib.sha256(canonical({"version": dataset_version(dataset), **params}).encode())
+    return digest.hexdigest()[:16]
+
+
+def encode_cursor(position: int, fingerprint: str) -> str:
+    """Build an opaque cursor resuming a query at an index of its row order."""
+    payload = json.dumps({"p": position, "q": fingerprint}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, fingerprint: str) -> int:
+    """Get the index a cursor resumes from; an empty cursor starts at the first row."""
+    if not cursor:
+        return 0
+    
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        position, cursor_fingerprint = int(payload["p"]), payload["q"]
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+    
+    if position < 0:
+        raise ValueError("Invalid cursor")
+    if cursor_fingerprint != fingerprint:
+        raise ValueError("Cursor belongs to another query or an older version of the dataset")
+    return position
+
+
+def cursor_meta(next_cursor: Optional[str], page_size: int, total_rows: Optional[int]) -> Dict[str, Any]:
+    """Get the pagination fields of a cursor page response."""
+    return {
+        "next_cursor": next_cursor,
+        "page_size": page_size,
+        "total_rows": total_rows
+    }
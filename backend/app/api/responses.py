@@ -0,0 +1,111 @@
+from typing import Any, Dict, Optional
+
+import numpy as np
+import orjson
+import pandas as pd
+import pyarrow as pa
+from fastapi import Header, Response
+
+from app.services.data_processor import DataProcessor
+
+JSON = "application/json"
+COLUMNS_JSON = "application/vnd.sigmalite.columns+json"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+SUPPORTED_FORMATS = (JSON, COLUMNS_JSON, ARROW_STREAM)
+
+
+def _default(value: Any) -> Any:
+    """Encode values orjson does not handle natively."""
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps_json(content: Any) -> bytes:
+    """Serialize a response body to JSON bytes; NaN and infinity become null."""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def json_response(payload: bytes) -> Response:
+    """Return already serialized JSON, skipping response model validation."""
+    return Response(content=payload, media_type=JSON)
+
+
+def negotiate_format(accept: Optional[str] = Header(None)) -> str:
+    """Pick the response format from the Accept header, defaulting to JSON."""
+    candidates = []
+    for position, part in enumerate((accept or "").split(",")):
+        media_type, *params = [p.strip() for p in part.split(";")]
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if media_type in SUPPORTED_FORMATS and quality > 0:
+            candidates.append((-quality, position, media_type))
+    
+    return min(candidates)[2] if candidates else JSON
+
+
+def _arrow_table(df: pd.DataFrame) -> pa.Table:
+    """Convert a DataFrame to Arrow, storing mixed-type text columns as strings."""
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        df = df.copy()
+        for col in df.select_dtypes(include="object").columns:
+            df[col] = df[col].map(lambda v: v if v is None or pd.isna(v) else str(v))
+        return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def arrow_stream(df: pd.DataFrame, meta: Dict[str, Any]) -> bytes:
+    """Encode a DataFrame as an Arrow IPC stream.
+    
+    Response fields other than the rows (pagination, scalar results) are
+    stored as JSON under the ``sigmalite`` key of the schema metadata.
+    """
+    table = _arrow_table(df)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        b"sigmalite": dumps_json(meta)
+    })
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def encode_frame(
+    df: Optional[pd.DataFrame],
+    key: str,
+    meta: Dict[str, Any],
+    media_type: str
+) -> bytes:
+    """Encode a result frame and its fields in the negotiated format.
+    
+    JSON puts rows under ``key`` as records and columnar JSON as lists keyed
+    by column name. Without a frame, Arrow streams a single row of ``meta``.
+    """
+    if media_type == ARROW_STREAM:
+        if df is None:
+            return arrow_stream(pd.DataFrame({name: [value] for name, value in meta.items()}), meta)
+        return arrow_stream(df, meta)
+    
+    if df is None:
+        rows = None
+    elif media_type == COLUMNS_JSON:
+        rows = DataProcessor.to_columns(df)
+    else:
+        rows = DataProcessor.to_records(df)
+    
+    return dumps_json({key: rows, **meta})
+
+
+def encoded_response(payload: bytes, media_type: str) -> Response:
+    """Return an encoded body whose format depends on the Accept header."""
+    return Response(content=payload, media_type=media_type, headers={"Vary": "Accept"})
@@ -1,19 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import List
 
 from app.core.database import get_db
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, query_deadline
 from app.models.user import User
 from app.models.dataset import Chart as ChartModel, Sheet as SheetModel
-from app.schemas.dataset import Chart, ChartCreate, ChartUpdate
+from app.api.responses import dumps_json, json_response
+from app.schemas.dataset import Chart, ChartCreate, ChartData, ChartUpdate
+from app.services.chart_data import build_chart_data
+from app.services.dataset_cache import file_version, storage_location
+from app.services.deadlines import QueryInterrupted
+from app.services.result_cache import get_result_cache, result_key
+from app.services.rollups import dataset_chart_specs, rebuild_rollups
 
 router = APIRouter()
 
 
+def schedule_rollups(background_tasks: BackgroundTasks, db: Session, sheet: SheetModel) -> None:
+    """Rebuild the rollups of a sheet's dataset for its current charts after responding."""
+    dataset = sheet.dataset
+    if dataset.status != "ready":
+        # The ingest job builds rollups once the dataset is ready
+        return
+    path, storage_format = storage_location(dataset)
+    background_tasks.add_task(
+        rebuild_rollups,
+        path,
+        storage_format,
+        file_version(path),
+        dataset_chart_specs(db, dataset.id)
+    )
+
+
 @router.post("", response_model=Chart, status_code=status.HTTP_201_CREATED)
 def create_chart(
     chart_in: ChartCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -49,6 +72,7 @@ def create_chart(
     db.add(chart)
     db.commit()
     db.refresh(chart)
+    schedule_rollups(background_tasks, db, sheet)
     
     return chart
 
@@ -92,10 +116,75 @@ def get_chart(
     return chart
 
 
+@router.get(
+    "/{chart_id}/data",
+    response_model=ChartData,
+    dependencies=[Depends(query_deadline("chart_data"))]
+)
+def get_chart_data(
+    chart_id: int,
+    width: int = Query(1000, ge=10, le=10000),
+    height: int = Query(500, ge=10, le=10000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get a chart's plot-ready series, downsampled for a viewport of width x height pixels."""
+    chart = db.query(ChartModel).filter(
+        ChartModel.id == chart_id,
+        ChartModel.owner_id == current_user.id
+    ).first()
+    
+    if not chart:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Chart not found"
+        )
+    
+    dataset = chart.sheet.dataset
+    if dataset.status != "ready":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Dataset is {dataset.status}"
+        )
+    
+    result_cache = get_result_cache()
+    cache_key = result_key(
+        dataset,
+        "chart_data",
+        {"chart_type": chart.chart_type, "config": chart.config, "width": width, "height": height}
+    )
+    cached = result_cache.get(cache_key)
+    if cached is not None:
+        return json_response(cached)
+    
+    try:
+        result = build_chart_data(dataset, chart.chart_type, chart.config or {}, width, height)
+        payload = dumps_json({"chart_id": chart.id, **result})
+        result_cache.set(cache_key, payload)
+        return json_response(payload)
+    
+    except QueryInterrupted as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error loading chart data: {str(e)}"
+        )
+
+
 @router.put("/{chart_id}", response_model=Chart)
 def update_chart(
     chart_id: int,
     chart_update: ChartUpdate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -127,6 +216,7 @@ def update_chart(
     
     db.commit()
     db.refresh(chart)
+    schedule_rollups(background_tasks, db, chart.sheet)
     
     return chart
 
@@ -134,6 +224,7 @@ def update_chart(
 @router.delete("/{chart_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_chart(
     chart_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -149,7 +240,9 @@ def delete_chart(
             detail="Chart not found"
         )
     
+    sheet = chart.sheet
     db.delete(chart)
     db.commit()
+    schedule_rollups(background_tasks, db, sheet)
     
     return None
@@ -1,24 +1,106 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, sessionmaker
+from typing import Any, BinaryIO, Dict, List, Optional
+import asyncio
 import os
 import shutil
 from pathlib import Path
 
 from app.core.database import get_db
 from app.core.config import settings
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, query_deadline
+from app.api.pagination import cursor_meta, decode_cursor, encode_cursor, query_fingerprint
+from app.api.responses import (
+    dumps_json, json_response, encode_frame, encoded_response, negotiate_format
+)
 from app.models.user import User
 from app.models.dataset import Dataset as DatasetModel
 from app.schemas.dataset import (
-    Dataset, DatasetCreate, DatasetUpdate, DatasetData,
-    FilterQuery, AggregateRequest, AggregateResult
+    Dataset, DatasetCreate, DatasetUpdate, DatasetData, DatasetStatus,
+    FilterQuery, AggregateRequest, AggregateResult, ColumnStats, QueryRequest,
+    BinRequest, BinResult
 )
+from app.services.binning import histogram, histogram_2d, numeric_values
 from app.services.data_processor import DataProcessor
+from app.services.dataset_cache import (
+    compute_aggregate, compute_aggregates, dataset_cache, load_dataframe, load_filtered,
+    load_positions, load_rollups, load_rows, load_stats_catalog, matching_count, query_positions,
+    scan_positions
+)
+from app.services.deadlines import QueryInterrupted
+from app.services.ingest import remove_storage
+from app.services.result_cache import get_result_cache, result_key
+from app.services.ingest_jobs import ingest_jobs
+from app.services.query import QueryPlan
+from app.services.rollups import RollupStore
+from app.services.row_index import CsvRowIndex
+from app.services.stats_catalog import StatsCatalog
+from app.services.text_index import TextIndex
 
 router = APIRouter()
 
 
+def save_upload(source: BinaryIO, file_path: Path) -> None:
+    """Copy an uploaded file to disk."""
+    with open(file_path, "wb") as buffer:
+        shutil.copyfileobj(source, buffer)
+
+
+def parse_sort(values: List[str]) -> List[Dict[str, str]]:
+    """Parse ``column[:asc|desc][:nulls_first|nulls_last]`` sort parameters."""
+    sort = []
+    for value in values:
+        parts = value.split(":")
+        key = {"direction": "asc", "nulls": "last"}
+        if len(parts) > 1 and parts[-1] in ("nulls_first", "nulls_last"):
+            key["nulls"] = parts.pop()[len("nulls_"):]
+        if len(parts) > 1 and parts[-1] in ("asc", "desc"):
+            key["direction"] = parts.pop()
+        key["column"] = ":".join(parts)
+        sort.append(key)
+    return sort
+
+
+def cursor_page(
+    dataset: DatasetModel,
+    filters: List[Dict[str, Any]],
+    logic: str,
+    sort: List[Dict[str, Any]],
+    cursor: str,
+    page_size: int,
+    include_total: bool,
+    media_type: str
+) -> bytes:
+    """Encode the rows following a cursor along with the cursor of the next batch.
+    
+    The total row count is included when it is known without extra work,
+    or computed when ``include_total`` is set.
+    """
+    fingerprint = query_fingerprint(dataset, {"filters": filters, "logic": logic, "sort": sort})
+    positions, resume = scan_positions(
+        dataset, filters, logic, sort, decode_cursor(cursor, fingerprint), page_size
+    )
+    
+    next_cursor = None if resume is None else encode_cursor(resume, fingerprint)
+    total_rows = matching_count(dataset, filters, logic, compute=include_total)
+    return encode_frame(
+        load_positions(dataset, positions),
+        "data",
+        cursor_meta(next_cursor, page_size, total_rows),
+        media_type
+    )
+
+
+def ensure_ready(dataset: DatasetModel) -> None:
+    """Reject data requests for datasets that have not finished ingesting."""
+    if dataset.status != "ready":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Dataset is {dataset.status}"
+        )
+
+
 @router.post("", response_model=Dataset, status_code=status.HTTP_201_CREATED)
 async def upload_dataset(
     name: str = Form(...),
@@ -50,44 +132,40 @@ async def upload_dataset(
     user_upload_dir = Path(settings.UPLOAD_DIR) / str(current_user.id)
     user_upload_dir.mkdir(parents=True, exist_ok=True)
     
-    # Save file
+    # Save file off the event loop so other clients keep being served
     file_path = user_upload_dir / file.filename
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    await run_in_threadpool(save_upload, file.file, file_path)
     
-    try:
-        # Process file
-        processor = DataProcessor()
-        df = processor.read_csv(str(file_path))
-        schema = processor.infer_schema(df)
-        
-        # Create dataset record
-        dataset = DatasetModel(
-            name=name,
-            description=description,
-            file_name=file.filename,
-            file_path=str(file_path),
-            file_size=file_size,
-            row_count=len(df),
-            column_count=len(df.columns),
-            schema=schema,
-            owner_id=current_user.id
-        )
-        
-        db.add(dataset)
-        db.commit()
-        db.refresh(dataset)
-        
-        return dataset
+    storage_format = settings.DATASET_STORAGE_FORMAT
+    storage_path = (
+        None if storage_format == "csv"
+        else str(file_path.with_suffix(f".{storage_format}"))
+    )
     
-    except Exception as e:
-        # Clean up file if processing fails
-        if file_path.exists():
-            file_path.unlink()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error processing file: {str(e)}"
-        )
+    # Create dataset record; parsing happens in a background ingest job
+    dataset = DatasetModel(
+        name=name,
+        description=description,
+        file_name=file.filename,
+        file_path=str(file_path),
+        file_size=file_size,
+        storage_path=storage_path,
+        storage_format=storage_format,
+        status="processing",
+        owner_id=current_user.id
+    )
+    
+    db.add(dataset)
+    db.commit()
+    db.refresh(dataset)
+    
+    ingest_jobs.submit(
+        dataset.id,
+        sessionmaker(autocommit=False, autoflush=False, bind=db.get_bind()),
+        asyncio.get_running_loop()
+    )
+    
+    return dataset
 
 
 @router.get("", response_model=List[Dataset])
@@ -126,15 +204,50 @@ def get_dataset(
     return dataset
 
 
-@router.get("/{dataset_id}/data", response_model=DatasetData)
+@router.get("/{dataset_id}/status", response_model=DatasetStatus)
+def get_dataset_status(
+    dataset_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get the ingest status of a dataset."""
+    dataset = db.query(DatasetModel).filter(
+        DatasetModel.id == dataset_id,
+        DatasetModel.owner_id == current_user.id
+    ).first()
+    
+    if not dataset:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dataset not found"
+        )
+    
+    return dataset
+
+
+@router.get(
+    "/{dataset_id}/data",
+    response_model=DatasetData,
+    dependencies=[Depends(query_deadline("data"))]
+)
 def get_dataset_data(
     dataset_id: int,
     page: int = 1,
     page_size: int = 100,
+    sort: List[str] = Query([]),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    media_type: str = Depends(negotiate_format),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get dataset data with pagination."""
+    """Get dataset data with pagination, optionally sorted.
+    
+    Each ``sort`` parameter is ``column[:asc|desc][:nulls_first|nulls_last]``;
+    repeat it to sort by several keys. Passing ``cursor`` (empty for the
+    first batch) switches from page numbers to the ``next_cursor`` of the
+    previous response.
+    """
     dataset = db.query(DatasetModel).filter(
         DatasetModel.id == dataset_id,
         DatasetModel.owner_id == current_user.id
@@ -146,13 +259,34 @@ def get_dataset_data(
             detail="Dataset not found"
         )
     
+    ensure_ready(dataset)
+    
     try:
         processor = DataProcessor()
-        df = processor.read_csv(dataset.file_path)
-        result = processor.get_data_page(df, page, page_size)
+        if cursor is not None:
+            payload = cursor_page(
+                dataset, [], "and", parse_sort(sort), cursor, page_size, include_total, media_type
+            )
+            return encoded_response(payload, media_type)
         
-        return result
+        start = (page - 1) * page_size
+        page_data, total_rows = load_rows(dataset, start, start + page_size, parse_sort(sort))
+        payload = encode_frame(
+            page_data, "data", processor.page_meta(total_rows, page, page_size), media_type
+        )
+        
+        return encoded_response(payload, media_type)
     
+    except QueryInterrupted as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -160,10 +294,15 @@ def get_dataset_data(
         )
 
 
-@router.post("/{dataset_id}/filter", response_model=DatasetData)
+@router.post(
+    "/{dataset_id}/filter",
+    response_model=DatasetData,
+    dependencies=[Depends(query_deadline("filter"))]
+)
 def filter_dataset(
     dataset_id: int,
     filter_query: FilterQuery,
+    media_type: str = Depends(negotiate_format),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -179,23 +318,68 @@ def filter_dataset(
             detail="Dataset not found"
         )
     
+    ensure_ready(dataset)
+    
+    result_cache = get_result_cache()
+    cache_key = result_key(dataset, "filter", {**filter_query.dict(), "format": media_type})
+    cached = result_cache.get(cache_key)
+    if cached is not None:
+        return encoded_response(cached, media_type)
+    
     try:
         processor = DataProcessor()
-        df = processor.read_csv(dataset.file_path)
         
-        # Apply filters
-        filters = [f.dict() for f in filter_query.filters]
-        filtered_df = processor.apply_filters(df, filters, filter_query.logic)
+        if filter_query.cursor is not None:
+            payload = cursor_page(
+                dataset,
+                [f.dict() for f in filter_query.filters],
+                filter_query.logic,
+                [key.dict() for key in filter_query.sort],
+                filter_query.cursor,
+                filter_query.page_size,
+                filter_query.include_total,
+                media_type
+            )
+            result_cache.set(cache_key, payload)
+            return encoded_response(payload, media_type)
+        
+        # Matching rows in sort order are cached, so each page is a slice
+        positions = query_positions(
+            dataset,
+            [f.dict() for f in filter_query.filters],
+            filter_query.logic,
+            [key.dict() for key in filter_query.sort]
+        )
+        
+        start = (filter_query.page - 1) * filter_query.page_size
+        stop = start + filter_query.page_size
+        if positions is None:
+            page_data, total_rows = load_rows(dataset, start, stop)
+        else:
+            page_data = load_positions(dataset, positions[start:stop])
+            total_rows = len(positions)
         
         # Get paginated result
-        result = processor.get_data_page(
-            filtered_df,
-            filter_query.page,
-            filter_query.page_size
+        payload = encode_frame(
+            page_data,
+            "data",
+            processor.page_meta(total_rows, filter_query.page, filter_query.page_size),
+            media_type
         )
         
-        return result
+        result_cache.set(cache_key, payload)
+        return encoded_response(payload, media_type)
     
+    except QueryInterrupted as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -203,14 +387,26 @@ def filter_dataset(
         )
 
 
-@router.post("/{dataset_id}/aggregate", response_model=AggregateResult)
+@router.post(
+    "/{dataset_id}/aggregate",
+    response_model=AggregateResult,
+    dependencies=[Depends(query_deadline("aggregate"))]
+)
 def aggregate_dataset(
     dataset_id: int,
     agg_request: AggregateRequest,
+    media_type: str = Depends(negotiate_format),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Aggregate dataset data."""
+    """Aggregate dataset data.
+    
+    A list of ``aggregates`` is computed in one pass over shared groups;
+    without ``group_by`` their values come back under ``results``. With
+    ``approximate`` set, ungrouped aggregates are answered from the
+    sketches recorded at ingest where possible. Grouped sums, counts,
+    averages and extremes come from a chart rollup when one covers them.
+    """
     dataset = db.query(DatasetModel).filter(
         DatasetModel.id == dataset_id,
         DatasetModel.owner_id == current_user.id
@@ -222,19 +418,80 @@ def aggregate_dataset(
             detail="Dataset not found"
         )
     
+    ensure_ready(dataset)
+    
+    result_cache = get_result_cache()
+    cache_key = result_key(dataset, "aggregate", {**agg_request.dict(), "format": media_type})
+    cached = result_cache.get(cache_key)
+    if cached is not None:
+        return encoded_response(cached, media_type)
+    
     try:
         processor = DataProcessor()
-        df = processor.read_csv(dataset.file_path)
-        
-        result = processor.aggregate(
-            df,
-            agg_request.column,
-            agg_request.operation,
-            agg_request.group_by
+        group_by = agg_request.group_by or []
+        catalog = (
+            load_stats_catalog(dataset) if agg_request.approximate and not group_by else None
         )
+        rollups = load_rollups(dataset) if group_by else None
+        
+        if agg_request.aggregates:
+            aggregates = [agg.dict() for agg in agg_request.aggregates]
+            aliases = [agg.alias or f"{agg.column}_{agg.operation}" for agg in agg_request.aggregates]
+            sketched, error_bounds = {}, {}
+            if catalog is not None:
+                sketched, error_bounds, aggregates = catalog.aggregate_many(aggregates)
+            
+            rollup = rollups.find(group_by, aggregates) if rollups is not None else None
+            if rollup is not None:
+                frame = rollup.aggregate(group_by, aggregates)
+            elif aggregates:
+                frame = compute_aggregates(dataset, aggregates, group_by)
+            
+            if group_by:
+                payload = encode_frame(frame, "group_results", {"result": None}, media_type)
+            else:
+                computed = processor.to_records(frame)[0] if aggregates else {}
+                meta = {
+                    "result": None,
+                    "results": {alias: sketched.get(alias, computed.get(alias)) for alias in aliases}
+                }
+                if catalog is not None:
+                    meta["approximate"] = bool(sketched)
+                    meta["error_bounds"] = {alias: error_bounds.get(alias, 0.0) for alias in aliases}
+                payload = encode_frame(None, "group_results", meta, media_type)
+        elif agg_request.column and agg_request.operation:
+            answer = (
+                catalog.aggregate(agg_request.column, agg_request.operation) if catalog else None
+            )
+            single = [{
+                "column": agg_request.column,
+                "operation": agg_request.operation,
+                "alias": agg_request.column
+            }]
+            rollup = rollups.find(group_by, single) if rollups is not None else None
+            if answer is not None:
+                value, error = answer
+                meta = {"result": value, "approximate": True, "error_bounds": {"result": error}}
+                payload = encode_frame(None, "group_results", meta, media_type)
+            elif rollup is not None:
+                groups = rollup.aggregate(group_by, single)
+                payload = encode_frame(groups, "group_results", {"result": None}, media_type)
+            else:
+                value, groups = compute_aggregate(
+                    dataset, agg_request.column, agg_request.operation, group_by
+                )
+                payload = encode_frame(groups, "group_results", {"result": value}, media_type)
+        else:
+            raise ValueError("Provide a column and operation, or a list of aggregates")
         
-        return result
+        result_cache.set(cache_key, payload)
+        return encoded_response(payload, media_type)
     
+    except QueryInterrupted as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e)
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -247,6 +504,212 @@ def aggregate_dataset(
         )
 
 
+@router.post(
+    "/{dataset_id}/query",
+    response_model=DatasetData,
+    dependencies=[Depends(query_deadline("query"))]
+)
+def query_dataset(
+    dataset_id: int,
+    query: QueryRequest,
+    media_type: str = Depends(negotiate_format),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Run filters, aggregates, sort and projection over a dataset in one request."""
+    dataset = db.query(DatasetModel).filter(
+        DatasetModel.id == dataset_id,
+        DatasetModel.owner_id == current_user.id
+    ).first()
+    
+    if not dataset:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dataset not found"
+        )
+    
+    ensure_ready(dataset)
+    
+    result_cache = get_result_cache()
+    cache_key = result_key(dataset, "query", {**query.dict(), "format": media_type})
+    cached = result_cache.get(cache_key)
+    if cached is not None:
+        return encoded_response(cached, media_type)
+    
+    try:
+        processor = DataProcessor()
+        plan = QueryPlan(
+            query.dict(), [c["name"] for c in (dataset.schema or {}).get("columns", [])]
+        )
+        page_data, total_rows = plan.execute(dataset)
+        
+        payload = encode_frame(
+            page_data,
+            "data",
+            processor.page_meta(total_rows, query.page, query.page_size),
+            media_type
+        )
+        result_cache.set(cache_key, payload)
+        return encoded_response(payload, media_type)
+    
+    except QueryInterrupted as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error querying dataset: {str(e)}"
+        )
+
+
+@router.get(
+    "/{dataset_id}/columns/{column}/stats",
+    response_model=ColumnStats,
+    dependencies=[Depends(query_deadline("column_stats"))]
+)
+def get_column_stats(
+    dataset_id: int,
+    column: str,
+    approximate: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get statistics for a dataset column.
+    
+    Statistics are served from the catalog recorded at ingest. While the
+    exact ones are still being built the column is scanned, or with
+    ``approximate`` set, sketch estimates are returned with error bounds.
+    """
+    dataset = db.query(DatasetModel).filter(
+        DatasetModel.id == dataset_id,
+        DatasetModel.owner_id == current_user.id
+    ).first()
+    
+    if not dataset:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dataset not found"
+        )
+    
+    ensure_ready(dataset)
+    
+    result_cache = get_result_cache()
+    cache_key = result_key(
+        dataset, "column_stats", {"column": column, "approximate": approximate}
+    )
+    cached = result_cache.get(cache_key)
+    if cached is not None:
+        return json_response(cached)
+    
+    try:
+        processor = DataProcessor()
+        catalog = load_stats_catalog(dataset)
+        result = catalog.exact_stats(column) if catalog is not None else None
+        if result is None and approximate and catalog is not None:
+            result = catalog.column_stats(column)
+        if result is None:
+            df = load_dataframe(dataset, [column])
+            result = processor.get_column_stats(df, column)
+        
+        payload = dumps_json(result)
+        result_cache.set(cache_key, payload)
+        return json_response(payload)
+    
+    except QueryInterrupted as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error computing column statistics: {str(e)}"
+        )
+
+
+@router.post(
+    "/{dataset_id}/histogram",
+    response_model=BinResult,
+    dependencies=[Depends(query_deadline("histogram"))]
+)
+def bin_dataset(
+    dataset_id: int,
+    bin_request: BinRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Count the values of a numeric column in bins, or of two columns in a 2D grid."""
+    dataset = db.query(DatasetModel).filter(
+        DatasetModel.id == dataset_id,
+        DatasetModel.owner_id == current_user.id
+    ).first()
+    
+    if not dataset:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dataset not found"
+        )
+    
+    ensure_ready(dataset)
+    
+    result_cache = get_result_cache()
+    cache_key = result_key(dataset, "histogram", bin_request.dict())
+    cached = result_cache.get(cache_key)
+    if cached is not None:
+        return json_response(cached)
+    
+    try:
+        columns = [bin_request.column, *([bin_request.y_column] if bin_request.y_column else [])]
+        known = {c["name"] for c in (dataset.schema or {}).get("columns", [])}
+        for column in columns:
+            if column not in known:
+                raise ValueError(f"Column '{column}' not found")
+        
+        filters = [f.dict() for f in bin_request.filters]
+        df = load_filtered(dataset, list(dict.fromkeys(columns)), filters, bin_request.logic)
+        x = numeric_values(df[bin_request.column])
+        if bin_request.y_column:
+            bins = histogram_2d(
+                x, numeric_values(df[bin_request.y_column]), bin_request.bins, bin_request.shape
+            )
+        else:
+            bins = histogram(x, bin_request.method, bin_request.bins)
+        
+        payload = dumps_json(
+            {"column": bin_request.column, "y_column": bin_request.y_column, **bins}
+        )
+        result_cache.set(cache_key, payload)
+        return json_response(payload)
+    
+    except QueryInterrupted as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error binning dataset: {str(e)}"
+        )
+
+
 @router.put("/{dataset_id}", response_model=Dataset)
 def update_dataset(
     dataset_id: int,
@@ -294,10 +757,15 @@ def delete_dataset(
             detail="Dataset not found"
         )
     
-    # Delete file
-    file_path = Path(dataset.file_path)
-    if file_path.exists():
-        file_path.unlink()
+    # Drop cached data and delete files
+    dataset_cache.invalidate(dataset.id)
+    get_result_cache().invalidate(dataset.id)
+    remove_storage(dataset.file_path)
+    remove_storage(dataset.storage_path)
+    remove_storage(CsvRowIndex.path_for(dataset.file_path))
+    remove_storage(TextIndex.directory_for(dataset.storage_path or dataset.file_path))
+    remove_storage(StatsCatalog.path_for(dataset.storage_path or dataset.file_path))
+    remove_storage(RollupStore.directory_for(dataset.storage_path or dataset.file_path))
     
     # Delete database record
     db.delete(dataset)
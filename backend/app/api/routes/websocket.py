@@ -144,3 +144,30 @@ async def websocket_endpoint(
     except Exception as e:
         print(f"WebSocket error: {e}")
         manager.disconnect(websocket)
+
+
+@router.websocket("/notifications")
+async def notifications_endpoint(
+    websocket: WebSocket,
+    token: str = Query(...),
+    db: Session = Depends(get_db)
+):
+    """WebSocket endpoint for per-user notifications such as ingest progress."""
+    user = await get_user_from_token(token, db)
+    if not user:
+        await websocket.close(code=1008, reason="Unauthorized")
+        return
+    
+    await manager.connect_user(websocket, user.id)
+    
+    try:
+        # Nothing is expected from the client; keep the connection open
+        while True:
+            await websocket.receive_text()
+    
+    except WebSocketDisconnect:
+        manager.disconnect_user(websocket, user.id)
+    
+    except Exception as e:
+        print(f"WebSocket error: {e}")
+        manager.disconnect_user(websocket, user.id)
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List, Union
+from typing import Dict, List, Union
 import os
 
 
@@ -18,6 +18,12 @@ class Settings(BaseSettings):
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
     
+    # Query result cache
+    RESULT_CACHE_BACKEND: str = "auto"  # auto (Redis if reachable), redis or memory
+    RESULT_CACHE_TTL: int = 300  # Seconds
+    RESULT_CACHE_MAX_BYTES: int = 67108864  # 64MB for the in-process fallback
+    RESULT_CACHE_MAX_ENTRY_BYTES: int = 1048576  # 1MB, larger results are not cached
+    
     # JWT
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
@@ -28,8 +34,28 @@ class Settings(BaseSettings):
     ALLOWED_ORIGINS: Union[List[str], str] = "http://localhost:5173,http://localhost:3000"
     
     # File Upload
-    MAX_UPLOAD_SIZE: int = 10485760  # 10MB
+    MAX_UPLOAD_SIZE: int = 2147483648  # 2GB
     UPLOAD_DIR: str = "./uploads"
+    DATASET_STORAGE_FORMAT: str = "columns"  # columns (memory-mapped), parquet or csv
+    ROW_INDEX_STRIDE: int = 1000  # Rows between byte offsets in CSV row indexes
+    INGEST_CHUNK_ROWS: int = 100000  # Rows parsed per chunk during upload
+    INGEST_WORKERS: int = 2  # Background threads converting uploads
+    CATEGORY_MAX_RATIO: float = 0.1  # Dictionary-encode text columns with distinct/non-null at most this
+    CATEGORY_MAX_DISTINCT: int = 10000  # ...and at most this many distinct values, 0 for no cap
+    TEXT_INDEX_MIN_ROWS: int = 100000  # Index text columns for search in datasets this large, -1 disables
+    
+    # Dataset cache
+    DATASET_CACHE_MAX_BYTES: int = 536870912  # 512MB of loaded DataFrames
+    BITMAP_MAX_CARDINALITY: int = 256  # Keep per-value row bitmaps for category columns up to this many values
+    
+    # Process pool
+    PROCESS_POOL_WORKERS: int = 0  # Worker processes for parsing, filters and aggregates, 0 runs them in request threads
+    PROCESS_POOL_MIN_ROWS: int = 1000000  # Send scans of datasets at least this large to the workers
+    
+    # Query deadlines
+    QUERY_TIMEOUT: float = 30.0  # Seconds a data, filter, aggregate or chart query may run, 0 for no limit
+    QUERY_TIMEOUTS: Dict[str, float] = {}  # Per-endpoint limits, e.g. {"aggregate": 60, "chart_data": 10}
+    QUERY_TIMEOUT_MAX: float = 300.0  # Most seconds a request may ask for with ``timeout``, 0 for no cap
     
     # Environment
     ENVIRONMENT: str = "development"
@@ -41,7 +67,7 @@ class Settings(BaseSettings):
     class Config:
         env_file = ".env"
         case_sensitive = True
-        
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         # Create upload directory if it doesn't exist
@@ -1,10 +1,16 @@
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.database import engine, Base, SessionLocal
 from app.api.routes import auth, datasets, sheets, charts, websocket
+from app.services.dataset_cache import dataset_cache
+from app.services.ingest_jobs import ingest_jobs
+from app.services.process_pool import process_pool
+from app.services.result_cache import get_result_cache
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
@@ -32,7 +38,12 @@ app.add_middleware(
 @app.get("/health")
 def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "version": settings.VERSION}
+    return {
+        "status": "healthy",
+        "version": settings.VERSION,
+        "dataset_cache": dataset_cache.stats(),
+        "result_cache": get_result_cache().stats()
+    }
 
 
 # Include routers
@@ -43,6 +54,19 @@ app.include_router(charts.router, prefix=f"{settings.API_V1_STR}/charts", tags=[
 app.include_router(websocket.router, prefix="/ws", tags=["WebSocket"])
 
 
+@app.on_event("startup")
+async def resume_ingest_jobs():
+    """Requeue ingest jobs a previous run of the server left unfinished."""
+    ingest_jobs.resume(SessionLocal, asyncio.get_running_loop())
+
+
+@app.on_event("shutdown")
+def shutdown_ingest_jobs():
+    """Let running ingest jobs and pool tasks finish before the process exits."""
+    ingest_jobs.shutdown()
+    process_pool.shutdown()
+
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
@@ -15,9 +15,13 @@ class Dataset(Base):
     file_name = Column(String, nullable=False)
     file_path = Column(String, nullable=False)
     file_size = Column(BigInteger, nullable=False)
+    storage_path = Column(String, nullable=True)  # Columnar copy of the upload
+    storage_format = Column(String, nullable=True)  # columns, parquet, csv
     row_count = Column(Integer, nullable=False, default=0)
     column_count = Column(Integer, nullable=False, default=0)
     schema = Column(JSON, nullable=True)  # Store column names and types
+    status = Column(String, nullable=False, default="ready", server_default="ready")  # processing, ready, failed
+    error = Column(String, nullable=True)  # Ingest failure message
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -2,16 +2,18 @@ from app.schemas.user import (
     User, UserCreate, UserUpdate, UserLogin, Token, TokenPayload
 )
 from app.schemas.dataset import (
-    Dataset, DatasetCreate, DatasetUpdate, DatasetData,
+    Dataset, DatasetCreate, DatasetUpdate, DatasetData, DatasetStatus,
     Sheet, SheetCreate, SheetUpdate,
     Chart, ChartCreate, ChartUpdate,
-    FilterQuery, FilterRequest, AggregateRequest, AggregateResult
+    FilterQuery, FilterRequest, AggregateRequest, AggregateResult, ColumnStats,
+    QueryRequest, QueryAggregate, SortKey
 )
 
 __all__ = [
     "User", "UserCreate", "UserUpdate", "UserLogin", "Token", "TokenPayload",
-    "Dataset", "DatasetCreate", "DatasetUpdate", "DatasetData",
+    "Dataset", "DatasetCreate", "DatasetUpdate", "DatasetData", "DatasetStatus",
     "Sheet", "SheetCreate", "SheetUpdate",
     "Chart", "ChartCreate", "ChartUpdate",
-    "FilterQuery", "FilterRequest", "AggregateRequest", "AggregateResult"
+    "FilterQuery", "FilterRequest", "AggregateRequest", "AggregateResult", "ColumnStats",
+    "QueryRequest", "QueryAggregate", "SortKey"
 ]
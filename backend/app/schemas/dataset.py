@@ -25,9 +25,12 @@ class Dataset(DatasetBase):
     id: int
     file_name: str
     file_size: int
+    storage_format: Optional[str] = None
     row_count: int
     column_count: int
     schema: Optional[Dict[str, Any]] = None
+    status: str = "ready"
+    error: Optional[str] = None
     owner_id: int
     created_at: datetime
     updated_at: Optional[datetime] = None
@@ -36,13 +39,30 @@ class Dataset(DatasetBase):
         from_attributes = True
 
 
+class DatasetStatus(BaseModel):
+    """Schema for dataset ingest status."""
+    id: int
+    status: str  # processing, ready, failed
+    error: Optional[str] = None
+    row_count: int
+    column_count: int
+    
+    class Config:
+        from_attributes = True
+
+
 class DatasetData(BaseModel):
-    """Schema for dataset data with pagination."""
+    """Schema for dataset data with pagination.
+    
+    Cursor pages carry ``next_cursor`` instead of page numbers, and
+    ``total_rows`` only when it was requested or already known.
+    """
     data: List[Dict[str, Any]]
-    total_rows: int
-    page: int
+    total_rows: Optional[int] = None
+    page: Optional[int] = None
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 class FilterRequest(BaseModel):
@@ -50,27 +70,132 @@ class FilterRequest(BaseModel):
     column: str
     operator: str  # eq, ne, gt, lt, gte, lte, contains, startswith, endswith
     value: Any
-    
+
+
+class SortKey(BaseModel):
+    """Schema for one sort key."""
+    column: str
+    direction: str = "asc"  # asc, desc
+    nulls: str = "last"  # first, last
+
 
 class FilterQuery(BaseModel):
     """Schema for multiple filters."""
     filters: List[FilterRequest]
     logic: str = "and"  # and, or
+    sort: List[SortKey] = []
     page: int = Field(default=1, ge=1)
     page_size: int = Field(default=100, ge=1, le=1000)
+    cursor: Optional[str] = None  # "" for the first batch, then next_cursor
+    include_total: bool = False
 
 
-class AggregateRequest(BaseModel):
-    """Schema for aggregation request."""
+class QueryAggregate(BaseModel):
+    """Schema for one aggregate of a query."""
     column: str
-    operation: str  # sum, avg, min, max, count, median
+    # sum, avg, min, max, count, median, count_distinct, stddev, variance or p<0-100>
+    operation: str
+    alias: Optional[str] = None  # Defaults to <column>_<operation>
+
+
+class AggregateRequest(BaseModel):
+    """Schema for aggregation request.
+    
+    Either a single ``column`` and ``operation``, or a list of
+    ``aggregates`` computed together over the same groups.
+    """
+    column: Optional[str] = None
+    operation: Optional[str] = None  # Any QueryAggregate operation
+    aggregates: List[QueryAggregate] = []
     group_by: Optional[List[str]] = None
+    approximate: bool = False  # Answer ungrouped aggregates from ingest-time sketches
 
 
 class AggregateResult(BaseModel):
-    """Schema for aggregation result."""
-    result: Any
+    """Schema for aggregation result.
+    
+    Approximate results carry ``error_bounds`` by output name (``result``
+    for a single aggregate): relative error for distinct counts, rank
+    error for medians and percentiles, 0 for exact values.
+    """
+    result: Any = None
+    results: Optional[Dict[str, Any]] = None  # Ungrouped aggregates by name
     group_results: Optional[List[Dict[str, Any]]] = None
+    approximate: bool = False
+    error_bounds: Optional[Dict[str, float]] = None
+
+
+class QueryRequest(BaseModel):
+    """Schema for a query combining filters, aggregates, sort and projection."""
+    filters: List[FilterRequest] = []
+    logic: str = "and"  # and, or
+    group_by: List[str] = []
+    aggregates: List[QueryAggregate] = []
+    sort: List[SortKey] = []
+    columns: Optional[List[str]] = None  # Output columns, all by default
+    page: int = Field(default=1, ge=1)
+    page_size: int = Field(default=100, ge=1, le=1000)
+
+
+class ColumnHistogram(BaseModel):
+    """Schema for a histogram; bin i counts values from edges[i] to edges[i + 1]."""
+    edges: List[float]
+    counts: List[int]
+
+
+class ValueCount(BaseModel):
+    """Schema for a value and how many rows hold it."""
+    value: Any
+    count: int
+
+
+class ColumnStats(BaseModel):
+    """Schema for column statistics."""
+    column: str
+    count: int
+    null_count: int
+    unique_count: int
+    mean: Optional[float] = None
+    median: Optional[float] = None
+    std: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    q25: Optional[float] = None
+    q75: Optional[float] = None
+    histogram: Optional[ColumnHistogram] = None
+    top_values: Optional[List[ValueCount]] = None
+    approximate: bool = False
+    error_bounds: Optional[Dict[str, float]] = None  # As for AggregateResult
+
+
+class BinRequest(BaseModel):
+    """Schema for binning a numeric column, or a pair of them in 2D."""
+    column: str
+    y_column: Optional[str] = None  # Bin in 2D against this column
+    method: str = "fixed"  # fixed, quantile, fd (Freedman-Diaconis); 1D only
+    bins: int = Field(default=20, ge=1, le=1000)  # Per axis in 2D, the most allowed for fd
+    shape: str = "rect"  # rect, hex; 2D only
+    filters: List[FilterRequest] = []
+    logic: str = "and"  # and, or
+
+
+class BinResult(BaseModel):
+    """Schema for binned counts.
+    
+    1D results have ``edges``, with bin i counting values from edges[i]
+    to edges[i + 1]. Rectangular 2D results have ``x_edges``, ``y_edges``
+    and ``counts[j][i]`` for x bin i and y bin j; hexagonal ones have the
+    ``centers`` and counts of occupied cells and the cell spacing.
+    """
+    column: str
+    y_column: Optional[str] = None
+    count: int  # Values binned, excluding nulls
+    counts: List[Any]
+    edges: Optional[List[float]] = None
+    x_edges: Optional[List[float]] = None
+    y_edges: Optional[List[float]] = None
+    centers: Optional[List[List[float]]] = None
+    hex_size: Optional[List[float]] = None
 
 
 # Sheet schemas
@@ -135,3 +260,20 @@ class Chart(ChartBase):
     
     class Config:
         from_attributes = True
+
+
+class ChartSeries(BaseModel):
+    """Schema for one plotted series of a chart."""
+    name: str
+    x: List[Any]
+    y: List[Any]
+    counts: Optional[List[int]] = None  # Rows behind each thinned scatter point
+
+
+class ChartData(BaseModel):
+    """Schema for plot-ready chart data."""
+    chart_id: int
+    chart_type: str
+    series: List[ChartSeries]
+    total_points: int  # Points before downsampling
+    downsampled: bool
@@ -0,0 +1,123 @@
+from typing import Any, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+METHODS = ("fixed", "quantile", "fd")
+SHAPES = ("rect", "hex")
+
+
+def numeric_values(values: pd.Series) -> np.ndarray:
+    """Get a numeric column as floats, rejecting other types."""
+    if not pd.api.types.is_numeric_dtype(values) or values.dtype.kind == "b":
+        raise ValueError(f"Column '{values.name}' is not numeric")
+    return values.to_numpy(dtype=float, na_value=np.nan)
+
+
+def bin_edges(values: np.ndarray, method: str, bins: int) -> np.ndarray:
+    """Get bin edges for finite values.
+    
+    ``fixed`` splits the range into ``bins`` equal widths, ``quantile``
+    puts about the same number of values in each bin, merging bins that
+    ties make empty, and ``fd`` sizes bins by the Freedman–Diaconis rule,
+    falling back to ``bins`` fixed widths when it would need more. Constant
+    values get one quantile bin of unit width around them.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown binning method: {method}")
+    if method == "quantile":
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)))
+        if len(edges) < 2:
+            return np.array([values[0] - 0.5, values[0] + 0.5])
+        return edges
+    if method == "fd":
+        # Count the bins before building any edges: an outlier past a narrow
+        # IQR would otherwise need millions of them
+        q1, q3 = np.percentile(values, [25, 75])
+        width = 2 * (q3 - q1) * len(values) ** (-1 / 3)
+        if width > 0:
+            count = int(np.ceil((values.max() - values.min()) / width))
+            if count <= bins:
+                return np.histogram_bin_edges(values, bins=max(1, count))
+    return np.histogram_bin_edges(values, bins=bins)
+
+
+def histogram(values: np.ndarray, method: str, bins: int) -> Dict[str, Any]:
+    """Bin a column; bin i counts values from edges[i] up to edges[i + 1]."""
+    values = values[np.isfinite(values)]
+    if not len(values):
+        return {"count": 0, "edges": [], "counts": []}
+    
+    edges = bin_edges(values, method, bins)
+    counts, edges = np.histogram(values, bins=edges)
+    return {"count": len(values), "edges": edges.tolist(), "counts": counts.tolist()}
+
+
+def _finite_pairs(x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    keep = np.isfinite(x) & np.isfinite(y)
+    return x[keep], y[keep]
+
+
+def histogram_2d(x: np.ndarray, y: np.ndarray, bins: int, shape: str) -> Dict[str, Any]:
+    """Bin pairs of values into a grid of ``bins`` cells per axis.
+    
+    Rectangular grids return ``counts[j][i]`` for x bin i and y bin j;
+    hexagonal grids return the centers and counts of occupied cells.
+    """
+    if shape not in SHAPES:
+        raise ValueError(f"Unknown bin shape: {shape}")
+    x, y = _finite_pairs(x, y)
+    if shape == "hex":
+        return {"count": len(x), **hex_bins(x, y, bins)}
+    if not len(x):
+        return {"count": 0, "x_edges": [], "y_edges": [], "counts": []}
+    
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins)
+    return {
+        "count": len(x),
+        "x_edges": x_edges.tolist(),
+        "y_edges": y_edges.tolist(),
+        "counts": counts.T.astype(np.int64).tolist()
+    }
+
+
+def hex_bins(x: np.ndarray, y: np.ndarray, gridsize: int) -> Dict[str, Any]:
+    """Count pairs per cell of a hexagonal grid ``gridsize`` cells wide.
+    
+    Cell centers form two rectangular lattices offset by half a cell; each
+    point goes to the nearer of its candidate centers in each lattice, with
+    y scaled so the cells are regular hexagons in the unit square.
+    """
+    if not len(x):
+        return {"centers": [], "counts": [], "hex_size": []}
+    
+    nx = gridsize
+    ny = max(1, int(round(gridsize / np.sqrt(3))))
+    x_min, y_min = x.min(), y.min()
+    sx = (x.max() - x_min) / nx or 1.0
+    sy = (y.max() - y_min) / ny or 1.0
+    ix, iy = (x - x_min) / sx, (y - y_min) / sy
+    
+    ix1, iy1 = np.round(ix), np.round(iy)
+    ix2, iy2 = np.floor(ix), np.floor(iy)
+    d1 = (ix - ix1) ** 2 + 3 * (iy - iy1) ** 2
+    d2 = (ix - ix2 - 0.5) ** 2 + 3 * (iy - iy2 - 0.5) ** 2
+    first = d1 <= d2
+    
+    # One integer per cell: lattice, then row, then column
+    col = np.where(first, ix1, ix2).astype(np.int64)
+    row = np.where(first, iy1, iy2).astype(np.int64)
+    lattice = (~first).astype(np.int64)
+    keys, counts = np.unique((lattice * (ny + 2) + row) * (nx + 2) + col, return_counts=True)
+    
+    col, rest = keys % (nx + 2), keys // (nx + 2)
+    row, lattice = rest % (ny + 2), rest // (ny + 2)
+    # The second lattice sits half a cell up and right of the first
+    offset = lattice * 0.5
+    return {
+        "centers": np.stack(
+            [x_min + (col + offset) * sx, y_min + (row + offset) * sy], axis=1
+        ).tolist(),
+        "counts": counts.tolist(),
+        "hex_size": [sx, sy]
+    }
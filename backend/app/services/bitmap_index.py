@@ -0,0 +1,42 @@
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+
+class BitmapIndex:
+    """Packed bitmaps of the rows holding single values of a low-cardinality column.
+    
+    An ``eq`` filter uses the bitmap of its value and ``ne`` its complement,
+    since nulls never equal the value. Several such filters combine with
+    bitwise operations over ``row_count / 8`` bytes instead of comparing
+    every row. A bitmap is built in one pass over the codes the first time
+    its value is filtered on, so only queried values take memory.
+    """
+    
+    OPERATORS = ("eq", "ne")
+    
+    @classmethod
+    def supports(cls, operator: str, value: Any) -> bool:
+        """Whether a filter can be answered from a value bitmap."""
+        return operator in cls.OPERATORS and isinstance(value, str)
+    
+    @staticmethod
+    def build(values: pd.Series, value: str) -> np.ndarray:
+        """Pack the rows of a column equal to a value into a bitmap."""
+        if not isinstance(values.dtype, pd.CategoricalDtype):
+            return np.packbits((values == value).to_numpy())
+        code = values.cat.categories.get_indexer([value])[0]
+        if code < 0:
+            return np.zeros((len(values) + 7) // 8, dtype=np.uint8)
+        return np.packbits(values.cat.codes.to_numpy() == code)
+    
+    @staticmethod
+    def match(bits: np.ndarray, operator: str) -> np.ndarray:
+        """Get the bitmap of rows matching a filter from its value's bitmap."""
+        return bits if operator == "eq" else ~bits
+    
+    @staticmethod
+    def positions(bits: np.ndarray, row_count: int) -> np.ndarray:
+        """Get the row positions set in a packed bitmap."""
+        return np.flatnonzero(np.unpackbits(bits, count=row_count))
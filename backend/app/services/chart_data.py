@@ -0,0 +1,182 @@
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.models.dataset import Dataset
+from app.services.data_processor import DataProcessor
+from app.services.dataset_cache import compute_aggregates, load_dataframe, load_rollups
+from app.services.deadlines import check_deadline
+from app.services.rollups import chart_rollup_spec
+
+# Side of the square screen cells scatter points are thinned to, in pixels
+SCATTER_CELL_PIXELS = 8
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Pick the positions of ``threshold`` points keeping a line's shape.
+    
+    Largest-Triangle-Three-Buckets keeps the first and last points and,
+    from each of ``threshold - 2`` equal buckets in between, the point
+    forming the largest triangle with the point kept from the previous
+    bucket and the mean of the next bucket. ``x`` must be sorted.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    
+    a = 0
+    for i in range(threshold - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_start, next_stop = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        mean_x = x[next_start:next_stop].mean()
+        mean_y = y[next_start:next_stop].mean()
+        
+        areas = np.abs(
+            (x[a] - mean_x) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (mean_y - y[a])
+        )
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+    return selected
+
+
+def thin_grid(x: np.ndarray, y: np.ndarray, cols: int, rows: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Keep one point per occupied cell of a ``cols`` by ``rows`` grid.
+    
+    Returns the positions of the kept points, the first of each cell, and
+    how many points fell into each cell.
+    """
+    def cell(values: np.ndarray, count: int) -> np.ndarray:
+        low, span = values.min(), values.max() - values.min()
+        if span == 0:
+            return np.zeros(len(values), dtype=np.int64)
+        return np.minimum(((values - low) / span * count).astype(np.int64), count - 1)
+    
+    cells = cell(y, rows) * cols + cell(x, cols)
+    _, first, counts = np.unique(cells, return_index=True, return_counts=True)
+    order = np.argsort(first)
+    return first[order], counts[order]
+
+
+def axis_values(values: pd.Series) -> np.ndarray:
+    """Get plot coordinates of a column: numbers, datetimes as nanoseconds, else positions."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.to_numpy(dtype="datetime64[ns]").astype(np.int64).astype(float)
+    if pd.api.types.is_numeric_dtype(values) and values.dtype.kind != "b":
+        return values.to_numpy(dtype=float, na_value=np.nan)
+    return np.arange(len(values), dtype=float)
+
+
+def _check_columns(dataset: Dataset, columns: List[str]) -> None:
+    known = {c["name"] for c in (dataset.schema or {}).get("columns", [])}
+    for column in columns:
+        if column not in known:
+            raise ValueError(f"Column '{column}' not found")
+
+
+def _scatter_series(
+    dataset: Dataset,
+    config: Dict[str, Any],
+    width: int,
+    height: int
+) -> Tuple[List[Dict[str, Any]], int]:
+    x = config.get("x_axis")
+    y_axis = config.get("y_axis")
+    y = y_axis[0] if isinstance(y_axis, list) and y_axis else y_axis
+    if not x or not y:
+        raise ValueError("Scatter charts need an x_axis and a y_axis")
+    _check_columns(dataset, [x, y])
+    
+    df = load_dataframe(dataset, list(dict.fromkeys([x, y]))).dropna()
+    total = len(df)
+    
+    cols = max(1, width // SCATTER_CELL_PIXELS)
+    rows = max(1, height // SCATTER_CELL_PIXELS)
+    counts = None
+    if total > cols * rows:
+        positions, counts = thin_grid(axis_values(df[x]), axis_values(df[y]), cols, rows)
+        df = df.iloc[positions]
+    
+    values = DataProcessor.to_columns(df)
+    series = {
+        "name": y,
+        "x": values[x],
+        "y": values[y],
+        "counts": None if counts is None else counts.tolist()
+    }
+    return [series], total
+
+
+def _grouped_series(
+    dataset: Dataset,
+    chart_type: str,
+    config: Dict[str, Any],
+    width: int
+) -> Tuple[List[Dict[str, Any]], int]:
+    spec = chart_rollup_spec(chart_type, config)
+    if spec is None:
+        raise ValueError("Chart config names no columns to group by and measure")
+    group_by, measures = spec["group_by"], spec["measures"]
+    _check_columns(dataset, [*group_by, *measures])
+    operation = config.get("aggregation", "sum")
+    aggregates = [{"column": m, "operation": operation, "alias": m} for m in measures]
+    
+    rollups = load_rollups(dataset)
+    rollup = rollups.find(group_by, aggregates) if rollups is not None else None
+    if rollup is not None:
+        frame = rollup.aggregate(group_by, aggregates)
+    else:
+        frame = compute_aggregates(dataset, aggregates, group_by)
+    
+    x, split_by = group_by[0], group_by[1:]
+    parts = frame.groupby(split_by, observed=True) if split_by else [((), frame)]
+    series, total = [], 0
+    for keys, part in parts:
+        keys = keys if isinstance(keys, tuple) else (keys,)
+        suffix = f" ({', '.join(str(k) for k in keys)})" if keys else ""
+        for measure in measures:
+            check_deadline()
+            points = part[[x, measure]].dropna()
+            total += len(points)
+            if chart_type == "line":
+                positions = lttb(
+                    axis_values(points[x]), points[measure].to_numpy(dtype=float), width
+                )
+                points = points.iloc[positions]
+            values = DataProcessor.to_columns(points)
+            series.append({"name": f"{measure}{suffix}", "x": values[x], "y": values[measure]})
+    return series, total
+
+
+def build_chart_data(
+    dataset: Dataset,
+    chart_type: str,
+    config: Dict[str, Any],
+    width: int,
+    height: int
+) -> Dict[str, Any]:
+    """Get the plot-ready series of a chart sized for a viewport.
+    
+    Line, bar and pie charts aggregate their measures by the x axis (or
+    pie labels) with the config's ``aggregation``, sum by default, using a
+    rollup when one covers them; extra ``group_by`` columns split series.
+    Line series are then reduced to about one point per pixel of
+    ``width`` with LTTB. Scatter charts plot raw rows, thinned to one
+    point per occupied screen cell with the number of rows behind it.
+    """
+    if chart_type == "scatter":
+        series, total = _scatter_series(dataset, config, width, height)
+    else:
+        series, total = _grouped_series(dataset, chart_type, config, width)
+    
+    returned = sum(len(s["x"]) for s in series)
+    return {
+        "chart_type": chart_type,
+        "series": series,
+        "total_points": total,
+        "downsampled": returned < total
+    }
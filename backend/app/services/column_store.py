@@ -0,0 +1,427 @@
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+
+class ColumnStore:
+    """Memory-mapped per-column dataset storage.
+    
+    A store is a directory holding one fixed-width binary file per numeric,
+    boolean or datetime column, an offsets + UTF-8 bytes pair per text
+    column and int32 codes plus a sorted category list per dictionary-encoded
+    column, described by ``meta.json``. Columns are opened with
+    ``np.memmap`` so reading a row range only touches the pages that hold
+    those rows, and the OS page cache is shared by every worker process.
+    
+    Numeric and datetime columns also get a zone map: the min, max and null
+    count of every block of ``block_rows`` rows, used to skip blocks that
+    cannot match a comparison filter.
+    """
+    
+    META_FILE = "meta.json"
+    ZONE_OPERATORS = ("eq", "ne", "gt", "lt", "gte", "lte")
+    
+    def __init__(self, path: str):
+        self.path = Path(path)
+        with open(self.path / self.META_FILE) as f:
+            meta = json.load(f)
+        self.row_count: int = meta["row_count"]
+        self.columns: List[Dict[str, Any]] = meta["columns"]
+        self.block_rows: int = meta.get("block_rows") or max(self.row_count, 1)
+        self._by_name = {c["name"]: c for c in self.columns}
+    
+    @property
+    def column_names(self) -> List[str]:
+        return [c["name"] for c in self.columns]
+    
+    @classmethod
+    def write(cls, df: pd.DataFrame, path: str) -> None:
+        """Write a DataFrame as a column store directory."""
+        with ColumnStoreWriter(path) as writer:
+            writer.append(df)
+    
+    def _map(self, file_name: str, dtype: Any) -> np.ndarray:
+        """Memory-map a column file, tolerating empty files."""
+        file_path = self.path / file_name
+        if os.path.getsize(file_path) == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(file_path, dtype=dtype, mode="r")
+    
+    @staticmethod
+    def _decode_text(offsets: np.ndarray, body: bytes, valid: np.ndarray) -> np.ndarray:
+        """Build an object array from zero-based offsets, UTF-8 bytes and validity."""
+        array = pa.LargeStringArray.from_buffers(
+            len(offsets) - 1,
+            pa.py_buffer(offsets),
+            pa.py_buffer(body),
+            pa.py_buffer(np.packbits(valid, bitorder="little"))
+        )
+        return array.to_numpy(zero_copy_only=False)
+    
+    def _read_text(self, info: Dict[str, Any], start: int, stop: int) -> np.ndarray:
+        """Decode a text column slice into an object array."""
+        offsets = np.array(self._map(info["offsets"], np.int64)[start:stop + 1])
+        if len(offsets) < 2:
+            return np.empty(0, dtype=object)
+        
+        data = self._map(info["data"], np.uint8)
+        body = np.asarray(data[offsets[0]:offsets[-1]]).tobytes()
+        valid = ~np.asarray(self._map(info["nulls"], np.uint8)[start:stop]).astype(bool)
+        
+        return self._decode_text(offsets - offsets[0], body, valid)
+    
+    def _take_text(self, info: Dict[str, Any], positions: np.ndarray) -> np.ndarray:
+        """Decode the text values at the given rows into an object array."""
+        offsets = self._map(info["offsets"], np.int64)
+        starts = np.asarray(offsets[positions])
+        lengths = np.asarray(offsets[positions + 1]) - starts
+        new_offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        
+        # Byte i of the output comes from its row's start plus its position within the row
+        byte_index = np.repeat(starts - new_offsets[:-1], lengths) + np.arange(new_offsets[-1])
+        body = np.asarray(self._map(info["data"], np.uint8)[byte_index]).tobytes()
+        valid = ~np.asarray(self._map(info["nulls"], np.uint8)[positions]).astype(bool)
+        
+        return self._decode_text(new_offsets, body, valid)
+    
+    def _read_category(self, info: Dict[str, Any], rows: Union[slice, np.ndarray]) -> pd.Categorical:
+        """Wrap category codes in a Categorical without decoding."""
+        path = self.path / info["categories"]
+        dtype = _category_dtype(str(path), os.stat(path).st_mtime_ns)
+        codes = np.array(self._map(info["data"], np.int32)[rows])
+        return pd.Categorical.from_codes(codes, dtype=dtype, validate=False)
+    
+    def _read_fixed(self, info: Dict[str, Any], rows: Union[slice, np.ndarray]) -> np.ndarray:
+        """Read numeric, boolean or datetime values."""
+        if info["kind"] == "datetime":
+            return np.array(self._map(info["data"], np.int64)[rows]).view("datetime64[ns]")
+        return np.array(self._map(info["data"], np.dtype(info["dtype"]))[rows])
+    
+    def _read_column(self, name: str, start: int, stop: int) -> Union[np.ndarray, pd.Categorical]:
+        info = self._by_name[name]
+        
+        if info["kind"] == "text":
+            return self._read_text(info, start, stop)
+        
+        if info["kind"] == "category":
+            return self._read_category(info, slice(start, stop))
+        
+        return self._read_fixed(info, slice(start, stop))
+    
+    def _take_column(self, name: str, positions: np.ndarray) -> Union[np.ndarray, pd.Categorical]:
+        info = self._by_name[name]
+        
+        if info["kind"] == "text":
+            return self._take_text(info, positions)
+        
+        if info["kind"] == "category":
+            return self._read_category(info, positions)
+        
+        return self._read_fixed(info, positions)
+    
+    def read_rows(
+        self,
+        start: int,
+        stop: int,
+        columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """Read rows [start, stop) of the given columns, in stored order."""
+        start = max(0, min(start, self.row_count))
+        stop = max(start, min(stop, self.row_count))
+        names = self.column_names if columns is None else [
+            c for c in self.column_names if c in set(columns)
+        ]
+        
+        return pd.DataFrame(
+            {name: self._read_column(name, start, stop) for name in names},
+            index=pd.RangeIndex(start, stop),
+            columns=names
+        )
+    
+    @property
+    def block_count(self) -> int:
+        return -(-self.row_count // self.block_rows)
+    
+    def block_matches(self, f: Dict[str, Any]) -> Optional[np.ndarray]:
+        """Flag the blocks that may hold rows matching one filter.
+        
+        Returns None when the zone map cannot tell, i.e. the column has no
+        zone map or the operator or value is not a plain comparison.
+        """
+        info = self._by_name.get(f["column"])
+        if info is None or "zones" not in info or f["operator"] not in self.ZONE_OPERATORS:
+            return None
+        
+        value = f["value"]
+        if info["kind"] == "datetime":
+            try:
+                value = pd.Timestamp(value).value
+            except (TypeError, ValueError):
+                return None
+        elif isinstance(value, bool) or not isinstance(value, (int, float)):
+            return None
+        
+        path = self.path / info["zones"]
+        zones = _zone_map(str(path), os.stat(path).st_mtime_ns)
+        low, high, nulls = zones["min"], zones["max"], zones["nulls"]
+        sizes = np.minimum(self.block_rows, self.row_count - np.arange(len(nulls)) * self.block_rows)
+        has_values = nulls < sizes
+        
+        operator = f["operator"]
+        if operator == "ne":
+            # Nulls are never equal to the value, so blocks with nulls always match
+            return ~((low == value) & (high == value)) | (nulls > 0) | ~has_values
+        if operator == "eq":
+            matches = (low <= value) & (high >= value)
+        elif operator == "gt":
+            matches = high > value
+        elif operator == "gte":
+            matches = high >= value
+        elif operator == "lt":
+            matches = low < value
+        else:
+            matches = low <= value
+        return matches & has_values
+    
+    def candidate_blocks(self, filters: List[Dict[str, Any]], logic: str = "and") -> np.ndarray:
+        """Flag the blocks that may hold rows matching filters combined with logic."""
+        matches = [self.block_matches(f) for f in filters]
+        blocks = np.ones(self.block_count, dtype=bool)
+        
+        if logic == "and":
+            for block_mask in matches:
+                if block_mask is not None:
+                    blocks &= block_mask
+            return blocks
+        
+        if not matches or any(block_mask is None for block_mask in matches):
+            return blocks
+        return np.logical_or.reduce(matches)
+    
+    def read_blocks(self, blocks: np.ndarray, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Read the rows of the flagged blocks, indexed by row position."""
+        # Turn runs of flagged blocks into contiguous row ranges
+        edges = np.diff(np.concatenate([[0], blocks.astype(np.int8), [0]]))
+        starts = np.flatnonzero(edges == 1) * self.block_rows
+        stops = np.minimum(np.flatnonzero(edges == -1) * self.block_rows, self.row_count)
+        
+        frames = [self.read_rows(start, stop, columns) for start, stop in zip(starts, stops)]
+        if not frames:
+            return self.read_rows(0, 0, columns)
+        return frames[0] if len(frames) == 1 else pd.concat(frames)
+    
+    def take(self, positions: np.ndarray, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Read only the rows at the given positions, indexed by position.
+        
+        Used to fetch the remaining columns of rows that already passed a
+        filter, so those columns are only paged in where rows matched.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        names = self.column_names if columns is None else [
+            c for c in self.column_names if c in set(columns)
+        ]
+        
+        return pd.DataFrame(
+            {name: self._take_column(name, positions) for name in names},
+            index=pd.Index(positions),
+            columns=names
+        )
+    
+    def read(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Read every row of the given columns."""
+        return self.read_rows(0, self.row_count, columns)
+
+
+@lru_cache(maxsize=256)
+def _category_dtype(path: str, mtime_ns: int) -> pd.CategoricalDtype:
+    """Load a category list once per file version."""
+    with open(path) as f:
+        return pd.CategoricalDtype(json.load(f))
+
+
+@lru_cache(maxsize=256)
+def _zone_map(path: str, mtime_ns: int) -> Dict[str, np.ndarray]:
+    """Load a zone map once per file version."""
+    with np.load(path) as zones:
+        return {name: zones[name] for name in zones.files}
+
+
+class ColumnStoreWriter:
+    """Incrementally write a column store one DataFrame chunk at a time.
+    
+    Column kinds and dtypes are fixed by the first chunk; later chunks are
+    cast to them. Categorical columns are stored as codes into a dictionary
+    that grows across chunks and is sorted on close, when zone maps are
+    built as well. The metadata file is written on close, so a store is
+    only readable once it is complete.
+    """
+    
+    BLOCK_ROWS = 8192
+    
+    def __init__(self, path: str):
+        self.root = Path(path)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.row_count = 0
+        self._columns: Optional[List[Dict[str, Any]]] = None
+        self._files: Dict[str, Any] = {}
+        self._text_sizes: Dict[str, int] = {}
+        self._categories: Dict[str, Dict[str, int]] = {}
+    
+    def __enter__(self) -> "ColumnStoreWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._close_files()
+    
+    def _open(self, file_name: str) -> None:
+        self._files[file_name] = open(self.root / file_name, "wb")
+    
+    def _init_columns(self, df: pd.DataFrame) -> None:
+        self._columns = []
+        for i, name in enumerate(df.columns):
+            col = df[name]
+            info = {"name": name, "dtype": str(col.dtype), "data": f"{i}.data"}
+            
+            if pd.api.types.is_bool_dtype(col) or pd.api.types.is_numeric_dtype(col):
+                info["kind"] = "numeric"
+            elif pd.api.types.is_datetime64_dtype(col):
+                info["kind"] = "datetime"
+            elif isinstance(col.dtype, pd.CategoricalDtype):
+                info["kind"] = "category"
+                info["data"] = f"{i}.codes"
+                info["categories"] = f"{i}.categories.json"
+                self._categories[name] = {}
+            else:
+                info["kind"] = "text"
+                info["dtype"] = "object"
+                info["data"] = f"{i}.bytes"
+                info["offsets"] = f"{i}.offsets"
+                info["nulls"] = f"{i}.nulls"
+                self._open(info["offsets"])
+                self._open(info["nulls"])
+                self._files[info["offsets"]].write(np.zeros(1, dtype=np.int64).tobytes())
+                self._text_sizes[name] = 0
+            
+            self._open(info["data"])
+            self._columns.append(info)
+    
+    def append(self, df: pd.DataFrame) -> None:
+        """Append a chunk of rows."""
+        if self._columns is None:
+            self._init_columns(df)
+        
+        for info in self._columns:
+            col = df[info["name"]]
+            
+            if info["kind"] == "numeric":
+                values = col.to_numpy(dtype=np.dtype(info["dtype"]))
+                self._files[info["data"]].write(values.tobytes())
+            elif info["kind"] == "datetime":
+                values = col.to_numpy(dtype="datetime64[ns]").view("int64")
+                self._files[info["data"]].write(values.tobytes())
+            elif info["kind"] == "category":
+                self._files[info["data"]].write(self._encode_codes(info["name"], col).tobytes())
+            else:
+                nulls = col.isnull().to_numpy()
+                encoded = [
+                    b"" if null else str(value).encode("utf-8")
+                    for value, null in zip(col.tolist(), nulls)
+                ]
+                offsets = self._text_sizes[info["name"]] + np.cumsum(
+                    [len(b) for b in encoded], dtype=np.int64
+                )
+                if len(offsets):
+                    self._text_sizes[info["name"]] = int(offsets[-1])
+                self._files[info["offsets"]].write(offsets.tobytes())
+                self._files[info["nulls"]].write(nulls.astype(np.uint8).tobytes())
+                self._files[info["data"]].write(b"".join(encoded))
+        
+        self.row_count += len(df)
+    
+    def _encode_codes(self, name: str, col: pd.Series) -> np.ndarray:
+        """Map a chunk's category codes onto the store-wide dictionary."""
+        if not isinstance(col.dtype, pd.CategoricalDtype):
+            col = col.astype(str).where(col.notnull()).astype("category")
+        
+        lookup = self._categories[name]
+        # The trailing -1 maps null codes (-1) to themselves
+        mapping = np.array(
+            [lookup.setdefault(str(value), len(lookup)) for value in col.cat.categories] + [-1],
+            dtype=np.int32
+        )
+        return mapping[col.cat.codes.to_numpy()]
+    
+    def _sort_categories(self, info: Dict[str, Any]) -> None:
+        """Rewrite codes so categories are in sorted order, as pandas expects."""
+        values = list(self._categories[info["name"]])
+        order = np.argsort(np.array(values, dtype=object), kind="stable")
+        rank = np.empty(len(values) + 1, dtype=np.int32)
+        rank[order] = np.arange(len(values), dtype=np.int32)
+        rank[-1] = -1
+        
+        codes_path = self.root / info["data"]
+        codes = np.fromfile(codes_path, dtype=np.int32)
+        rank[codes].tofile(codes_path)
+        with open(self.root / info["categories"], "w") as f:
+            json.dump([values[i] for i in order], f)
+    
+    def _write_zone_map(self, info: Dict[str, Any]) -> None:
+        """Record the min, max and null count of every block of a column."""
+        dtype = np.dtype(np.int64 if info["kind"] == "datetime" else info["dtype"])
+        path = self.root / info["data"]
+        values = (
+            np.memmap(path, dtype=dtype, mode="r") if self.row_count
+            else np.empty(0, dtype=dtype)
+        )
+        
+        block_count = -(-self.row_count // self.BLOCK_ROWS)
+        low = np.zeros(block_count, dtype=dtype)
+        high = np.zeros(block_count, dtype=dtype)
+        nulls = np.zeros(block_count, dtype=np.int64)
+        
+        for b in range(block_count):
+            block = np.asarray(values[b * self.BLOCK_ROWS:(b + 1) * self.BLOCK_ROWS])
+            if info["kind"] == "datetime":
+                null = block == np.iinfo(np.int64).min  # NaT
+            elif dtype.kind == "f":
+                null = np.isnan(block)
+            else:
+                null = np.zeros(len(block), dtype=bool)
+            valid = block[~null]
+            nulls[b] = len(block) - len(valid)
+            if len(valid):
+                low[b], high[b] = valid.min(), valid.max()
+        
+        info["zones"] = f"{Path(info['data']).stem}.zones.npz"
+        np.savez(self.root / info["zones"], min=low, max=high, nulls=nulls)
+    
+    def _close_files(self) -> None:
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+    
+    def close(self) -> None:
+        """Flush column files and write the store metadata."""
+        self._close_files()
+        for info in self._columns or []:
+            if info["kind"] == "category":
+                self._sort_categories(info)
+            elif info["kind"] == "datetime" or (
+                info["kind"] == "numeric" and info["dtype"] != "bool"
+            ):
+                self._write_zone_map(info)
+        with open(self.root / ColumnStore.META_FILE, "w") as f:
+            json.dump({
+                "row_count": self.row_count,
+                "block_rows": self.BLOCK_ROWS,
+                "columns": self._columns or []
+            }, f)
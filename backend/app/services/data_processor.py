@@ -1,17 +1,97 @@
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Optional, Tuple
 from pathlib import Path
-import json
+
+from app.services.column_store import ColumnStore
 
 
 class DataProcessor:
     """Service for processing and analyzing datasets."""
     
+    # Aggregate operations and the pandas reductions implementing them
+    AGGREGATE_FUNCTIONS = {
+        "sum": "sum",
+        "avg": "mean",
+        "min": "min",
+        "max": "max",
+        "count": "count",
+        "median": "median",
+        "count_distinct": "nunique",
+        "stddev": "std",
+        "variance": "var"
+    }
+    
+    # Histogram bins and most frequent values reported by column statistics
+    HISTOGRAM_BINS = 20
+    TOP_VALUES = 10
+    
+    # Rows tested at a time by filters given a checkpoint, so long scans can be stopped
+    FILTER_CHUNK_ROWS = 1048576
+    
     @staticmethod
-    def read_csv(file_path: str) -> pd.DataFrame:
+    def read_csv(
+        file_path: str,
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Dict[str, Any]] = None
+    ) -> pd.DataFrame:
         """Read CSV file into DataFrame."""
-        return pd.read_csv(file_path)
+        return pd.read_csv(file_path, usecols=columns, dtype=dtypes)
+    
+    @staticmethod
+    def write_parquet(df: pd.DataFrame, file_path: str) -> None:
+        """Write DataFrame to a Parquet file."""
+        df = df.copy(deep=False)
+        for col in df.columns:
+            # Arrow needs one type per column; store mixed text/number columns as text
+            if pd.api.types.infer_dtype(df[col], skipna=True) in ("mixed", "mixed-integer"):
+                df[col] = df[col].where(df[col].isnull(), df[col].astype(str))
+        df.to_parquet(file_path, engine="pyarrow", index=False)
+    
+    @staticmethod
+    def read_parquet(file_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Read Parquet file into DataFrame, loading only the given columns."""
+        return DataProcessor.sort_categories(
+            pd.read_parquet(file_path, engine="pyarrow", columns=columns)
+        )
+    
+    @staticmethod
+    def sort_categories(df: pd.DataFrame) -> pd.DataFrame:
+        """Sort the categories of categorical columns so group order matches text."""
+        for col in df.columns:
+            values = df[col]
+            if not isinstance(values.dtype, pd.CategoricalDtype):
+                continue
+            if not values.cat.categories.is_monotonic_increasing:
+                df[col] = values.cat.reorder_categories(values.cat.categories.sort_values())
+        return df
+    
+    @staticmethod
+    def write_dataset(df: pd.DataFrame, file_path: str, storage_format: str) -> None:
+        """Write DataFrame in the given storage format."""
+        if storage_format == "parquet":
+            DataProcessor.write_parquet(df, file_path)
+        elif storage_format == "columns":
+            ColumnStore.write(df, file_path)
+        else:
+            raise ValueError(f"Unknown storage format: {storage_format}")
+    
+    @staticmethod
+    def read_dataset(
+        file_path: str,
+        storage_format: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Dict[str, Any]] = None
+    ) -> pd.DataFrame:
+        """Read a stored dataset in its storage format.
+        
+        ``dtypes`` only applies to CSV files; the other formats store them.
+        """
+        if storage_format == "parquet":
+            return DataProcessor.read_parquet(file_path, columns)
+        if storage_format == "columns":
+            return ColumnStore(file_path).read(columns)
+        return DataProcessor.read_csv(file_path, columns, dtypes)
     
     @staticmethod
     def infer_schema(df: pd.DataFrame) -> Dict[str, Any]:
@@ -53,25 +133,84 @@ class DataProcessor:
         page_size: int = 100
     ) -> Dict[str, Any]:
         """Get paginated data from DataFrame."""
-        total_rows = len(df)
-        total_pages = (total_rows + page_size - 1) // page_size
-        
+        return DataProcessor.format_page(
+            DataProcessor.paginate(df, page, page_size), len(df), page, page_size
+        )
+    
+    @staticmethod
+    def paginate(df: pd.DataFrame, page: int = 1, page_size: int = 100) -> pd.DataFrame:
+        """Slice one page of rows from a DataFrame."""
         start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
-        
-        page_data = df.iloc[start_idx:end_idx]
-        
-        # Convert to list of dicts, handling NaN values
-        data = json.loads(page_data.to_json(orient='records', date_format='iso'))
-        
+        return df.iloc[start_idx:start_idx + page_size]
+    
+    @staticmethod
+    def page_meta(total_rows: int, page: int, page_size: int) -> Dict[str, Any]:
+        """Get the pagination fields of a page response."""
         return {
-            "data": data,
             "total_rows": total_rows,
             "page": page,
             "page_size": page_size,
-            "total_pages": total_pages
+            "total_pages": (total_rows + page_size - 1) // page_size
+        }
+    
+    @staticmethod
+    def format_page(
+        page_data: pd.DataFrame,
+        total_rows: int,
+        page: int,
+        page_size: int
+    ) -> Dict[str, Any]:
+        """Build a paginated response from an already sliced page."""
+        return {
+            "data": DataProcessor.to_records(page_data),
+            **DataProcessor.page_meta(total_rows, page, page_size)
+        }
+    
+    @staticmethod
+    def to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Convert a DataFrame to JSON-ready records column by column.
+        
+        Matches ``to_json(orient='records', date_format='iso')``: missing and
+        non-finite values become None and datetimes become ISO 8601 strings.
+        """
+        columns = DataProcessor.to_columns(df)
+        return [dict(zip(columns, row)) for row in zip(*columns.values())]
+    
+    @staticmethod
+    def to_columns(df: pd.DataFrame) -> Dict[str, List[Any]]:
+        """Convert a DataFrame to JSON-ready value lists keyed by column."""
+        return {
+            str(name): DataProcessor._json_values(df.iloc[:, i])
+            for i, name in enumerate(df.columns)
         }
     
+    @staticmethod
+    def _json_values(series: pd.Series) -> List[Any]:
+        """Convert a column to a list of JSON-ready Python values."""
+        if pd.api.types.is_datetime64_any_dtype(series):
+            if series.dt.tz is not None:
+                series = series.dt.tz_convert("UTC").dt.tz_localize(None)
+                suffix = "Z"
+            else:
+                suffix = ""
+            values = series.to_numpy(dtype="datetime64[ns]")
+            text = np.char.add(np.datetime_as_string(values, unit="ms"), suffix).astype(object)
+            text[np.isnat(values)] = None
+            return text.tolist()
+        
+        if isinstance(series.dtype, np.dtype) and series.dtype.kind in "iub":
+            return series.tolist()
+        
+        if isinstance(series.dtype, np.dtype) and series.dtype.kind == "f":
+            values = series.to_numpy()
+            result = values.astype(object)
+            result[~np.isfinite(values)] = None
+            return result.tolist()
+        
+        values = series.to_numpy(dtype=object)
+        values[pd.isna(values)] = None
+        return values.tolist()
+    
     @staticmethod
     def apply_filters(
         df: pd.DataFrame,
@@ -79,8 +218,23 @@ class DataProcessor:
         logic: str = "and"
     ) -> pd.DataFrame:
         """Apply filters to DataFrame."""
+        mask = DataProcessor.filter_mask(df, filters, logic)
+        return df if mask is None else df[mask]
+    
+    @staticmethod
+    def filter_mask(
+        df: pd.DataFrame,
+        filters: List[Dict[str, Any]],
+        logic: str = "and",
+        checkpoint: Optional[Callable[[], None]] = None
+    ) -> Optional[pd.Series]:
+        """Build the boolean row mask for filters, or None if nothing applies.
+        
+        With a ``checkpoint``, it is called before each chunk of rows is
+        tested and may raise to abandon the scan.
+        """
         if not filters:
-            return df
+            return None
         
         masks = []
         
@@ -92,31 +246,14 @@ class DataProcessor:
             if column not in df.columns:
                 continue
             
-            if operator == "eq":
-                mask = df[column] == value
-            elif operator == "ne":
-                mask = df[column] != value
-            elif operator == "gt":
-                mask = df[column] > value
-            elif operator == "lt":
-                mask = df[column] < value
-            elif operator == "gte":
-                mask = df[column] >= value
-            elif operator == "lte":
-                mask = df[column] <= value
-            elif operator == "contains":
-                mask = df[column].astype(str).str.contains(str(value), case=False, na=False)
-            elif operator == "startswith":
-                mask = df[column].astype(str).str.startswith(str(value), na=False)
-            elif operator == "endswith":
-                mask = df[column].astype(str).str.endswith(str(value), na=False)
-            else:
+            mask = DataProcessor._filter_mask(df[column], operator, value, checkpoint)
+            if mask is None:
                 continue
             
             masks.append(mask)
         
         if not masks:
-            return df
+            return None
         
         # Combine masks
         if logic == "and":
@@ -128,7 +265,62 @@ class DataProcessor:
             for mask in masks[1:]:
                 combined_mask |= mask
         
-        return df[combined_mask]
+        return combined_mask
+    
+    @staticmethod
+    def _filter_mask(
+        values: pd.Series,
+        operator: str,
+        value: Any,
+        checkpoint: Optional[Callable[[], None]] = None
+    ) -> Optional[pd.Series]:
+        """Evaluate one filter condition, or None for unknown operators.
+        
+        Dictionary-encoded columns are tested once per category and the
+        result is gathered through the codes, so rows are never decoded.
+        """
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Code -1 (null) picks the trailing None entry
+            categories = pd.Series(np.append(values.cat.categories.to_numpy(dtype=object), None))
+            matches = DataProcessor._filter_mask(categories, operator, value, checkpoint)
+            if matches is None:
+                return None
+            codes = values.cat.codes.to_numpy()
+            return pd.Series(matches.to_numpy()[codes], index=values.index)
+        
+        chunk_rows = DataProcessor.FILTER_CHUNK_ROWS
+        if checkpoint is not None and len(values) > chunk_rows:
+            masks = []
+            for start in range(0, len(values), chunk_rows):
+                checkpoint()
+                mask = DataProcessor._filter_mask(values.iloc[start:start + chunk_rows], operator, value)
+                if mask is None:
+                    return None
+                masks.append(mask)
+            return pd.concat(masks)
+        if checkpoint is not None:
+            checkpoint()
+        
+        if operator == "eq":
+            return values == value
+        elif operator == "ne":
+            return values != value
+        elif operator == "gt":
+            return values > value
+        elif operator == "lt":
+            return values < value
+        elif operator == "gte":
+            return values >= value
+        elif operator == "lte":
+            return values <= value
+        # Text tests run on the string form of values; nulls never match
+        elif operator == "contains":
+            return values.notna() & values.astype(str).str.contains(str(value), case=False, na=False)
+        elif operator == "startswith":
+            return values.notna() & values.astype(str).str.startswith(str(value), na=False)
+        elif operator == "endswith":
+            return values.notna() & values.astype(str).str.endswith(str(value), na=False)
+        return None
     
     @staticmethod
     def aggregate(
@@ -138,80 +330,191 @@ class DataProcessor:
         group_by: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """Perform aggregation on DataFrame."""
+        value, groups = DataProcessor.aggregate_frame(df, column, operation, group_by)
+        
+        return {
+            "result": value,
+            "group_results": None if groups is None else DataProcessor.to_records(groups)
+        }
+    
+    @staticmethod
+    def percentile(operation: str) -> Optional[float]:
+        """Get the quantile of a ``p<0-100>`` operation such as ``p95``, or None."""
+        if not operation.startswith("p"):
+            return None
+        try:
+            value = float(operation[1:])
+        except ValueError:
+            return None
+        return value / 100 if 0 <= value <= 100 else None
+    
+    @staticmethod
+    def _aggregate_series(values: Any, operation: str) -> Any:
+        """Apply an operation to a Series or a grouped Series."""
+        quantile = DataProcessor.percentile(operation)
+        if quantile is not None:
+            return values.quantile(quantile)
+        if operation not in DataProcessor.AGGREGATE_FUNCTIONS:
+            raise ValueError(f"Unknown operation: {operation}")
+        return getattr(values, DataProcessor.AGGREGATE_FUNCTIONS[operation])()
+    
+    @staticmethod
+    def aggregate_frame(
+        df: pd.DataFrame,
+        column: str,
+        operation: str,
+        group_by: Optional[List[str]] = None
+    ) -> Tuple[Any, Optional[pd.DataFrame]]:
+        """Aggregate to a scalar, or to a DataFrame with one row per group."""
         if column not in df.columns:
             raise ValueError(f"Column '{column}' not found")
         
-        result = {"result": None, "group_results": None}
-        
         if group_by:
             # Group aggregation
             valid_groups = [g for g in group_by if g in df.columns]
             if not valid_groups:
                 raise ValueError("No valid group by columns")
             
-            grouped = df.groupby(valid_groups)[column]
+            # observed=True keeps dictionary-encoded keys to groups present in the data
+            grouped = df.groupby(valid_groups, observed=True)[column]
+            return None, DataProcessor._aggregate_series(grouped, operation).reset_index()
+        
+        # Simple aggregation
+        value = DataProcessor._aggregate_series(df[column], operation)
+        if operation in ("count", "count_distinct"):
+            return int(value), None
+        return float(value), None
+    
+    @staticmethod
+    def aggregate_many(
+        df: pd.DataFrame,
+        aggregates: List[Dict[str, Any]],
+        group_by: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """Compute several aggregates in one pass, one row per group.
+        
+        Each aggregate names a column, an operation and an optional alias
+        for its output column. Without group_by the result is a single row.
+        Grouping is computed once; named pandas aggregations run in a single
+        ``agg`` call and percentiles reuse the same groups.
+        """
+        functions = {}
+        percentiles = {}
+        for agg in aggregates:
+            if agg["column"] not in df.columns:
+                raise ValueError(f"Column '{agg['column']}' not found")
+            alias = agg.get("alias") or f"{agg['column']}_{agg['operation']}"
+            if alias in functions or alias in percentiles:
+                raise ValueError(f"Duplicate aggregate name: {alias}")
             
-            if operation == "sum":
-                agg_result = grouped.sum()
-            elif operation == "avg":
-                agg_result = grouped.mean()
-            elif operation == "min":
-                agg_result = grouped.min()
-            elif operation == "max":
-                agg_result = grouped.max()
-            elif operation == "count":
-                agg_result = grouped.count()
-            elif operation == "median":
-                agg_result = grouped.median()
+            quantile = DataProcessor.percentile(agg["operation"])
+            if quantile is not None:
+                percentiles[alias] = (agg["column"], quantile)
+            elif agg["operation"] in DataProcessor.AGGREGATE_FUNCTIONS:
+                functions[alias] = (agg["column"], DataProcessor.AGGREGATE_FUNCTIONS[agg["operation"]])
             else:
-                raise ValueError(f"Unknown operation: {operation}")
-            
-            # Convert to list of dicts
-            result["group_results"] = json.loads(
-                agg_result.reset_index().to_json(orient='records')
-            )
-        else:
-            # Simple aggregation
-            if operation == "sum":
-                result["result"] = float(df[column].sum())
-            elif operation == "avg":
-                result["result"] = float(df[column].mean())
-            elif operation == "min":
-                result["result"] = float(df[column].min())
-            elif operation == "max":
-                result["result"] = float(df[column].max())
-            elif operation == "count":
-                result["result"] = int(df[column].count())
-            elif operation == "median":
-                result["result"] = float(df[column].median())
+                raise ValueError(f"Unknown operation: {agg['operation']}")
+        aliases = [agg.get("alias") or f"{agg['column']}_{agg['operation']}" for agg in aggregates]
+        
+        if group_by:
+            missing = [g for g in group_by if g not in df.columns]
+            if missing:
+                raise ValueError(f"Column '{missing[0]}' not found")
+            grouped = df.groupby(group_by, observed=True)
+            result = grouped.agg(**functions) if functions else grouped.size().to_frame()[[]]
+            for alias, (column, quantile) in percentiles.items():
+                result[alias] = grouped[column].quantile(quantile)
+            return result[aliases].reset_index()
+        
+        row = {}
+        for alias in aliases:
+            if alias in percentiles:
+                column, quantile = percentiles[alias]
+                row[alias] = [df[column].quantile(quantile)]
             else:
-                raise ValueError(f"Unknown operation: {operation}")
+                column, function = functions[alias]
+                row[alias] = [getattr(df[column], function)()]
+        return pd.DataFrame(row)
+    
+    @staticmethod
+    def sort_frame(df: pd.DataFrame, sort: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Sort by several keys, each ascending or descending with nulls first or last."""
+        if not sort:
+            return df
+        for key in sort:
+            if key["column"] not in df.columns:
+                raise ValueError(f"Column '{key['column']}' not found")
+        ranks = [DataProcessor.column_ranks(df[key["column"]]) for key in sort]
+        return df.iloc[DataProcessor.sort_permutation(ranks, sort)]
+    
+    @staticmethod
+    def column_ranks(values: pd.Series) -> np.ndarray:
+        """Dense rank of each value in ascending order, -1 for nulls."""
+        codes, _ = pd.factorize(values, sort=True)
+        return codes.astype(np.int32)
+    
+    @staticmethod
+    def sort_permutation(ranks: List[np.ndarray], sort: List[Dict[str, Any]]) -> np.ndarray:
+        """Row order for sort keys given the ranks of each key's column.
         
-        return result
+        Working on integer ranks lets direction and null placement be
+        applied per key; ties keep their original row order.
+        """
+        keys = []
+        for key_ranks, key in zip(ranks, sort):
+            direction = key.get("direction", "asc")
+            nulls = key.get("nulls", "last")
+            if direction not in ("asc", "desc"):
+                raise ValueError(f"Unknown sort direction: {direction}")
+            if nulls not in ("first", "last"):
+                raise ValueError(f"Unknown nulls position: {nulls}")
+            
+            size = int(key_ranks.max()) + 1 if len(key_ranks) else 0
+            ordered = key_ranks if direction == "asc" else size - 1 - key_ranks
+            keys.append(np.where(key_ranks < 0, -1 if nulls == "first" else size, ordered))
+        
+        if len(keys) == 1:
+            return np.argsort(keys[0], kind="stable")
+        # lexsort treats its last key as the primary one
+        return np.lexsort(keys[::-1])
     
     @staticmethod
     def get_column_stats(df: pd.DataFrame, column: str) -> Dict[str, Any]:
-        """Get statistics for a column."""
+        """Get statistics for a column, with its most frequent values and a histogram."""
         if column not in df.columns:
             raise ValueError(f"Column '{column}' not found")
         
         col_data = df[column]
+        top = col_data.value_counts().head(DataProcessor.TOP_VALUES)
+        top = top[top > 0]
         stats = {
             "column": column,
             "count": int(col_data.count()),
             "null_count": int(col_data.isnull().sum()),
-            "unique_count": int(col_data.nunique())
+            "unique_count": int(col_data.nunique()),
+            "top_values": [
+                {"value": value, "count": int(count)}
+                for value, count in zip(DataProcessor._json_values(top.index.to_series()), top)
+            ]
         }
         
         if pd.api.types.is_numeric_dtype(col_data):
+            # Booleans summarize as 0/1, so the mean is the share of true values
+            numeric = col_data.astype(float) if col_data.dtype.kind == "b" else col_data
             stats.update({
-                "mean": float(col_data.mean()),
-                "median": float(col_data.median()),
-                "std": float(col_data.std()),
-                "min": float(col_data.min()),
-                "max": float(col_data.max()),
-                "q25": float(col_data.quantile(0.25)),
-                "q75": float(col_data.quantile(0.75))
+                "mean": float(numeric.mean()),
+                "median": float(numeric.median()),
+                "std": float(numeric.std()),
+                "min": float(numeric.min()),
+                "max": float(numeric.max()),
+                "q25": float(numeric.quantile(0.25)),
+                "q75": float(numeric.quantile(0.75))
             })
+            
+            values = numeric.to_numpy(dtype=float, na_value=np.nan)
+            values = values[np.isfinite(values)]
+            if col_data.dtype.kind != "b" and len(values):
+                counts, edges = np.histogram(values, bins=DataProcessor.HISTOGRAM_BINS)
+                stats["histogram"] = {"edges": edges.tolist(), "counts": counts.tolist()}
         
         return stats
@@ -0,0 +1,695 @@
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.models.dataset import Dataset
+from app.services.bitmap_index import BitmapIndex
+from app.services.column_store import ColumnStore
+from app.services.data_processor import DataProcessor
+from app.services.deadlines import check_deadline
+from app.services.process_pool import process_pool
+from app.services.rollups import RollupStore
+from app.services.row_index import CsvRowIndex
+from app.services.stats_catalog import StatsCatalog
+from app.services.text_index import TextIndex
+
+
+def estimate_size(value: Any) -> int:
+    """Estimate the in-memory size of a cached value in bytes."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, tuple):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class MemoryCache:
+    """Thread-safe LRU cache bounded by a byte budget.
+    
+    Keys are tuples whose first element is the dataset id, so every entry
+    belonging to a dataset can be dropped at once with ``invalidate``.
+    Cached values are shared between requests and must be treated as
+    read-only by callers.
+    """
+    
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Tuple[Hashable, ...], count_miss: bool = True) -> Any:
+        """Return the cached value for key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if count_miss:
+                    self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, key: Tuple[Hashable, ...], value: Any) -> None:
+        """Store a value, evicting least recently used entries to fit."""
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            # Larger than the whole budget: serve it uncached
+            return
+        
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            
+            while self._entries and self.current_bytes + size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+            
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+    
+    def get_or_load(self, key: Tuple[Hashable, ...], loader: Callable[[], Any]) -> Any:
+        """Return the cached value for key, loading and caching it on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = loader()
+            self.put(key, value)
+        return value
+    
+    def invalidate(self, dataset_id: int) -> None:
+        """Drop every entry belonging to a dataset."""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == dataset_id]:
+                self.current_bytes -= self._entries.pop(key)[1]
+    
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+    
+    def stats(self) -> Dict[str, int]:
+        """Get cache usage counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "current_bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+
+def file_version(file_path: str) -> Tuple[int, int]:
+    """Get a (mtime, size) fingerprint that changes whenever the file does."""
+    if os.path.isdir(file_path):
+        # Column stores are rewritten with their metadata file last
+        file_path = os.path.join(file_path, ColumnStore.META_FILE)
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def dataset_version(dataset: Dataset) -> str:
+    """Get a version string that changes whenever a dataset's data does."""
+    path, _ = storage_location(dataset)
+    mtime, size = file_version(path)
+    return f"{mtime}-{size}"
+
+
+# Global cache of loaded dataset DataFrames
+dataset_cache = MemoryCache(settings.DATASET_CACHE_MAX_BYTES)
+
+# Rows tested by the first chunk of a cursor scan, doubling for each further chunk
+SCAN_CHUNK_ROWS = 65536
+
+
+def storage_location(dataset: Dataset) -> Tuple[str, Optional[str]]:
+    """Get the path and format a dataset should be read from."""
+    if dataset.storage_path and os.path.exists(dataset.storage_path):
+        return dataset.storage_path, dataset.storage_format
+    return dataset.file_path, "csv"
+
+
+def category_dtypes(dataset: Dataset) -> Dict[str, str]:
+    """Get the dictionary-encoded columns of a dataset from its schema."""
+    return {
+        c["name"]: "category"
+        for c in (dataset.schema or {}).get("columns", [])
+        if c["type"] == "category"
+    }
+
+
+def known_columns(dataset: Dataset, columns: List[str]) -> List[str]:
+    """Get the given columns that the dataset has, in dataset order."""
+    known = [c["name"] for c in (dataset.schema or {}).get("columns", [])]
+    return [c for c in known if c in set(columns)] if known else list(columns)
+
+
+def load_dataframe(dataset: Dataset, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Load a dataset's DataFrame through the shared dataset cache.
+    
+    When columns are given only those are read from columnar storage,
+    unless the full frame is already cached. Unknown column names are
+    ignored so callers can report them with their usual errors.
+    """
+    path, storage_format = storage_location(dataset)
+    version = file_version(path)
+    full_key = (dataset.id, *version, None)
+    dtypes = category_dtypes(dataset)
+    
+    if columns is not None:
+        full = dataset_cache.get(full_key, count_miss=False)
+        wanted = known_columns(dataset, columns)
+        if full is not None:
+            return full[wanted]
+        return dataset_cache.get_or_load(
+            (dataset.id, *version, tuple(wanted)),
+            lambda: DataProcessor.read_dataset(path, storage_format, wanted, dtypes)
+        )
+    
+    return dataset_cache.get_or_load(
+        full_key, lambda: DataProcessor.read_dataset(path, storage_format, dtypes=dtypes)
+    )
+
+
+def load_stats_catalog(dataset: Dataset) -> Optional[StatsCatalog]:
+    """Get the statistics catalog recorded when the dataset was ingested, if any."""
+    path, _ = storage_location(dataset)
+    return StatsCatalog.load(StatsCatalog.path_for(path))
+
+
+def load_rollups(dataset: Dataset) -> Optional[RollupStore]:
+    """Get the materialized rollups of a dataset, unless they predate its data."""
+    path, _ = storage_location(dataset)
+    store = RollupStore.load(RollupStore.directory_for(path))
+    if store is None or store.version != file_version(path):
+        return None
+    return store
+
+
+def load_bitmap(dataset: Dataset, column: str, value: str) -> np.ndarray:
+    """Get the cached bitmap of the rows where a dictionary-encoded column equals a value."""
+    path, _ = storage_location(dataset)
+    return dataset_cache.get_or_load(
+        (dataset.id, *file_version(path), "bitmap", column, value),
+        lambda: BitmapIndex.build(load_dataframe(dataset, [column])[column], value)
+    )
+
+
+def index_candidates(
+    dataset: Dataset,
+    filters: List[Dict[str, Any]],
+    logic: str = "and"
+) -> Tuple[Optional[np.ndarray], bool]:
+    """Narrow the rows filters can match using the dataset's indexes.
+    
+    Equality filters on low-cardinality columns are answered exactly from
+    bitmaps, and text filters are narrowed by text indexes. Returns sorted
+    row positions that may match, or None when the indexes cannot narrow
+    the search, and whether those rows match exactly.
+    """
+    path, _ = storage_location(dataset)
+    columns = {
+        c["name"]: (i, c) for i, c in enumerate((dataset.schema or {}).get("columns", []))
+    }
+    
+    bitmaps: List[np.ndarray] = []
+    candidates: List[np.ndarray] = []
+    unindexed = False
+    for f in filters:
+        position, column = columns.get(f["column"], (None, None))
+        bits = rows = None
+        if column is not None and (
+            column["type"] == "category"
+            and BitmapIndex.supports(f["operator"], f["value"])
+            and column.get("unique_count", 0) <= settings.BITMAP_MAX_CARDINALITY
+        ):
+            bits = BitmapIndex.match(load_bitmap(dataset, column["name"], f["value"]), f["operator"])
+        elif column is not None and f["operator"] in TextIndex.OPERATORS:
+            index = TextIndex.load(TextIndex.path_for(path, position))
+            if index is not None and index.version == file_version(path):
+                rows = index.candidates(f["operator"], f["value"])
+        
+        if bits is not None:
+            bitmaps.append(bits)
+        elif rows is not None:
+            candidates.append(rows)
+        else:
+            unindexed = True
+    
+    if logic == "and":
+        if bitmaps:
+            candidates.append(
+                BitmapIndex.positions(np.bitwise_and.reduce(bitmaps), dataset.row_count)
+            )
+        if not candidates:
+            return None, False
+        candidates.sort(key=len)
+        matched = candidates[0]
+        for rows in candidates[1:]:
+            matched = np.intersect1d(matched, rows, assume_unique=True)
+        return matched, len(candidates) == 1 and bool(bitmaps) and not unindexed
+    
+    if unindexed or not filters:
+        return None, False
+    exact = not candidates
+    if bitmaps:
+        candidates.append(BitmapIndex.positions(np.bitwise_or.reduce(bitmaps), dataset.row_count))
+    return np.unique(np.concatenate(candidates)), exact
+
+
+def canonical(value: Any) -> str:
+    """Serialize request parameters the same way regardless of key order."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _query_key(
+    dataset: Dataset,
+    filters: List[Dict[str, Any]],
+    logic: str,
+    sort: Optional[List[Dict[str, Any]]] = None
+) -> Tuple[Hashable, ...]:
+    """Cache key of the matching positions of a filter, in sort order if given."""
+    path, _ = storage_location(dataset)
+    key = (dataset.id, *file_version(path), "filter", logic, canonical(filters))
+    return key + (canonical(sort),) if sort else key
+
+
+def _scan_matches(
+    path: str,
+    storage_format: str,
+    dtypes: Dict[str, str],
+    columns: List[str],
+    filters: List[Dict[str, Any]],
+    logic: str,
+    candidates: Optional[np.ndarray]
+) -> Optional[np.ndarray]:
+    """Test filters against the given columns of stored rows, only candidates if given.
+    
+    For column stores, zone maps rule out blocks that cannot match and
+    only the remaining rows are read. Nothing goes through the dataset
+    cache, so this can run in a pool worker.
+    """
+    if storage_format == "columns":
+        store = ColumnStore(path)
+        blocks = store.candidate_blocks(filters, logic)
+        read_columns = [c for c in columns if c in store.column_names]
+        if candidates is None:
+            predicates = store.read_blocks(blocks, read_columns)
+        else:
+            candidates = candidates[blocks[candidates // store.block_rows]]
+            predicates = store.take(candidates, read_columns)
+    else:
+        predicates = DataProcessor.read_dataset(path, storage_format, columns, dtypes)
+        if candidates is not None:
+            predicates = predicates.iloc[candidates]
+    return _mask_positions(predicates, filters, logic)
+
+
+def _mask_positions(
+    predicates: pd.DataFrame,
+    filters: List[Dict[str, Any]],
+    logic: str
+) -> Optional[np.ndarray]:
+    mask = DataProcessor.filter_mask(predicates, filters, logic, check_deadline)
+    if mask is None:
+        return None
+    return predicates.index.to_numpy()[mask.to_numpy()]
+
+
+def _match_positions(
+    dataset: Dataset,
+    filters: List[Dict[str, Any]],
+    logic: str = "and"
+) -> Optional[np.ndarray]:
+    """Evaluate filters, returning matching positions or None if no filter applies.
+    
+    Indexes answer equality filters on low-cardinality columns outright and
+    narrow text filters to candidate rows, and only those are tested.
+    Column stores that are not fully cached are filtered from disk, as
+    are large datasets when a process pool is configured, in a worker.
+    """
+    if not filters:
+        return None
+    
+    filter_columns = list(dict.fromkeys(f["column"] for f in filters))
+    path, storage_format = storage_location(dataset)
+    full = dataset_cache.get((dataset.id, *file_version(path), None), count_miss=False)
+    candidates, exact = index_candidates(dataset, filters, logic)
+    if exact:
+        return candidates
+    
+    if full is None and (storage_format == "columns" or process_pool.offloads(dataset.row_count)):
+        columns = known_columns(dataset, filter_columns)
+        args = (path, storage_format, category_dtypes(dataset), columns, filters, logic, candidates)
+        if process_pool.offloads(dataset.row_count):
+            return process_pool.run(_scan_matches, *args)
+        return _scan_matches(*args)
+    
+    predicates = full if full is not None else load_dataframe(dataset, filter_columns)
+    if candidates is not None:
+        predicates = predicates.iloc[candidates]
+    return _mask_positions(predicates, filters, logic)
+
+
+def filter_positions(
+    dataset: Dataset,
+    filters: List[Dict[str, Any]],
+    logic: str = "and"
+) -> Optional[np.ndarray]:
+    """Get the positions of rows matching filters, or None if no filter applies.
+    
+    Positions are cached per dataset version and canonical filters, so
+    every page after the first of a filtered view slices the cached array
+    instead of evaluating the filters again.
+    """
+    if not filters:
+        return None
+    
+    key = _query_key(dataset, filters, logic)
+    positions = dataset_cache.get(key)
+    if positions is None:
+        positions = _match_positions(dataset, filters, logic)
+        if positions is not None:
+            dataset_cache.put(key, positions)
+    return positions
+
+
+def query_positions(
+    dataset: Dataset,
+    filters: List[Dict[str, Any]],
+    logic: str = "and",
+    sort: Optional[List[Dict[str, Any]]] = None
+) -> Optional[np.ndarray]:
+    """Get the positions of matching rows in sort order.
+    
+    Returns None when neither a filter nor a sort applies, meaning every
+    row in stored order. Filtered and sorted positions are cached together.
+    """
+    positions = filter_positions(dataset, filters, logic)
+    if not sort:
+        return positions
+    if positions is None:
+        return load_sort_order(dataset, sort)
+    
+    return dataset_cache.get_or_load(
+        _query_key(dataset, filters, logic, sort),
+        lambda: sorted_positions(dataset, sort, positions)
+    )
+
+
+def scan_positions(
+    dataset: Dataset,
+    filters: List[Dict[str, Any]],
+    logic: str = "and",
+    sort: Optional[List[Dict[str, Any]]] = None,
+    start: int = 0,
+    limit: int = 100
+) -> Tuple[np.ndarray, Optional[int]]:
+    """Find the next ``limit`` matching rows from index ``start`` of the query order.
+    
+    Returns their positions and the index the following scan resumes from,
+    or None once every row has been seen. Cached query results are
+    sliced; otherwise rows are tested in growing chunks from ``start``, so
+    a call only looks as far as it needs to fill the batch.
+    """
+    order = load_sort_order(dataset, sort) if sort else None
+    if filters:
+        cached = dataset_cache.get(_query_key(dataset, filters, logic, sort), count_miss=False)
+        if cached is not None:
+            order, filters = cached, []
+    total = dataset.row_count if order is None else len(order)
+    
+    known = {c["name"] for c in (dataset.schema or {}).get("columns", [])}
+    filter_columns = list(dict.fromkeys(f["column"] for f in filters if f["column"] in known))
+    found: List[np.ndarray] = []
+    needed = limit
+    chunk = max(limit, SCAN_CHUNK_ROWS) if filters else limit
+    
+    while start < total and needed > 0:
+        check_deadline()
+        stop = min(start + chunk, total)
+        rows = np.arange(start, stop) if order is None else order[start:stop]
+        mask = (
+            DataProcessor.filter_mask(
+                load_positions(dataset, rows, filter_columns), filters, logic, check_deadline
+            )
+            if filters else None
+        )
+        hits = np.arange(len(rows)) if mask is None else np.flatnonzero(mask.to_numpy())
+        
+        if len(hits) >= needed:
+            found.append(rows[hits[:needed]])
+            start += int(hits[needed - 1]) + 1
+            needed = 0
+        else:
+            found.append(rows[hits])
+            needed -= len(hits)
+            start = stop
+        chunk *= 2
+    
+    positions = np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+    return positions, (start if start < total else None)
+
+
+def matching_count(
+    dataset: Dataset,
+    filters: List[Dict[str, Any]],
+    logic: str = "and",
+    compute: bool = True
+) -> Optional[int]:
+    """Count rows matching filters; without ``compute`` only if already known."""
+    if not filters:
+        return dataset.row_count
+    positions = dataset_cache.get(_query_key(dataset, filters, logic), count_miss=False)
+    if positions is None:
+        if not compute:
+            return None
+        positions = filter_positions(dataset, filters, logic)
+    return dataset.row_count if positions is None else len(positions)
+
+
+def load_filtered(
+    dataset: Dataset,
+    columns: List[str],
+    filters: List[Dict[str, Any]],
+    logic: str = "and"
+) -> pd.DataFrame:
+    """Load the given columns of the rows matching filters.
+    
+    Rows keep their dataset positions as index, and for column stores only
+    the matching rows are read.
+    """
+    positions = filter_positions(dataset, filters, logic)
+    if positions is None:
+        return load_dataframe(dataset, columns)
+    return load_positions(dataset, positions, columns)
+
+
+def _aggregate_stored(
+    path: str,
+    storage_format: str,
+    dtypes: Dict[str, str],
+    columns: List[str],
+    aggregates: List[Dict[str, Any]],
+    group_by: List[str]
+) -> pd.DataFrame:
+    """Read columns from storage and aggregate them, in a pool worker."""
+    df = DataProcessor.read_dataset(path, storage_format, columns, dtypes)
+    check_deadline()
+    return DataProcessor.aggregate_many(df, aggregates, group_by)
+
+
+def _aggregate_column_stored(
+    path: str,
+    storage_format: str,
+    dtypes: Dict[str, str],
+    columns: List[str],
+    column: str,
+    operation: str,
+    group_by: List[str]
+) -> Tuple[Any, Optional[pd.DataFrame]]:
+    """Read columns from storage and aggregate one of them, in a pool worker."""
+    df = DataProcessor.read_dataset(path, storage_format, columns, dtypes)
+    check_deadline()
+    return DataProcessor.aggregate_frame(df, column, operation, group_by)
+
+
+def _offload_reads(dataset: Dataset) -> bool:
+    """Whether to aggregate a dataset in a pool worker rather than from the cache."""
+    if not process_pool.offloads(dataset.row_count):
+        return False
+    path, _ = storage_location(dataset)
+    return dataset_cache.get((dataset.id, *file_version(path), None), count_miss=False) is None
+
+
+def compute_aggregates(
+    dataset: Dataset,
+    aggregates: List[Dict[str, Any]],
+    group_by: List[str]
+) -> pd.DataFrame:
+    """Compute several aggregates as ``DataProcessor.aggregate_many`` does.
+    
+    Large datasets that are not cached in full are aggregated in a pool
+    worker when one is configured.
+    """
+    columns = list(dict.fromkeys([*group_by, *(agg["column"] for agg in aggregates)]))
+    if _offload_reads(dataset):
+        path, storage_format = storage_location(dataset)
+        return process_pool.run(
+            _aggregate_stored,
+            path,
+            storage_format,
+            category_dtypes(dataset),
+            known_columns(dataset, columns),
+            aggregates,
+            group_by
+        )
+    df = load_dataframe(dataset, columns)
+    check_deadline()
+    return DataProcessor.aggregate_many(df, aggregates, group_by)
+
+
+def compute_aggregate(
+    dataset: Dataset,
+    column: str,
+    operation: str,
+    group_by: List[str]
+) -> Tuple[Any, Optional[pd.DataFrame]]:
+    """Compute one aggregate as ``DataProcessor.aggregate_frame`` does, in a worker if large."""
+    columns = [column, *group_by]
+    if _offload_reads(dataset):
+        path, storage_format = storage_location(dataset)
+        return process_pool.run(
+            _aggregate_column_stored,
+            path,
+            storage_format,
+            category_dtypes(dataset),
+            known_columns(dataset, columns),
+            column,
+            operation,
+            group_by
+        )
+    df = load_dataframe(dataset, columns)
+    check_deadline()
+    return DataProcessor.aggregate_frame(df, column, operation, group_by)
+
+
+def load_sort_order(dataset: Dataset, sort: List[Dict[str, Any]]) -> np.ndarray:
+    """Get the row permutation that sorts a whole dataset.
+    
+    Permutations are cached per dataset version and sort keys, and the
+    ranks of each sorted column are cached too, so paging through a sorted
+    dataset sorts it once and a new combination of keys only costs a
+    lexsort over integer ranks.
+    """
+    known = [c["name"] for c in (dataset.schema or {}).get("columns", [])]
+    for key in sort:
+        if key["column"] not in known:
+            raise ValueError(f"Column '{key['column']}' not found")
+    
+    path, _ = storage_location(dataset)
+    version = file_version(path)
+    spec = tuple(
+        (key["column"], key.get("direction", "asc"), key.get("nulls", "last")) for key in sort
+    )
+    
+    def column_ranks(column: str) -> np.ndarray:
+        return dataset_cache.get_or_load(
+            (dataset.id, *version, "ranks", column),
+            lambda: DataProcessor.column_ranks(load_dataframe(dataset, [column])[column])
+        )
+    
+    return dataset_cache.get_or_load(
+        (dataset.id, *version, "sort", spec),
+        lambda: DataProcessor.sort_permutation([column_ranks(c) for c, _, _ in spec], sort)
+    )
+
+
+def sorted_positions(
+    dataset: Dataset,
+    sort: List[Dict[str, Any]],
+    rows: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Get row positions in sort order, optionally only those in ``rows``."""
+    order = load_sort_order(dataset, sort)
+    if rows is None:
+        return order
+    keep = np.zeros(len(order), dtype=bool)
+    keep[rows] = True
+    return order[keep[order]]
+
+
+def load_positions(
+    dataset: Dataset,
+    positions: np.ndarray,
+    columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """Load the rows at the given positions, in that order."""
+    path, storage_format = storage_location(dataset)
+    full = dataset_cache.get((dataset.id, *file_version(path), None), count_miss=False)
+    if full is None and storage_format == "columns":
+        return ColumnStore(path).take(positions, columns)
+    return load_dataframe(dataset, columns).iloc[positions]
+
+
+def load_rows(
+    dataset: Dataset,
+    start: int,
+    stop: int,
+    sort: Optional[List[Dict[str, Any]]] = None,
+    columns: Optional[List[str]] = None
+) -> Tuple[pd.DataFrame, int]:
+    """Load rows [start, stop) of a dataset along with its total row count.
+    
+    Column stores are read directly through their memory maps and CSV files
+    through their row index, unless the full frame is already cached, so a
+    page never loads the whole dataset. Sorted pages are gathered through
+    the cached sort permutation. When columns are given only those are read.
+    """
+    if sort:
+        order = load_sort_order(dataset, sort)
+        return load_positions(dataset, order[start:stop], columns), len(order)
+    
+    path, storage_format = storage_location(dataset)
+    full_key = (dataset.id, *file_version(path), None)
+    cached = dataset_cache.get(full_key, count_miss=False) is not None
+    
+    if storage_format == "columns" and not cached:
+        store = ColumnStore(path)
+        return store.read_rows(start, stop, columns), store.row_count
+    
+    if storage_format == "csv" and not cached and dataset.schema:
+        index = CsvRowIndex.load_or_build(path, settings.ROW_INDEX_STRIDE)
+        schema_columns = dataset.schema["columns"]
+        page = index.read_rows(
+            path,
+            start,
+            stop,
+            [c["name"] for c in schema_columns],
+            {c["name"]: (object if c["type"] == "object" else c["type"]) for c in schema_columns},
+            columns
+        )
+        return page, index.row_count
+    
+    df = load_dataframe(dataset, columns)
+    return df.iloc[start:stop], len(df)
@@ -0,0 +1,94 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional, Protocol
+
+# Status nginx uses for requests the client abandoned; HTTP defines none
+CLIENT_CLOSED_REQUEST = 499
+
+
+class QueryInterrupted(Exception):
+    """A query stopped before finishing."""
+    
+    status_code = 500
+
+
+class QueryTimeout(QueryInterrupted):
+    """A query ran past its deadline."""
+    
+    status_code = 504
+
+
+class QueryCancelled(QueryInterrupted):
+    """A query was cancelled because its client went away."""
+    
+    status_code = CLIENT_CLOSED_REQUEST
+
+
+class CancelFlag(Protocol):
+    """A flag with the ``set``/``is_set`` interface of ``threading.Event``."""
+    
+    def set(self) -> None: ...
+    
+    def is_set(self) -> bool: ...
+
+
+class Deadline:
+    """The time limit and cancellation flag of one query.
+    
+    Long loops call ``check`` between chunks of work, so a query stops
+    soon after it runs out of time or its client disconnects. A limit of
+    None or 0 never expires. The flag defaults to a ``threading.Event``;
+    work in another process passes one both processes can see.
+    """
+    
+    def __init__(self, seconds: Optional[float], flag: Optional[CancelFlag] = None):
+        self.seconds = seconds or None
+        self.expires_at = time.monotonic() + seconds if seconds else None
+        self._cancelled = flag if flag is not None else threading.Event()
+    
+    def cancel(self) -> None:
+        self._cancelled.set()
+    
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+    
+    def remaining(self) -> Optional[float]:
+        """Seconds left, or None without a limit."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+    
+    def check(self) -> None:
+        """Raise if the query was cancelled or is out of time."""
+        if self.cancelled:
+            raise QueryCancelled("Query cancelled: the client closed the connection")
+        if self.expires_at is not None and time.monotonic() >= self.expires_at:
+            raise QueryTimeout(f"Query exceeded its {self.seconds:g}s time limit")
+
+
+_current: ContextVar[Optional[Deadline]] = ContextVar("deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Get the deadline of the query running in this context, if any."""
+    return _current.get()
+
+
+def check_deadline() -> None:
+    """Stop the current query if it was cancelled or is out of time."""
+    deadline = _current.get()
+    if deadline is not None:
+        deadline.check()
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """Make a deadline current for the code run inside the block."""
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
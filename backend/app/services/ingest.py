@@ -0,0 +1,267 @@
+import shutil
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.services.column_store import ColumnStoreWriter
+from app.services.sketches import DistinctCounter, KllSketch
+from app.services.stats_catalog import StatsCatalog
+
+
+class ColumnProfile:
+    """Running statistics for one column, built chunk by chunk.
+    
+    Profiles of separate chunks can be merged, so the resulting schema
+    entry matches ``DataProcessor.infer_schema`` without ever holding the
+    whole column in memory. Distinct counts are exact for small columns and
+    approximate past ``DistinctCounter.exact_limit``. Numeric columns also
+    track the sum of squared deviations and a quantile sketch for the
+    stats catalog.
+    """
+    
+    SAMPLE_SIZE = 5
+    
+    def __init__(self, name: str, dtype: str):
+        self.name = name
+        self.dtype = dtype
+        self.count = 0
+        self.null_count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.m2 = 0.0
+        self.distinct = DistinctCounter()
+        self.quantiles: Optional[KllSketch] = KllSketch() if self.is_numeric else None
+        self.sample_values: List[Any] = []
+    
+    @property
+    def is_numeric(self) -> bool:
+        return pd.api.types.is_numeric_dtype(pd.api.types.pandas_dtype(self.dtype))
+    
+    def _merge_moments(self, count: int, total: float, m2: float) -> None:
+        """Combine sums of squared deviations of two parts (Chan et al.)."""
+        if count and self.count:
+            delta = total / count - self.total / self.count
+            self.m2 += m2 + delta * delta * self.count * count / (self.count + count)
+        else:
+            self.m2 += m2
+    
+    def update(self, values: pd.Series) -> None:
+        """Add a chunk of values."""
+        non_null = values.dropna()
+        self.distinct.add(non_null)
+        
+        if len(self.sample_values) < self.SAMPLE_SIZE:
+            needed = self.SAMPLE_SIZE - len(self.sample_values)
+            self.sample_values.extend(non_null.head(needed).tolist())
+        
+        if self.is_numeric and len(non_null):
+            numbers = non_null.to_numpy(dtype=np.float64)
+            chunk_total = float(numbers.sum())
+            chunk_m2 = float(((numbers - chunk_total / len(numbers)) ** 2).sum())
+            self._merge_moments(len(numbers), chunk_total, chunk_m2)
+            self.total += chunk_total
+            self.quantiles.add(numbers)
+            chunk_min, chunk_max = float(numbers.min()), float(numbers.max())
+            self.min = chunk_min if self.min is None else min(self.min, chunk_min)
+            self.max = chunk_max if self.max is None else max(self.max, chunk_max)
+        
+        self.count += len(non_null)
+        self.null_count += len(values) - len(non_null)
+    
+    def merge(self, other: "ColumnProfile") -> None:
+        """Merge the profile of another chunk of the same column."""
+        self._merge_moments(other.count, other.total, other.m2)
+        self.count += other.count
+        self.null_count += other.null_count
+        self.total += other.total
+        self.distinct.merge(other.distinct)
+        if self.quantiles is not None and other.quantiles is not None:
+            self.quantiles.merge(other.quantiles)
+        self.sample_values = (self.sample_values + other.sample_values)[:self.SAMPLE_SIZE]
+        for attr, pick in (("min", min), ("max", max)):
+            mine, theirs = getattr(self, attr), getattr(other, attr)
+            if mine is None or theirs is None:
+                setattr(self, attr, theirs if mine is None else mine)
+            else:
+                setattr(self, attr, pick(mine, theirs))
+    
+    def to_schema(self) -> Dict[str, Any]:
+        """Build the schema entry for this column."""
+        col_info = {
+            "name": self.name,
+            "type": self.dtype,
+            "nullable": self.null_count > 0,
+            "unique_count": self.distinct.count(),
+            "sample_values": self.sample_values
+        }
+        
+        if self.is_numeric:
+            col_info["semantic_type"] = "numeric"
+            col_info["min"] = self.min
+            col_info["max"] = self.max
+            col_info["mean"] = self.total / self.count if self.count else None
+        else:
+            col_info["semantic_type"] = "text"
+        
+        return col_info
+
+
+def remove_storage(path: Optional[str]) -> None:
+    """Delete a stored dataset file or column store directory."""
+    if not path:
+        return
+    target = Path(path)
+    if target.is_dir():
+        shutil.rmtree(target)
+    elif target.exists():
+        target.unlink()
+
+
+def _merge_dtypes(current: Optional[str], new: str) -> str:
+    """Widen a column dtype so it holds values from both chunks."""
+    if current is None or current == new:
+        return new
+    numeric = ("int64", "float64")
+    if current in numeric and new in numeric:
+        return "float64"
+    return "object"
+
+
+def _read_chunks(
+    file_path: str,
+    chunk_rows: int,
+    dtypes: Optional[Dict[str, Any]] = None
+) -> Iterator[pd.DataFrame]:
+    """Yield CSV chunks, including the header-only frame for empty files."""
+    empty = True
+    for chunk in pd.read_csv(file_path, chunksize=chunk_rows, dtype=dtypes):
+        empty = False
+        yield chunk
+    if empty:
+        yield pd.read_csv(file_path, nrows=0, dtype=dtypes)
+
+
+def scan_dtypes(
+    file_path: str,
+    chunk_rows: int,
+    category_ratio: float = 0.0,
+    category_max_distinct: int = 0
+) -> Dict[str, str]:
+    """Find the dtype of every column across all chunks of a CSV file.
+    
+    Text columns whose distinct count is at most ``category_ratio`` of their
+    non-null values, and at most ``category_max_distinct`` when that is set,
+    are reported as ``category`` so they get dictionary encoded. Columns
+    over either limit stay ``object``, since encoding them would keep every
+    distinct value in memory while writing.
+    """
+    dtypes: Dict[str, str] = {}
+    distinct: Dict[str, DistinctCounter] = {}
+    counts: Dict[str, int] = {}
+    
+    for chunk in _read_chunks(file_path, chunk_rows):
+        for col in chunk.columns:
+            values = chunk[col]
+            dtypes[col] = _merge_dtypes(dtypes.get(col), str(values.dtype))
+            if category_ratio <= 0 or counts.get(col) == -1:
+                continue
+            if values.dtype != object:
+                # Parsed as numbers here, so distinct counts would be incomplete
+                counts[col] = -1 if values.notnull().any() else counts.get(col, 0)
+                continue
+            values = values.dropna()
+            distinct.setdefault(col, DistinctCounter()).add(values)
+            counts[col] = counts.get(col, 0) + len(values)
+            if category_max_distinct > 0 and distinct[col].count() > category_max_distinct:
+                # Too many values to encode however the file continues
+                counts[col] = -1
+                del distinct[col]
+    
+    for col, counter in distinct.items():
+        if counts[col] > 0 and counter.count() <= category_ratio * counts[col]:
+            dtypes[col] = "category"
+    
+    return dtypes
+
+
+class _ParquetChunkWriter:
+    """Append DataFrame chunks to a Parquet file as row groups."""
+    
+    ARROW_TYPES = {
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "bool": pa.bool_(),
+        "category": pa.dictionary(pa.int32(), pa.string())
+    }
+    
+    def __init__(self, path: str, dtypes: Dict[str, str]):
+        self.schema = pa.schema([
+            (name, self.ARROW_TYPES.get(dtype, pa.string()))
+            for name, dtype in dtypes.items()
+        ])
+        self._writer = pq.ParquetWriter(path, self.schema)
+    
+    def __enter__(self) -> "_ParquetChunkWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._writer.close()
+    
+    def append(self, df: pd.DataFrame) -> None:
+        self._writer.write_table(
+            pa.Table.from_pandas(df, schema=self.schema, preserve_index=False)
+        )
+
+
+def ingest_csv(
+    file_path: str,
+    storage_path: str,
+    storage_format: str,
+    chunk_rows: int,
+    category_ratio: float = 0.0,
+    category_max_distinct: int = 0
+) -> Dict[str, Any]:
+    """Convert a CSV file to columnar storage and build its schema.
+    
+    The file is streamed twice: once to settle each column's dtype across
+    all chunks, and once to write the converted output and update running
+    column profiles. Peak memory is bounded by ``chunk_rows``.
+    """
+    dtypes = scan_dtypes(file_path, chunk_rows, category_ratio, category_max_distinct)
+    read_dtypes = {
+        col: (object if dtype == "object" else dtype) for col, dtype in dtypes.items()
+    }
+    profiles = [ColumnProfile(col, dtype) for col, dtype in dtypes.items()]
+    
+    if storage_format == "parquet":
+        writer = _ParquetChunkWriter(storage_path, dtypes)
+    elif storage_format == "columns":
+        writer = ColumnStoreWriter(storage_path)
+    elif storage_format == "csv":
+        # The CSV itself is served, through a row index built by the caller
+        writer = None
+    else:
+        raise ValueError(f"Unknown storage format: {storage_format}")
+    
+    row_count = 0
+    with writer or nullcontext():
+        for chunk in _read_chunks(file_path, chunk_rows, read_dtypes):
+            if writer is not None:
+                writer.append(chunk)
+            for profile in profiles:
+                profile.update(chunk[profile.name])
+            row_count += len(chunk)
+    
+    StatsCatalog.from_profiles(profiles).save(StatsCatalog.path_for(storage_path or file_path))
+    
+    return {
+        "columns": [profile.to_schema() for profile in profiles],
+        "row_count": row_count,
+        "column_count": len(profiles)
+    }
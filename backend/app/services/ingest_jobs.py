@@ -0,0 +1,210 @@
+import asyncio
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.dataset import Dataset
+from app.services.dataset_cache import file_version, storage_location
+from app.services.ingest import ingest_csv, remove_storage
+from app.services.process_pool import process_pool
+from app.services.rollups import dataset_chart_specs, rebuild_rollups
+from app.services.row_index import CsvRowIndex
+from app.services.stats_catalog import build_column_stats
+from app.services.text_index import TextIndex, build_text_indexes
+from app.services.websocket_manager import manager
+
+logger = logging.getLogger(__name__)
+
+
+class IngestJobManager:
+    """Run dataset ingest on a local worker pool.
+    
+    Uploads are saved and recorded with status ``processing``; a worker
+    then converts the file, stores the schema and marks the dataset
+    ``ready`` or ``failed``. The owner is notified over their notification
+    websocket when the job finishes. Exact column statistics, rollups for
+    existing charts and the text search indexes of large datasets are built
+    afterwards; until then stats, aggregates and filters scan rows. Jobs
+    live only in this process, so ``resume`` picks up the ones a restart
+    interrupted.
+    """
+    
+    def __init__(self, max_workers: int):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ingest"
+        )
+        self._futures: Dict[int, Future] = {}
+    
+    def submit(
+        self,
+        dataset_id: int,
+        session_factory: Callable[[], Session],
+        loop: Optional[asyncio.AbstractEventLoop] = None
+    ) -> Future:
+        """Queue an ingest job for a dataset."""
+        future = self._executor.submit(self._run, dataset_id, session_factory, loop)
+        self._futures[dataset_id] = future
+        future.add_done_callback(lambda _: self._futures.pop(dataset_id, None))
+        return future
+    
+    def resume(
+        self,
+        session_factory: Callable[[], Session],
+        loop: Optional[asyncio.AbstractEventLoop] = None
+    ) -> None:
+        """Requeue datasets an earlier process left ``processing``.
+        
+        Their partial output is discarded and the saved upload converted
+        again; datasets whose upload is gone are marked ``failed``.
+        """
+        db = session_factory()
+        try:
+            requeue = []
+            for dataset in db.query(Dataset).filter(Dataset.status == "processing").all():
+                if dataset.id in self._futures:
+                    continue
+                if Path(dataset.file_path).is_file():
+                    remove_storage(dataset.storage_path)
+                    requeue.append(dataset.id)
+                else:
+                    dataset.status = "failed"
+                    dataset.error = (
+                        "Error processing file: the server restarted and the upload is gone"
+                    )
+            db.commit()
+        finally:
+            db.close()
+        
+        for dataset_id in requeue:
+            logger.info("Requeueing interrupted ingest of dataset %s", dataset_id)
+            self.submit(dataset_id, session_factory, loop)
+    
+    def wait(self, dataset_id: int, timeout: Optional[float] = None) -> None:
+        """Block until a dataset's pending job, if any, has finished."""
+        future = self._futures.get(dataset_id)
+        if future is not None:
+            future.result(timeout=timeout)
+    
+    def shutdown(self) -> None:
+        """Stop accepting jobs and wait for running ones."""
+        self._executor.shutdown(wait=True)
+    
+    def _run(
+        self,
+        dataset_id: int,
+        session_factory: Callable[[], Session],
+        loop: Optional[asyncio.AbstractEventLoop]
+    ) -> None:
+        db = session_factory()
+        try:
+            dataset = db.get(Dataset, dataset_id)
+            if dataset is None:
+                return
+            storage_path = dataset.storage_path
+            
+            try:
+                # Parsing holds the interpreter lock, so it runs in a worker when there are any
+                schema = process_pool.run(
+                    ingest_csv,
+                    dataset.file_path,
+                    storage_path,
+                    dataset.storage_format,
+                    settings.INGEST_CHUNK_ROWS,
+                    settings.CATEGORY_MAX_RATIO,
+                    settings.CATEGORY_MAX_DISTINCT
+                )
+                if dataset.storage_format == "csv":
+                    CsvRowIndex.build(dataset.file_path, settings.ROW_INDEX_STRIDE).save(
+                        CsvRowIndex.path_for(dataset.file_path)
+                    )
+                error = None
+            except Exception as e:
+                remove_storage(storage_path)
+                schema, error = None, str(e)
+            
+            # The dataset may have been deleted while the job ran
+            db.expire_all()
+            dataset = db.get(Dataset, dataset_id)
+            if dataset is None:
+                remove_storage(storage_path)
+                return
+            
+            if error is None:
+                dataset.schema = schema
+                dataset.row_count = schema["row_count"]
+                dataset.column_count = schema["column_count"]
+                dataset.status = "ready"
+            else:
+                dataset.status = "failed"
+                dataset.error = f"Error processing file: {error}"
+            db.commit()
+            
+            message = {
+                "type": "dataset_status",
+                "dataset_id": dataset.id,
+                "status": dataset.status,
+                "error": dataset.error
+            }
+            if loop is not None:
+                notify = manager.send_to_user(dataset.owner_id, message)
+                try:
+                    asyncio.run_coroutine_threadsafe(notify, loop)
+                except RuntimeError:
+                    # Event loop already closed, nobody left to notify
+                    notify.close()
+            
+            if error is None:
+                self._build_column_stats(dataset)
+                self._build_rollups(db, dataset)
+            if error is None and 0 <= settings.TEXT_INDEX_MIN_ROWS <= dataset.row_count:
+                self._build_text_indexes(dataset)
+        finally:
+            db.close()
+    
+    @staticmethod
+    def _build_column_stats(dataset: Dataset) -> None:
+        try:
+            process_pool.run(
+                build_column_stats,
+                dataset.storage_path or dataset.file_path,
+                dataset.storage_format,
+                dataset.schema
+            )
+        except Exception as e:
+            # Stats requests fall back to scanning the column
+            logger.warning("Column stats build failed for dataset %s: %s", dataset.id, e)
+    
+    @staticmethod
+    def _build_rollups(db: Session, dataset: Dataset) -> None:
+        try:
+            path, storage_format = storage_location(dataset)
+            rebuild_rollups(
+                path, storage_format, file_version(path), dataset_chart_specs(db, dataset.id)
+            )
+        except Exception as e:
+            # Aggregates fall back to the raw rows
+            logger.warning("Rollup build failed for dataset %s: %s", dataset.id, e)
+    
+    @staticmethod
+    def _build_text_indexes(dataset: Dataset) -> None:
+        data_path, storage_format = storage_location(dataset)
+        try:
+            process_pool.run(
+                build_text_indexes,
+                data_path,
+                storage_format,
+                dataset.schema,
+                file_version(data_path)
+            )
+        except Exception as e:
+            # Filters still work without indexes, just slower
+            logger.warning("Text index build failed for dataset %s: %s", dataset.id, e)
+            remove_storage(TextIndex.directory_for(data_path))
+
+
+# Global ingest job manager instance
+ingest_jobs = IngestJobManager(settings.INGEST_WORKERS)
@@ -0,0 +1,262 @@
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from multiprocessing import shared_memory
+from typing import Any, Callable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from app.core.config import settings
+from app.services.deadlines import Deadline, QueryInterrupted, current_deadline, deadline_scope
+
+
+class SharedFrame(tuple):
+    """Handle of a DataFrame written to shared memory as an Arrow IPC stream."""
+
+
+class SharedArray(tuple):
+    """Handle of a NumPy array written to shared memory."""
+
+
+def _copy_out(name: str, size: int) -> np.ndarray:
+    """Copy a shared memory block into process memory and free the block."""
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        return np.frombuffer(block.buf, dtype=np.uint8, count=size).copy()
+    finally:
+        block.close()
+        block.unlink()
+
+
+def _write_block(data: np.ndarray) -> str:
+    """Copy a byte array into a new shared memory block, returning its name."""
+    block = shared_memory.SharedMemory(create=True, size=max(1, data.nbytes))
+    try:
+        block.buf[:data.nbytes] = data
+    except BaseException:
+        block.close()
+        block.unlink()
+        raise
+    name = block.name
+    block.close()
+    return name
+
+
+def share_frame(df: pd.DataFrame) -> SharedFrame:
+    """Write a DataFrame to a new shared memory block."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    buffer = sink.getvalue()
+    return SharedFrame((_write_block(np.frombuffer(buffer, dtype=np.uint8)), buffer.size))
+
+
+def receive_frame(handle: SharedFrame) -> pd.DataFrame:
+    """Read a shared DataFrame back, freeing its block."""
+    name, size = handle
+    return pa.ipc.open_stream(pa.py_buffer(_copy_out(name, size))).read_all().to_pandas()
+
+
+def share_array(values: np.ndarray) -> SharedArray:
+    """Write an array to a new shared memory block."""
+    values = np.ascontiguousarray(values)
+    data = values.reshape(-1).view(np.uint8)
+    return SharedArray((_write_block(data), values.dtype.str, values.shape))
+
+
+def receive_array(handle: SharedArray) -> np.ndarray:
+    """Read a shared array back, freeing its block."""
+    name, dtype, shape = handle
+    size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    return _copy_out(name, size).view(dtype).reshape(shape)
+
+
+def _share(result: Any) -> Any:
+    if isinstance(result, pd.DataFrame):
+        return share_frame(result)
+    if isinstance(result, np.ndarray):
+        return share_array(result)
+    if isinstance(result, tuple):
+        return tuple(_share(item) for item in result)
+    return result
+
+
+def _receive(result: Any) -> Any:
+    if isinstance(result, SharedFrame):
+        return receive_frame(result)
+    if isinstance(result, SharedArray):
+        return receive_array(result)
+    if isinstance(result, tuple):
+        return tuple(_receive(item) for item in result)
+    return result
+
+
+def _free(result: Any) -> None:
+    """Release the shared memory of a result nobody will receive."""
+    if isinstance(result, (SharedFrame, SharedArray)):
+        block = shared_memory.SharedMemory(name=result[0])
+        block.close()
+        block.unlink()
+    elif isinstance(result, tuple):
+        for item in result:
+            _free(item)
+
+
+def _discard(future: Future) -> None:
+    if not future.cancelled() and future.exception() is None:
+        _free(future.result())
+
+
+class _SharedFlag:
+    """A cancellation flag in one byte of shared memory.
+    
+    The caller creates it and sets it when its query is interrupted; the
+    worker opens it by name and reads it at every deadline check.
+    """
+    
+    def __init__(self, name: Optional[str] = None):
+        self._block = shared_memory.SharedMemory(name=name, create=name is None, size=1)
+        self._owner = name is None
+        self._lock = threading.Lock()
+        self._closed = False
+        if self._owner:
+            self._block.buf[0] = 0
+    
+    @property
+    def name(self) -> str:
+        return self._block.name
+    
+    def set(self) -> None:
+        with self._lock:
+            if not self._closed:
+                self._block.buf[0] = 1
+    
+    def is_set(self) -> bool:
+        with self._lock:
+            return not self._closed and self._block.buf[0] == 1
+    
+    def close(self) -> None:
+        """Detach from the block, freeing it if this side created it."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._block.close()
+            if self._owner:
+                self._block.unlink()
+
+
+def _call(
+    fn: Callable[..., Any],
+    args: Tuple[Any, ...],
+    timeout: Optional[float],
+    flag_name: Optional[str] = None
+) -> Any:
+    """Run a task in a worker and hand large results over through shared memory.
+    
+    The caller's remaining time and cancellation flag are enforced in the
+    worker too, so a task stops at its next checkpoint once it runs out of
+    time or its client disconnects.
+    """
+    if flag_name is None:
+        with deadline_scope(Deadline(timeout) if timeout is not None else None):
+            return _share(fn(*args))
+    
+    flag = _SharedFlag(flag_name)
+    try:
+        with deadline_scope(Deadline(timeout, flag)):
+            return _share(fn(*args))
+    finally:
+        flag.close()
+
+
+class ProcessPool:
+    """Run CPU-heavy tasks in worker processes.
+    
+    Request handlers run in threads, so pandas parsing, filtering and
+    grouping share one interpreter lock; worker processes let them use
+    every core. Tasks are module-level functions that read data from
+    storage themselves, so only paths and parameters are pickled going
+    in. DataFrames and arrays come back as Arrow streams and raw buffers
+    in shared memory, copied out once by the caller. With no workers
+    configured, tasks run in the calling thread.
+    """
+    
+    # Seconds between deadline checks while waiting on a worker
+    POLL_SECONDS = 0.1
+    
+    def __init__(self, workers: int, min_rows: int):
+        self.workers = workers
+        self.min_rows = min_rows
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+    
+    def offloads(self, row_count: int) -> bool:
+        """Whether work over this many rows is worth sending to a worker."""
+        return self.enabled and row_count >= self.min_rows
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Forking a threaded server can deadlock children, so start fresh interpreters
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+    
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Call ``fn(*args)`` in a worker process, or inline without workers.
+        
+        While waiting, the current query deadline is checked every
+        ``POLL_SECONDS``; if it fires the caller stops waiting, raises the
+        task's shared cancellation flag so the worker stops at its next
+        checkpoint, and throws the task's result, if any, away.
+        """
+        if not self.enabled:
+            return fn(*args)
+        
+        deadline = current_deadline()
+        if deadline is None:
+            return _receive(self._get_executor().submit(_call, fn, args, None).result())
+        
+        deadline.check()
+        flag = _SharedFlag()
+        try:
+            future = self._get_executor().submit(
+                _call, fn, args, deadline.remaining(), flag.name
+            )
+        except BaseException:
+            flag.close()
+            raise
+        # The worker may still be reading the flag after the caller gives up
+        future.add_done_callback(lambda _: flag.close())
+        while True:
+            try:
+                return _receive(future.result(timeout=self.POLL_SECONDS))
+            except FutureTimeout:
+                pass
+            try:
+                deadline.check()
+            except QueryInterrupted:
+                flag.set()
+                if not future.cancel():
+                    future.add_done_callback(_discard)
+                raise
+    
+    def shutdown(self) -> None:
+        """Stop the workers once running tasks finish."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+# Global process pool instance
+process_pool = ProcessPool(settings.PROCESS_POOL_WORKERS, settings.PROCESS_POOL_MIN_ROWS)
@@ -0,0 +1,94 @@
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+
+from app.models.dataset import Dataset
+from app.services.data_processor import DataProcessor
+from app.services.dataset_cache import (
+    load_dataframe, load_filtered, load_positions, load_rows, query_positions
+)
+from app.services.deadlines import check_deadline
+
+
+class QueryPlan:
+    """Execution plan for a dataset query.
+    
+    A query runs filter, aggregate, sort, project and page in that order.
+    Compiling the plan validates column references and works out which
+    stored columns the later stages need, so only those are read and
+    filters are evaluated before the other columns are loaded. Row
+    queries only read the requested page, through the cached positions of
+    matching rows in sort order.
+    """
+    
+    def __init__(self, query: Dict[str, Any], known_columns: List[str]):
+        self.filters = query.get("filters") or []
+        self.logic = query.get("logic", "and")
+        self.group_by = query.get("group_by") or []
+        self.aggregates = query.get("aggregates") or []
+        self.sort = query.get("sort") or []
+        self.columns = query.get("columns")
+        self.page = query.get("page", 1)
+        self.page_size = query.get("page_size", 100)
+        
+        if self.logic not in ("and", "or"):
+            raise ValueError(f"Unknown filter logic: {self.logic}")
+        if self.group_by and not self.aggregates:
+            raise ValueError("group_by requires at least one aggregate")
+        
+        referenced = [f["column"] for f in self.filters] + self.group_by
+        if self.aggregates:
+            referenced += [agg["column"] for agg in self.aggregates]
+            output = self.group_by + [
+                agg.get("alias") or f"{agg['column']}_{agg['operation']}"
+                for agg in self.aggregates
+            ]
+            read = self.group_by + [agg["column"] for agg in self.aggregates]
+        else:
+            output = known_columns
+            read = (self.columns or known_columns) + [key["column"] for key in self.sort]
+            referenced += read
+        self.output_columns = self.columns or output
+        
+        self._check_columns(referenced, known_columns)
+        self._check_columns([key["column"] for key in self.sort], output)
+        self._check_columns(self.columns or [], output)
+        
+        # Stored columns needed after filtering, in first-use order
+        self.read_columns = list(dict.fromkeys(read))
+    
+    @staticmethod
+    def _check_columns(columns: List[str], available: List[str]) -> None:
+        available = set(available)
+        for column in columns:
+            if column not in available:
+                raise ValueError(f"Column '{column}' not found")
+    
+    def execute(self, dataset: Dataset) -> Tuple[pd.DataFrame, int]:
+        """Run the plan, returning the requested page and the total row count."""
+        if not self.aggregates:
+            return self._execute_rows(dataset)
+        
+        if self.filters:
+            df = load_filtered(dataset, self.read_columns, self.filters, self.logic)
+        else:
+            df = load_dataframe(dataset, self.read_columns)
+        
+        check_deadline()
+        df = DataProcessor.aggregate_many(df, self.aggregates, self.group_by)
+        df = DataProcessor.sort_frame(df, self.sort)
+        if self.columns:
+            df = df[self.columns]
+        
+        return DataProcessor.paginate(df, self.page, self.page_size), len(df)
+    
+    def _execute_rows(self, dataset: Dataset) -> Tuple[pd.DataFrame, int]:
+        """Read one page of matching rows in sort order."""
+        start = (self.page - 1) * self.page_size
+        stop = start + self.page_size
+        positions = query_positions(dataset, self.filters, self.logic, self.sort)
+        if positions is None:
+            df, total_rows = load_rows(dataset, start, stop, columns=self.output_columns)
+            return df[self.output_columns], total_rows
+        df = load_positions(dataset, positions[start:stop], self.output_columns)
+        return df[self.output_columns], len(positions)
@@ -0,0 +1,147 @@
+import hashlib
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import redis
+
+from app.core.config import settings
+from app.models.dataset import Dataset
+from app.services.dataset_cache import MemoryCache, canonical, dataset_version
+
+logger = logging.getLogger(__name__)
+
+ResultKey = Tuple[int, str, str, str]
+
+
+def result_key(dataset: Dataset, kind: str, params: Dict[str, Any]) -> ResultKey:
+    """Build a cache key from the dataset version and a canonical request hash."""
+    digest = hashlib.sha256(canonical(params).encode()).hexdigest()
+    return dataset.id, dataset_version(dataset), kind, digest
+
+
+class LocalResultCache:
+    """In-process cache of serialized results, used when Redis is unavailable."""
+    
+    def __init__(self, max_bytes: int, ttl: int, max_entry_bytes: int):
+        self._cache = MemoryCache(max_bytes)
+        self.ttl = ttl
+        self.max_entry_bytes = max_entry_bytes
+    
+    def get(self, key: ResultKey) -> Optional[bytes]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at < time.monotonic():
+            return None
+        return payload
+    
+    def set(self, key: ResultKey, payload: bytes) -> None:
+        if len(payload) > self.max_entry_bytes:
+            return
+        self._cache.put(key, (time.monotonic() + self.ttl, payload))
+    
+    def invalidate(self, dataset_id: int) -> None:
+        self._cache.invalidate(dataset_id)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "memory", **self._cache.stats()}
+
+
+class RedisResultCache:
+    """Result cache shared by every worker through Redis.
+    
+    Entries expire after ``ttl`` seconds and results larger than
+    ``max_entry_bytes`` are not stored; overall memory is bounded by the
+    Redis ``maxmemory`` policy. Keys of each dataset are tracked in a set so
+    they can all be dropped when the dataset is deleted. Redis errors are
+    logged and treated as cache misses.
+    """
+    
+    PREFIX = "sigmalite:result"
+    
+    def __init__(self, client: redis.Redis, ttl: int, max_entry_bytes: int):
+        self.client = client
+        self.ttl = ttl
+        self.max_entry_bytes = max_entry_bytes
+        self.hits = 0
+        self.misses = 0
+    
+    def _name(self, key: ResultKey) -> str:
+        return f"{self.PREFIX}:{key[0]}:{key[1]}:{key[2]}:{key[3]}"
+    
+    def _index_name(self, dataset_id: int) -> str:
+        return f"{self.PREFIX}-keys:{dataset_id}"
+    
+    def get(self, key: ResultKey) -> Optional[bytes]:
+        try:
+            payload = self.client.get(self._name(key))
+        except redis.RedisError as e:
+            logger.warning("Result cache read failed: %s", e)
+            return None
+        
+        if payload is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return payload
+    
+    def set(self, key: ResultKey, payload: bytes) -> None:
+        if len(payload) > self.max_entry_bytes:
+            return
+        
+        name = self._name(key)
+        try:
+            pipe = self.client.pipeline()
+            pipe.set(name, payload, ex=self.ttl)
+            pipe.sadd(self._index_name(key[0]), name)
+            pipe.expire(self._index_name(key[0]), self.ttl)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning("Result cache write failed: %s", e)
+    
+    def invalidate(self, dataset_id: int) -> None:
+        index_name = self._index_name(dataset_id)
+        try:
+            names = self.client.smembers(index_name)
+            if names:
+                self.client.delete(*names)
+            self.client.delete(index_name)
+        except redis.RedisError as e:
+            logger.warning("Result cache invalidation failed: %s", e)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "redis", "hits": self.hits, "misses": self.misses}
+
+
+def create_result_cache():
+    """Create the configured result cache, falling back to memory without Redis."""
+    backend = settings.RESULT_CACHE_BACKEND
+    ttl = settings.RESULT_CACHE_TTL
+    max_entry_bytes = settings.RESULT_CACHE_MAX_ENTRY_BYTES
+    
+    if backend in ("auto", "redis"):
+        try:
+            client = redis.Redis.from_url(
+                settings.REDIS_URL, socket_connect_timeout=1, socket_timeout=1
+            )
+            client.ping()
+            return RedisResultCache(client, ttl, max_entry_bytes)
+        except redis.RedisError as e:
+            if backend == "redis":
+                raise
+            logger.info("Redis unavailable (%s), using in-process result cache", e)
+    
+    return LocalResultCache(settings.RESULT_CACHE_MAX_BYTES, ttl, max_entry_bytes)
+
+
+_result_cache = None
+
+
+def get_result_cache():
+    """Get the global result cache, connecting to its backend on first use."""
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = create_result_cache()
+    return _result_cache
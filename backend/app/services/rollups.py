@@ -0,0 +1,287 @@
+import json
+import os
+import shutil
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from app.models.dataset import Chart, Dataset, Sheet
+from app.services.data_processor import DataProcessor
+
+# Partials kept per measure and how partials of finer groups combine
+PARTIALS = {"sum": "sum", "count": "sum", "min": "min", "max": "max"}
+
+# Aggregate operations answered from partials, and the partials they need
+OPERATION_PARTIALS = {
+    "sum": ("sum",),
+    "count": ("count",),
+    "min": ("min",),
+    "max": ("max",),
+    "avg": ("sum", "count")
+}
+
+_build_lock = threading.Lock()
+
+
+def partial_name(column: str, part: str) -> str:
+    return f"{part}({column})"
+
+
+def chart_rollup_spec(chart_type: str, config: Dict[str, Any]) -> Optional[Dict[str, List[str]]]:
+    """Get the group columns and measures a chart aggregates, or None if it doesn't group."""
+    if chart_type == "pie":
+        group_by, measures = [config.get("labels")], [config.get("values")]
+    elif chart_type in ("line", "bar"):
+        y_axis = config.get("y_axis")
+        group_by = [config.get("x_axis"), *(config.get("group_by") or [])]
+        measures = y_axis if isinstance(y_axis, list) else [y_axis]
+    else:
+        return None
+    
+    group_by = list(dict.fromkeys(c for c in group_by if c))
+    measures = [m for m in dict.fromkeys(measures) if m and m not in group_by]
+    if not group_by or not measures:
+        return None
+    return {"group_by": group_by, "measures": measures}
+
+
+def dataset_chart_specs(db: Session, dataset_id: int) -> List[Dict[str, List[str]]]:
+    """Get the rollup specs of every chart drawn from a dataset.
+    
+    Charts naming columns the dataset doesn't have get no rollup.
+    """
+    dataset = db.get(Dataset, dataset_id)
+    known = {c["name"] for c in ((dataset.schema if dataset else None) or {}).get("columns", [])}
+    charts = db.query(Chart).join(Sheet).filter(Sheet.dataset_id == dataset_id).all()
+    specs = [chart_rollup_spec(chart.chart_type, chart.config or {}) for chart in charts]
+    return [
+        spec for spec in specs
+        if spec is not None and set(spec["group_by"]) | set(spec["measures"]) <= known
+    ]
+
+
+class Rollup:
+    """Per-group partial aggregates of some measures over a set of group columns.
+    
+    Each measure keeps its non-null count per group and, for numeric
+    columns, its sum, min and max. Sums, counts, averages and extremes of
+    the same or any coarser grouping are recombined from these partials.
+    Null group keys are kept so a coarser grouping drops exactly the rows
+    grouping the raw data would.
+    """
+    
+    def __init__(self, group_by: List[str], measures: List[str], frame: pd.DataFrame):
+        self.group_by = group_by
+        self.measures = measures
+        self.frame = frame
+    
+    @classmethod
+    def build(cls, df: pd.DataFrame, group_by: List[str], measures: List[str]) -> "Rollup":
+        """Aggregate raw rows into partials."""
+        parts = {}
+        for column in measures:
+            parts[partial_name(column, "count")] = (column, "count")
+            if pd.api.types.is_numeric_dtype(df[column]) and df[column].dtype.kind != "b":
+                for part in ("sum", "min", "max"):
+                    parts[partial_name(column, part)] = (column, part)
+        
+        grouped = df.groupby(group_by, observed=True, dropna=False)
+        return cls(group_by, measures, grouped.agg(**parts).reset_index())
+    
+    def _combine(self, group_by: List[str], names: List[str], dropna: bool) -> pd.DataFrame:
+        """Recombine partials over a coarser grouping."""
+        parts = {name: (name, PARTIALS[name.split("(", 1)[0]]) for name in names}
+        grouped = self.frame.groupby(group_by, observed=True, dropna=dropna)
+        return grouped.agg(**parts).reset_index()
+    
+    def derive(self, group_by: List[str], measures: List[str]) -> "Rollup":
+        """Build a coarser rollup from this one instead of the raw rows."""
+        names = [
+            name for name in self.frame.columns[len(self.group_by):]
+            if name.split("(", 1)[1][:-1] in measures
+        ]
+        return Rollup(group_by, measures, self._combine(group_by, names, dropna=False))
+    
+    def covers(self, group_by: List[str], aggregates: List[Dict[str, Any]]) -> bool:
+        """Whether grouped aggregates can be answered from this rollup."""
+        if not set(group_by) <= set(self.group_by):
+            return False
+        for agg in aggregates:
+            parts = OPERATION_PARTIALS.get(agg["operation"])
+            if parts is None or any(
+                partial_name(agg["column"], part) not in self.frame.columns for part in parts
+            ):
+                return False
+        return True
+    
+    def aggregate(self, group_by: List[str], aggregates: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Compute grouped aggregates as ``DataProcessor.aggregate_many`` would."""
+        aliases = [agg.get("alias") or f"{agg['column']}_{agg['operation']}" for agg in aggregates]
+        if len(set(aliases)) < len(aliases):
+            duplicate = next(alias for alias in aliases if aliases.count(alias) > 1)
+            raise ValueError(f"Duplicate aggregate name: {duplicate}")
+        
+        names = list(dict.fromkeys(
+            partial_name(agg["column"], part)
+            for agg in aggregates
+            for part in OPERATION_PARTIALS[agg["operation"]]
+        ))
+        combined = self._combine(group_by, names, dropna=True)
+        
+        result = combined[group_by].copy()
+        for alias, agg in zip(aliases, aggregates):
+            column, operation = agg["column"], agg["operation"]
+            if operation == "avg":
+                total = combined[partial_name(column, "sum")]
+                count = combined[partial_name(column, "count")]
+                result[alias] = total / count.where(count > 0)
+            else:
+                result[alias] = combined[partial_name(column, operation)]
+        return result
+
+
+class RollupStore:
+    """The materialized rollups of one version of a dataset.
+    
+    Chart specs with the same group columns share one rollup. Rollups are
+    built finest first, and a coarser one is derived from a finer rollup
+    covering its columns rather than from the raw rows. Rollups with more
+    than ``MAX_ROW_RATIO`` of the dataset's rows save too little to keep.
+    
+    Stores live in a ``.rollups`` directory next to the dataset with one
+    Parquet file per rollup and a manifest recording the data version they
+    were built from; stores of another version are ignored.
+    """
+    
+    SUFFIX = ".rollups"
+    MANIFEST = "manifest.json"
+    MAX_ROW_RATIO = 0.5
+    
+    def __init__(
+        self,
+        version: Tuple[int, int],
+        specs: List[Dict[str, List[str]]],
+        rollups: List[Rollup]
+    ):
+        self.version = tuple(version)
+        self.specs = specs
+        self.rollups = rollups
+    
+    @classmethod
+    def directory_for(cls, data_path: str) -> str:
+        return data_path + cls.SUFFIX
+    
+    @staticmethod
+    def plan(specs: List[Dict[str, List[str]]]) -> List[Dict[str, List[str]]]:
+        """Merge chart specs into the rollups to build, finest first."""
+        merged: Dict[frozenset, Dict[str, List[str]]] = {}
+        for spec in specs:
+            entry = merged.setdefault(
+                frozenset(spec["group_by"]), {"group_by": list(spec["group_by"]), "measures": []}
+            )
+            entry["measures"] = list(dict.fromkeys([*entry["measures"], *spec["measures"]]))
+        return sorted(merged.values(), key=lambda spec: -len(spec["group_by"]))
+    
+    @classmethod
+    def build(
+        cls,
+        data_path: str,
+        storage_format: str,
+        version: Tuple[int, int],
+        specs: List[Dict[str, List[str]]]
+    ) -> "RollupStore":
+        """Build the rollups of some chart specs."""
+        planned = cls.plan(specs)
+        rollups: List[Rollup] = []
+        row_count = None
+        for spec in planned:
+            group_by, measures = spec["group_by"], spec["measures"]
+            source = next((
+                r for r in rollups
+                if set(group_by) <= set(r.group_by) and set(measures) <= set(r.measures)
+            ), None)
+            if source is not None:
+                rollup = source.derive(group_by, measures)
+            else:
+                df = DataProcessor.read_dataset(data_path, storage_format, [*group_by, *measures])
+                row_count = len(df)
+                rollup = Rollup.build(df, group_by, measures)
+            
+            if len(rollup.frame) <= cls.MAX_ROW_RATIO * (row_count or 0):
+                rollups.append(rollup)
+        return cls(version, planned, rollups)
+    
+    def save(self, path: str) -> None:
+        """Write the store directory, replacing any previous one atomically."""
+        target = Path(path)
+        staging = target.with_name(target.name + ".tmp")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        
+        entries = []
+        for i, rollup in enumerate(self.rollups):
+            DataProcessor.write_parquet(rollup.frame, str(staging / f"{i}.parquet"))
+            entries.append({"group_by": rollup.group_by, "measures": rollup.measures})
+        with open(staging / self.MANIFEST, "w") as f:
+            json.dump({"version": list(self.version), "specs": self.specs, "rollups": entries}, f)
+        
+        shutil.rmtree(target, ignore_errors=True)
+        os.replace(staging, target)
+    
+    @classmethod
+    def load(cls, path: str) -> Optional["RollupStore"]:
+        """Open a saved store, or return None if there is none."""
+        manifest = os.path.join(path, cls.MANIFEST)
+        try:
+            stat = os.stat(manifest)
+        except FileNotFoundError:
+            return None
+        return _load_store(path, stat.st_mtime_ns, stat.st_size)
+    
+    def find(self, group_by: List[str], aggregates: List[Dict[str, Any]]) -> Optional[Rollup]:
+        """Get the smallest rollup answering grouped aggregates, if any."""
+        candidates = [r for r in self.rollups if r.covers(group_by, aggregates)]
+        return min(candidates, key=lambda r: len(r.frame), default=None)
+
+
+@lru_cache(maxsize=64)
+def _load_store(path: str, mtime_ns: int, size: int) -> RollupStore:
+    """Load a store once per manifest version."""
+    with open(os.path.join(path, RollupStore.MANIFEST)) as f:
+        manifest = json.load(f)
+    rollups = [
+        Rollup(
+            entry["group_by"],
+            entry["measures"],
+            DataProcessor.read_parquet(os.path.join(path, f"{i}.parquet"))
+        )
+        for i, entry in enumerate(manifest["rollups"])
+    ]
+    return RollupStore(manifest["version"], manifest["specs"], rollups)
+
+
+def rebuild_rollups(
+    data_path: str,
+    storage_format: str,
+    version: Tuple[int, int],
+    specs: List[Dict[str, List[str]]]
+) -> None:
+    """Rebuild a dataset's rollups for its current charts, unless they are up to date."""
+    with _build_lock:
+        directory = RollupStore.directory_for(data_path)
+        if not specs:
+            shutil.rmtree(directory, ignore_errors=True)
+            return
+        
+        current = RollupStore.load(directory)
+        if (
+            current is not None
+            and current.version == tuple(version)
+            and current.specs == RollupStore.plan(specs)
+        ):
+            return
+        RollupStore.build(data_path, storage_format, version, specs).save(directory)
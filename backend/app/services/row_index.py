@@ -0,0 +1,163 @@
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class CsvRowIndex:
+    """Sidecar index of the byte offset of every Nth row of a CSV file.
+    
+    Reading a page seeks to the nearest indexed row at or before the page
+    start and parses at most ``stride`` extra rows, so deep pages cost the
+    same as the first one. Record boundaries are newlines outside quoted
+    fields (RFC 4180 escapes quotes by doubling them, so quote parity is
+    enough), and blank lines are skipped the same way ``pd.read_csv`` does.
+    """
+    
+    SUFFIX = ".rowidx.npy"
+    BLOCK_SIZE = 16 * 1024 * 1024
+    
+    def __init__(
+        self,
+        offsets: np.ndarray,
+        stride: int,
+        row_count: int,
+        file_size: int,
+        mtime_ns: int = -1
+    ):
+        self.offsets = offsets
+        self.stride = stride
+        self.row_count = row_count
+        self.file_size = file_size
+        self.mtime_ns = mtime_ns
+    
+    @classmethod
+    def path_for(cls, csv_path: str) -> str:
+        return csv_path + cls.SUFFIX
+    
+    @classmethod
+    def build(cls, csv_path: str, stride: int) -> "CsvRowIndex":
+        """Scan a CSV file and record the offset of every stride-th row."""
+        stat = os.stat(csv_path)
+        file_size = stat.st_size
+        if file_size == 0:
+            return cls(np.empty(0, dtype=np.int64), stride, 0, 0, stat.st_mtime_ns)
+        
+        data = np.memmap(csv_path, dtype=np.uint8, mode="r")
+        offsets: List[np.ndarray] = []
+        quotes = 0
+        row = 0
+        
+        for block_start in range(0, file_size, cls.BLOCK_SIZE):
+            block = np.asarray(data[block_start:block_start + cls.BLOCK_SIZE])
+            newlines = np.flatnonzero(block == ord("\n"))
+            parity = (quotes + np.cumsum(block == ord('"'))[newlines]) % 2
+            quotes += int(np.count_nonzero(block == ord('"')))
+            
+            # Boundaries start the record after them; the header starts at 0
+            starts = block_start + newlines[parity == 0] + 1
+            starts = starts[starts < file_size]
+            starts = starts[~cls._blank_at(data, starts, file_size)]
+            
+            picked = (row + np.arange(len(starts))) % stride == 0
+            offsets.append(starts[picked].astype(np.int64))
+            row += len(starts)
+        
+        return cls(
+            np.concatenate(offsets) if offsets else np.empty(0, dtype=np.int64),
+            stride,
+            row,
+            file_size,
+            stat.st_mtime_ns
+        )
+    
+    @staticmethod
+    def _blank_at(data: np.ndarray, starts: np.ndarray, file_size: int) -> np.ndarray:
+        """Mark record starts that begin a blank line."""
+        first = data[starts]
+        blank = first == ord("\n")
+        cr = np.flatnonzero(first == ord("\r"))
+        following = np.minimum(starts[cr] + 1, file_size - 1)
+        blank[cr] = (data[following] == ord("\n")) | (starts[cr] + 1 >= file_size)
+        return blank
+    
+    def save(self, path: str) -> None:
+        """Write the index as a .npy file with a small header."""
+        header = np.array(
+            [self.stride, self.row_count, self.file_size, self.mtime_ns], dtype=np.int64
+        )
+        with open(path, "wb") as f:
+            np.save(f, np.concatenate([header, self.offsets]))
+    
+    @classmethod
+    def load(cls, path: str) -> "CsvRowIndex":
+        values = np.load(path)
+        return cls(values[4:], *(int(v) for v in values[:4]))
+    
+    @classmethod
+    def load_or_build(cls, csv_path: str, stride: int) -> "CsvRowIndex":
+        """Load the sidecar index, rebuilding it if missing or stale.
+        
+        An index is stale unless the file's size and modification time
+        both match the ones it was built from.
+        """
+        path = cls.path_for(csv_path)
+        if os.path.exists(path):
+            index = cls.load(path)
+            stat = os.stat(csv_path)
+            if (
+                index.stride == stride
+                and index.file_size == stat.st_size
+                and index.mtime_ns == stat.st_mtime_ns
+            ):
+                return index
+        
+        index = cls.build(csv_path, stride)
+        index.save(path)
+        return index
+    
+    def read_rows(
+        self,
+        csv_path: str,
+        start: int,
+        stop: int,
+        names: List[str],
+        dtypes: Optional[Dict[str, Any]] = None,
+        columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """Parse rows [start, stop) by seeking to the nearest indexed row.
+        
+        ``names`` lists every column of the file; when ``columns`` is given
+        only those are parsed.
+        """
+        start = max(0, min(start, self.row_count))
+        stop = max(start, min(stop, self.row_count))
+        if columns is not None:
+            names_read = [name for name in names if name in set(columns)]
+        else:
+            names_read = names
+        if start == stop:
+            return pd.DataFrame(
+                {name: pd.Series(dtype=(dtypes or {}).get(name, object)) for name in names_read},
+                index=pd.RangeIndex(start, stop),
+                columns=names_read
+            )
+        
+        block = start // self.stride
+        skip = start - block * self.stride
+        
+        with open(csv_path, "rb") as f:
+            f.seek(int(self.offsets[block]))
+            df = pd.read_csv(
+                f,
+                header=None,
+                names=names,
+                usecols=names_read,
+                nrows=skip + (stop - start),
+                dtype=dtypes
+            )
+        
+        df = df.iloc[skip:]
+        df.index = pd.RangeIndex(start, start + len(df))
+        return df
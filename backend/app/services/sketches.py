@@ -0,0 +1,194 @@
+from typing import List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+
+def hash_values(values: pd.Series) -> np.ndarray:
+    """Hash non-null values to uint64 with pandas' vectorized hasher."""
+    return pd.util.hash_pandas_object(values.dropna(), index=False).to_numpy(np.uint64)
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """Vectorized int.bit_length() for uint64 arrays."""
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    # frexp is exact for values that fit in 32 bits
+    return np.where(high > 0, np.frexp(high)[1] + 32, np.frexp(low)[1])
+
+
+class HyperLogLog:
+    """HyperLogLog distinct-count sketch over 64-bit hashes.
+    
+    With the default precision of 14 bits the standard error is about
+    0.8%, and two sketches merge by taking the register-wise maximum.
+    """
+    
+    def __init__(self, precision: int = 14, registers: Optional[np.ndarray] = None):
+        self.precision = precision
+        self.registers = (
+            registers if registers is not None
+            else np.zeros(1 << precision, dtype=np.uint8)
+        )
+    
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        """Add pre-hashed uint64 values."""
+        if len(hashes) == 0:
+            return
+        bits = 64 - self.precision
+        index = (hashes >> np.uint64(bits)).astype(np.int64)
+        rest = hashes & np.uint64((1 << bits) - 1)
+        rank = (bits - _bit_length(rest) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+    
+    def merge(self, other: "HyperLogLog") -> None:
+        """Merge another sketch of the same precision into this one."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+    
+    def count(self) -> int:
+        """Estimate the number of distinct values added."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            estimate = m * np.log(m / zeros)
+        
+        return int(round(estimate))
+    
+    @property
+    def relative_error(self) -> float:
+        """Standard error of the estimate."""
+        return 1.04 / np.sqrt(len(self.registers))
+
+
+class DistinctCounter:
+    """Distinct counter that is exact up to a limit, then approximate.
+    
+    Hashes are kept in a set until ``exact_limit`` distinct values have
+    been seen, after which they are folded into a HyperLogLog.
+    """
+    
+    def __init__(self, exact_limit: int = 10000):
+        self.exact_limit = exact_limit
+        self._exact: Optional[Set[int]] = set()
+        self.sketch = HyperLogLog()
+    
+    @property
+    def is_exact(self) -> bool:
+        return self._exact is not None
+    
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        """Add pre-hashed uint64 values."""
+        self.sketch.add_hashes(hashes)
+        if self._exact is not None:
+            self._exact.update(np.unique(hashes).tolist())
+            if len(self._exact) > self.exact_limit:
+                self._exact = None
+    
+    def add(self, values: pd.Series) -> None:
+        """Add the non-null values of a Series."""
+        self.add_hashes(hash_values(values))
+    
+    def merge(self, other: "DistinctCounter") -> None:
+        """Merge another counter into this one."""
+        self.sketch.merge(other.sketch)
+        if self._exact is not None and other._exact is not None:
+            self._exact |= other._exact
+            if len(self._exact) > self.exact_limit:
+                self._exact = None
+        else:
+            self._exact = None
+    
+    def count(self) -> int:
+        """Get the exact count, or an estimate once past the limit."""
+        if self._exact is not None:
+            return len(self._exact)
+        return self.sketch.count()
+
+
+class KllSketch:
+    """KLL quantile sketch over floats.
+    
+    Items are kept in compactors of increasing weight; when a compactor
+    outgrows its capacity it is sorted and every other item is promoted to
+    the next level. With ``k`` = 200 quantiles are within about 1.3% in
+    rank, and sketches of separate chunks merge level by level.
+    """
+    
+    def __init__(self, k: int = 200, levels: Optional[List[np.ndarray]] = None, count: int = 0):
+        self.k = k
+        self.levels = levels if levels is not None else [np.empty(0)]
+        self.count = count
+        # Fixed seed so a column sketches the same way on every ingest
+        self._rng = np.random.default_rng(0)
+    
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(int(np.ceil(self.k * (2 / 3) ** depth)), 2)
+    
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) <= self._capacity(level):
+                level += 1
+                continue
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            
+            items = np.sort(items)
+            # An odd item out stays behind at this level
+            keep = items[:1] if len(items) % 2 else items[:0]
+            pairs = items[len(keep):]
+            promoted = pairs[int(self._rng.integers(2))::2]
+            self.levels[level] = keep
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level = 0
+    
+    def add(self, values: np.ndarray) -> None:
+        """Add numeric values; NaN is ignored."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self.count += len(values)
+        self._compress()
+    
+    def merge(self, other: "KllSketch") -> None:
+        """Merge another sketch into this one."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self._compress()
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the q-quantile, or None for an empty sketch."""
+        if self.count == 0:
+            return None
+        if len(self.levels) == 1:
+            # Nothing compacted yet, interpolate like pandas
+            return float(np.quantile(self.levels[0], q))
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([
+            np.full(len(items), 1 << level, dtype=np.int64)
+            for level, items in enumerate(self.levels)
+        ])
+        order = np.argsort(items, kind="stable")
+        cumulative = np.cumsum(weights[order])
+        position = min(int(np.searchsorted(cumulative, q * cumulative[-1])), len(items) - 1)
+        return float(items[order][position])
+    
+    @property
+    def rank_error(self) -> float:
+        """Normalized rank error of quantile estimates."""
+        if len(self.levels) == 1:
+            return 0.0
+        return 2.296 / self.k ** 0.9723
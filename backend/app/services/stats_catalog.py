@@ -0,0 +1,242 @@
+import json
+import logging
+import os
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.data_processor import DataProcessor
+from app.services.sketches import HyperLogLog, KllSketch
+
+logger = logging.getLogger(__name__)
+
+
+class StatsCatalog:
+    """Column statistics and sketches recorded at ingest.
+    
+    For every column the catalog keeps counts, exact moments and extremes,
+    a HyperLogLog distinct-count sketch and, for numeric columns, a KLL
+    quantile sketch. Approximate statistics and ungrouped aggregates are
+    answered from it without reading the data; each answer carries an
+    error bound, relative for distinct counts and in rank for quantiles.
+    
+    Once a dataset is ready its exact column statistics, including top
+    values and histograms, are added by ``build_column_stats`` and served
+    as they are. The catalog is one ``.npz`` file next to the dataset.
+    """
+    
+    SUFFIX = ".stats.npz"
+    
+    def __init__(
+        self,
+        columns: List[Dict[str, Any]],
+        distinct: Dict[str, HyperLogLog],
+        quantiles: Dict[str, KllSketch],
+        exact: Optional[Dict[str, Dict[str, Any]]] = None
+    ):
+        self.columns = {c["name"]: c for c in columns}
+        self.distinct = distinct
+        self.quantiles = quantiles
+        self.exact = exact or {}
+    
+    @classmethod
+    def path_for(cls, data_path: str) -> str:
+        return data_path + cls.SUFFIX
+    
+    @classmethod
+    def from_profiles(cls, profiles: List[Any]) -> "StatsCatalog":
+        """Build a catalog from the column profiles of an ingest."""
+        columns = []
+        for profile in profiles:
+            columns.append({
+                "name": profile.name,
+                "numeric": profile.is_numeric,
+                "count": profile.count,
+                "null_count": profile.null_count,
+                "sum": profile.total,
+                "m2": profile.m2,
+                "min": profile.min,
+                "max": profile.max,
+                "distinct": profile.distinct.count(),
+                "distinct_exact": profile.distinct.is_exact
+            })
+        return cls(
+            columns,
+            {p.name: p.distinct.sketch for p in profiles},
+            {p.name: p.quantiles for p in profiles if p.quantiles is not None}
+        )
+    
+    def save(self, path: str) -> None:
+        """Write the catalog as a single .npz file."""
+        names = list(self.columns)
+        arrays = {
+            "meta": np.frombuffer(json.dumps(list(self.columns.values())).encode(), dtype=np.uint8),
+            "exact": np.frombuffer(json.dumps(self.exact).encode(), dtype=np.uint8)
+        }
+        for i, name in enumerate(names):
+            arrays[f"hll_{i}"] = self.distinct[name].registers
+            if name in self.quantiles:
+                sketch = self.quantiles[name]
+                arrays[f"kll_{i}"] = np.concatenate(sketch.levels)
+                arrays[f"kll_sizes_{i}"] = np.array(
+                    [sketch.k, sketch.count, *(len(items) for items in sketch.levels)],
+                    dtype=np.int64
+                )
+        
+        # Write under a temporary name so readers never see a partial file
+        staging = path + ".tmp.npz"
+        np.savez(staging, **arrays)
+        os.replace(staging, path)
+    
+    @classmethod
+    def load(cls, path: str) -> Optional["StatsCatalog"]:
+        """Open a saved catalog, or return None if there is none."""
+        if not os.path.exists(path):
+            return None
+        stat = os.stat(path)
+        return _load_catalog(path, stat.st_mtime_ns, stat.st_size)
+    
+    def exact_stats(self, column: str) -> Optional[Dict[str, Any]]:
+        """Get the exact statistics of a column, or None if they aren't recorded yet."""
+        return self.exact.get(column)
+    
+    def column_stats(self, column: str) -> Optional[Dict[str, Any]]:
+        """Get approximate statistics for a column, or None if it is not catalogued."""
+        entry = self.columns.get(column)
+        if entry is None:
+            return None
+        
+        stats = {
+            "column": column,
+            "count": entry["count"],
+            "null_count": entry["null_count"],
+            "unique_count": entry["distinct"],
+            "approximate": True,
+            "error_bounds": {"unique_count": self._distinct_error(column)}
+        }
+        
+        if entry["numeric"] and entry["count"]:
+            sketch = self.quantiles[column]
+            stats.update({
+                "mean": entry["sum"] / entry["count"],
+                "median": sketch.quantile(0.5),
+                "std": self._std(entry),
+                "min": entry["min"],
+                "max": entry["max"],
+                "q25": sketch.quantile(0.25),
+                "q75": sketch.quantile(0.75)
+            })
+            for name in ("median", "q25", "q75"):
+                stats["error_bounds"][name] = sketch.rank_error
+        
+        return stats
+    
+    def aggregate(self, column: str, operation: str) -> Optional[Tuple[Any, float]]:
+        """Answer an ungrouped aggregate with its error bound, or None if it can't be."""
+        entry = self.columns.get(column)
+        if entry is None:
+            return None
+        
+        if operation == "count":
+            return entry["count"], 0.0
+        if operation == "count_distinct":
+            return entry["distinct"], self._distinct_error(column)
+        if not entry["numeric"] or not entry["count"]:
+            return None
+        
+        quantile = 0.5 if operation == "median" else DataProcessor.percentile(operation)
+        if quantile is not None:
+            sketch = self.quantiles[column]
+            return sketch.quantile(quantile), sketch.rank_error
+        
+        exact = {
+            "sum": entry["sum"],
+            "avg": entry["sum"] / entry["count"],
+            "min": entry["min"],
+            "max": entry["max"],
+            "variance": self._variance(entry),
+            "stddev": self._std(entry)
+        }
+        if operation not in exact:
+            return None
+        return exact[operation], 0.0
+    
+    def aggregate_many(
+        self,
+        aggregates: List[Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], Dict[str, float], List[Dict[str, Any]]]:
+        """Answer what ungrouped aggregates the catalog can.
+        
+        Returns values and error bounds by output name, and the aggregates
+        that still have to be computed from the data.
+        """
+        results, errors, remaining = {}, {}, []
+        for agg in aggregates:
+            alias = agg.get("alias") or f"{agg['column']}_{agg['operation']}"
+            answer = self.aggregate(agg["column"], agg["operation"])
+            if answer is None:
+                remaining.append(agg)
+            else:
+                results[alias], errors[alias] = answer
+        return results, errors, remaining
+    
+    def _distinct_error(self, column: str) -> float:
+        if self.columns[column]["distinct_exact"]:
+            return 0.0
+        return self.distinct[column].relative_error
+    
+    @staticmethod
+    def _variance(entry: Dict[str, Any]) -> Optional[float]:
+        if entry["count"] < 2:
+            return None
+        return entry["m2"] / (entry["count"] - 1)
+    
+    @staticmethod
+    def _std(entry: Dict[str, Any]) -> Optional[float]:
+        variance = StatsCatalog._variance(entry)
+        return None if variance is None else variance ** 0.5
+
+
+@lru_cache(maxsize=64)
+def _load_catalog(path: str, mtime_ns: int, size: int) -> StatsCatalog:
+    """Load a catalog once per file version."""
+    with np.load(path) as arrays:
+        columns = json.loads(arrays["meta"].tobytes())
+        exact = json.loads(arrays["exact"].tobytes()) if "exact" in arrays.files else {}
+        distinct, quantiles = {}, {}
+        for i, column in enumerate(columns):
+            registers = arrays[f"hll_{i}"]
+            distinct[column["name"]] = HyperLogLog(
+                precision=int(np.log2(len(registers))), registers=registers
+            )
+            if f"kll_sizes_{i}" in arrays.files:
+                k, count, *sizes = arrays[f"kll_sizes_{i}"].tolist()
+                items = arrays[f"kll_{i}"]
+                bounds = np.cumsum([0, *sizes])
+                levels = [items[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+                quantiles[column["name"]] = KllSketch(k, levels, count)
+    return StatsCatalog(columns, distinct, quantiles, exact)
+
+
+def build_column_stats(data_path: str, storage_format: str, schema: Dict[str, Any]) -> None:
+    """Add the exact statistics of every column to a stored dataset's catalog.
+    
+    Columns are read one at a time, so memory stays bounded by the largest
+    column rather than the dataset. A column whose statistics fail is left
+    out, and requests for it scan the column instead.
+    """
+    path = StatsCatalog.path_for(data_path)
+    catalog = StatsCatalog.load(path)
+    if catalog is None:
+        return
+    
+    exact = {}
+    for column in schema.get("columns", []):
+        name = column["name"]
+        try:
+            values = DataProcessor.read_dataset(data_path, storage_format, [name])
+            exact[name] = DataProcessor.get_column_stats(values, name)
+        except Exception as e:
+            logger.warning("Column stats failed for %s of %s: %s", name, data_path, e)
+    StatsCatalog(list(catalog.columns.values()), catalog.distinct, catalog.quantiles, exact).save(path)
@@ -0,0 +1,240 @@
+import bisect
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.services.data_processor import DataProcessor
+
+# Characters that make a ``contains`` value a regular expression rather than a literal
+REGEX_CHARS = set(".^$*+?{}[]\\|()")
+
+
+class _SortedText:
+    """Sequence view of UTF-8 strings stored as offsets into one byte buffer."""
+    
+    def __init__(self, offsets: np.ndarray, data: np.ndarray):
+        self.offsets = offsets
+        self.data = data
+    
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+    
+    def __getitem__(self, i: int) -> bytes:
+        return self.data[self.offsets[i]:self.offsets[i + 1]].tobytes()
+
+
+class TextIndex:
+    """Search index for the text filter operators of one column.
+    
+    A trigram index maps every three-character sequence of the case-folded
+    values to the rows holding it, so ``contains`` and ``endswith`` only
+    test rows that have all trigrams of the searched value. A sorted copy
+    of the values answers ``startswith`` with two binary searches, since
+    UTF-8 byte order matches code point order. Null rows never match, and
+    callers verify candidates with the regular filter, so results are
+    identical to a full scan.
+    
+    Indexes live in a ``.textidx`` directory next to the dataset, one
+    subdirectory of ``.npy`` files per column position, and are opened
+    with ``np.memmap``. Each records the data version it was built from;
+    callers ignore indexes of another version.
+    """
+    
+    OPERATORS = ("contains", "startswith", "endswith")
+    SUFFIX = ".textidx"
+    ARRAYS = ("keys", "offsets", "rows", "order", "prefix_offsets", "prefix_data", "nulls")
+    CHUNK_ROWS = 262144
+    
+    def __init__(self, arrays: Dict[str, np.ndarray], version: Optional[Tuple[int, int]] = None):
+        self.version = tuple(version) if version is not None else None
+        self.keys = arrays["keys"]
+        self.offsets = arrays["offsets"]
+        self.rows = arrays["rows"]
+        self.order = arrays["order"]
+        self.nulls = arrays["nulls"]
+        self.sorted_values = _SortedText(arrays["prefix_offsets"], arrays["prefix_data"])
+    
+    @property
+    def row_count(self) -> int:
+        return len(self.order) + len(self.nulls)
+    
+    @classmethod
+    def directory_for(cls, data_path: str) -> str:
+        return data_path + cls.SUFFIX
+    
+    @classmethod
+    def path_for(cls, data_path: str, position: int) -> str:
+        return os.path.join(cls.directory_for(data_path), str(position))
+    
+    @staticmethod
+    def _trigrams(texts: List[str], first_row: int) -> np.ndarray:
+        """Get the distinct (trigram, row) pairs of a run of rows, sorted."""
+        if not texts:
+            return np.empty((0, 2), dtype=np.int64)
+        
+        # Code points of all values, each followed by a NUL separator
+        points = np.frombuffer(
+            ("\x00".join(texts) + "\x00").encode("utf-32-le"), dtype=np.uint32
+        ).astype(np.int64)
+        row_of = np.repeat(
+            np.arange(first_row, first_row + len(texts), dtype=np.int64),
+            [len(t) + 1 for t in texts]
+        )
+        
+        # Code points fit in 21 bits, so three pack into one int64
+        codes = (points[:-2] << 42) | (points[1:-1] << 21) | points[2:]
+        valid = (points[:-2] != 0) & (points[1:-1] != 0) & (points[2:] != 0)
+        codes, rows = codes[valid], row_of[:-2][valid]
+        
+        order = np.lexsort((rows, codes))
+        codes, rows = codes[order], rows[order]
+        distinct = np.ones(len(codes), dtype=bool)
+        distinct[1:] = (codes[1:] != codes[:-1]) | (rows[1:] != rows[:-1])
+        return np.stack([codes[distinct], rows[distinct]], axis=1)
+    
+    @classmethod
+    def build(cls, values: pd.Series, version: Optional[Tuple[int, int]] = None) -> "TextIndex":
+        """Index a whole column; row positions are positions in ``values``."""
+        null = values.isnull().to_numpy()
+        present = np.flatnonzero(~null)
+        texts = [str(v) for v in values.to_numpy()[present]]
+        
+        pairs = [
+            cls._trigrams(
+                [t.casefold() for t in texts[start:start + cls.CHUNK_ROWS]], start
+            )
+            for start in range(0, len(texts), cls.CHUNK_ROWS)
+        ]
+        pairs = np.concatenate(pairs) if pairs else np.empty((0, 2), dtype=np.int64)
+        # Chunks cover increasing rows, so a stable sort keeps postings ascending
+        pairs = pairs[np.argsort(pairs[:, 0], kind="stable")]
+        keys, starts = np.unique(pairs[:, 0], return_index=True)
+        
+        order = np.argsort(np.array(texts, dtype=object), kind="stable")
+        encoded = [texts[i].encode("utf-8") for i in order]
+        prefix_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=prefix_offsets[1:])
+        
+        return cls({
+            "keys": keys,
+            "offsets": np.append(starts, len(pairs)).astype(np.int64),
+            # Trigram rows are numbered among non-null values, map them back
+            "rows": present[pairs[:, 1]].astype(np.int64),
+            "order": present[order].astype(np.int64),
+            "prefix_offsets": prefix_offsets,
+            "prefix_data": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+            "nulls": np.flatnonzero(null).astype(np.int64)
+        }, version)
+    
+    def save(self, path: str) -> None:
+        """Write the index directory, replacing any previous one atomically."""
+        target = Path(path)
+        staging = target.with_name(target.name + ".tmp")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        
+        arrays = {
+            "keys": self.keys,
+            "offsets": self.offsets,
+            "rows": self.rows,
+            "order": self.order,
+            "prefix_offsets": self.sorted_values.offsets,
+            "prefix_data": self.sorted_values.data,
+            "nulls": self.nulls
+        }
+        for name, array in arrays.items():
+            np.save(staging / f"{name}.npy", np.asarray(array))
+        with open(staging / "meta.json", "w") as f:
+            json.dump({
+                "row_count": self.row_count,
+                "version": list(self.version) if self.version is not None else None
+            }, f)
+        
+        shutil.rmtree(target, ignore_errors=True)
+        os.replace(staging, target)
+    
+    @classmethod
+    def load(cls, path: str) -> Optional["TextIndex"]:
+        """Open a saved index, or return None if there is none."""
+        meta_path = os.path.join(path, "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        return cls({
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+            for name in cls.ARRAYS
+        }, meta.get("version"))
+    
+    def _containing(self, text: str) -> Optional[np.ndarray]:
+        """Rows whose case-folded value holds every trigram of text."""
+        folded = text.casefold()
+        if len(folded) < 3 or "\x00" in folded:
+            return None
+        
+        postings = []
+        for code in np.unique(self._trigrams([folded], 0)[:, 0]):
+            i = int(np.searchsorted(self.keys, code))
+            if i == len(self.keys) or self.keys[i] != code:
+                return np.empty(0, dtype=np.int64)
+            postings.append(self.rows[self.offsets[i]:self.offsets[i + 1]])
+        
+        postings.sort(key=len)
+        rows = np.asarray(postings[0])
+        for other in postings[1:]:
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        return rows
+    
+    def _starting_with(self, prefix: str) -> Optional[np.ndarray]:
+        """Rows whose value starts with prefix, from the sorted values."""
+        if not prefix:
+            return None
+        encoded = prefix.encode("utf-8")
+        start = bisect.bisect_left(self.sorted_values, encoded)
+        # 0xff never occurs in UTF-8, so this sorts after every extension of the prefix
+        stop = bisect.bisect_left(self.sorted_values, encoded + b"\xff", lo=start)
+        return np.sort(self.order[start:stop])
+    
+    def candidates(self, operator: str, value: Any) -> Optional[np.ndarray]:
+        """Get sorted row positions that may match a text filter.
+        
+        Returns None when the index cannot narrow the search, e.g. for
+        values shorter than a trigram or ``contains`` patterns using regular
+        expression syntax.
+        """
+        text = str(value)
+        if operator == "startswith":
+            return self._starting_with(text)
+        if operator == "endswith" or (
+            operator == "contains" and not REGEX_CHARS.intersection(text)
+        ):
+            return self._containing(text)
+        return None
+
+
+def build_text_indexes(
+    data_path: str,
+    storage_format: str,
+    schema: Dict[str, Any],
+    version: Tuple[int, int]
+) -> int:
+    """Build the index of every plain text column of a stored dataset.
+    
+    ``version`` is the data version the indexes are recorded against.
+    Returns the number of indexes written.
+    """
+    built = 0
+    for position, column in enumerate(schema.get("columns", [])):
+        if column["type"] != "object":
+            continue
+        values = DataProcessor.read_dataset(data_path, storage_format, [column["name"]])
+        TextIndex.build(values[column["name"]].reset_index(drop=True), version).save(
+            TextIndex.path_for(data_path, position)
+        )
+        built += 1
+    return built
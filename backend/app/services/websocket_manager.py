@@ -11,6 +11,8 @@ class ConnectionManager:
         self.active_connections: Dict[int, Set[WebSocket]] = {}
         # Map websocket to user info
         self.connection_info: Dict[WebSocket, dict] = {}
+        # Map user_id to notification connections
+        self.user_connections: Dict[int, Set[WebSocket]] = {}
     
     async def connect(self, websocket: WebSocket, sheet_id: int, user_id: int, username: str):
         """Accept and register a new WebSocket connection."""
@@ -84,6 +86,41 @@ class ConnectionManager:
         except Exception:
             self.disconnect(websocket)
     
+    async def connect_user(self, websocket: WebSocket, user_id: int):
+        """Accept and register a user notification connection."""
+        await websocket.accept()
+        
+        if user_id not in self.user_connections:
+            self.user_connections[user_id] = set()
+        
+        self.user_connections[user_id].add(websocket)
+    
+    def disconnect_user(self, websocket: WebSocket, user_id: int):
+        """Remove a user notification connection."""
+        if user_id in self.user_connections:
+            self.user_connections[user_id].discard(websocket)
+            
+            if not self.user_connections[user_id]:
+                del self.user_connections[user_id]
+    
+    async def send_to_user(self, user_id: int, message: dict):
+        """Send a message to every notification connection of a user."""
+        if user_id not in self.user_connections:
+            return
+        
+        disconnected = []
+        message_str = json.dumps(message)
+        
+        for connection in self.user_connections[user_id]:
+            try:
+                await connection.send_text(message_str)
+            except Exception:
+                disconnected.append(connection)
+        
+        # Clean up disconnected connections
+        for connection in disconnected:
+            self.disconnect_user(connection, user_id)
+    
     def get_active_users(self, sheet_id: int) -> list:
         """Get list of active users in a sheet."""
         if sheet_id not in self.active_connections:
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from app.services.binning import bin_edges, hex_bins, histogram, histogram_2d
+
+
+def test_histogram_methods():
+    """Test fixed, quantile and Freedman-Diaconis bins over the same values."""
+    values = np.random.default_rng(0).normal(size=10000)
+    values[:10] = np.nan
+    
+    fixed = histogram(values, "fixed", 10)
+    assert fixed["count"] == 9990
+    assert len(fixed["counts"]) == 10 and sum(fixed["counts"]) == 9990
+    
+    quantile = histogram(values, "quantile", 4)
+    assert max(quantile["counts"]) - min(quantile["counts"]) <= 2
+    
+    fd = histogram(values, "fd", 1000)
+    width = 2 * np.subtract(*np.nanpercentile(values, [75, 25])) / 9990 ** (1 / 3)
+    assert fd["edges"][1] - fd["edges"][0] == pytest.approx(width, rel=0.05)
+    assert len(bin_edges(values[10:], "fd", 5)) == 6
+    
+    with pytest.raises(ValueError):
+        bin_edges(values, "log", 10)
+
+
+def test_quantile_bins_merge_ties():
+    """Test that heavily tied values do not produce empty quantile bins."""
+    result = histogram(np.array([1.0] * 90 + list(range(10))), "quantile", 10)
+    assert 0 not in result["counts"]
+
+
+def test_fd_bins_fall_back_before_building_edges():
+    """Test that an outlier past a narrow IQR gets fixed bins, not millions of edges."""
+    values = np.r_[np.linspace(0, 1e-3, 10000), 1e12]
+    result = histogram(values, "fd", 50)
+    assert len(result["edges"]) == 51
+    assert sum(result["counts"]) == 10001
+
+
+def test_quantile_bins_of_constant_values():
+    """Test that constant values get a single quantile bin around them."""
+    result = histogram(np.array([1.0, 1.0, 1.0]), "quantile", 5)
+    assert result["edges"] == [0.5, 1.5]
+    assert result["counts"] == [3]
+
+
+def test_rect_and_hex_bins_count_every_pair():
+    """Test that 2D grids count every finite pair once."""
+    rng = np.random.default_rng(1)
+    x, y = rng.normal(size=50000), rng.normal(size=50000)
+    y[0] = np.inf
+    
+    rect = histogram_2d(x, y, 30, "rect")
+    assert rect["count"] == 49999
+    assert len(rect["counts"]) == 30 and len(rect["counts"][0]) == 30
+    assert sum(map(sum, rect["counts"])) == 49999
+    
+    hexes = hex_bins(x[1:], y[1:], 30)
+    assert sum(hexes["counts"]) == 49999
+    centers = np.array(hexes["centers"])
+    # Every point lies within a cell's circumradius of its center
+    sx, sy = hexes["hex_size"]
+    assert len(centers) == len(np.unique(centers, axis=0))
+    nearest = np.min(
+        ((x[1:1001, None] - centers[None, :, 0]) / sx) ** 2
+        + 3 * ((y[1:1001, None] - centers[None, :, 1]) / sy) ** 2,
+        axis=1
+    )
+    assert nearest.max() <= 1.0
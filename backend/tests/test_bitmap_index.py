@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+from app.services.bitmap_index import BitmapIndex
+from app.services.data_processor import DataProcessor
+
+
+VALUES = pd.Series(
+    pd.Categorical(["north", None, "south", "north", "east", None, "south", "north", "west"])
+)
+
+
+def test_bitmaps_match_equality_filters():
+    """Test that eq and ne bitmaps select the same rows as the filter masks."""
+    for values in [VALUES, VALUES.astype(object)]:
+        for operator in BitmapIndex.OPERATORS:
+            for value in ["north", "west", "missing"]:
+                expected = DataProcessor._filter_mask(VALUES, operator, value).to_numpy()
+                bits = BitmapIndex.match(BitmapIndex.build(values, value), operator)
+                rows = BitmapIndex.positions(bits, len(VALUES))
+                assert rows.tolist() == np.flatnonzero(expected).tolist()
+
+
+def test_bitmaps_combine_with_bitwise_operations():
+    """Test AND/OR of several filters through their bitmaps."""
+    north, south = BitmapIndex.build(VALUES, "north"), BitmapIndex.build(VALUES, "south")
+    
+    assert len(north) == (len(VALUES) + 7) // 8
+    assert BitmapIndex.positions(north | south, len(VALUES)).tolist() == [0, 2, 3, 6, 7]
+    assert BitmapIndex.positions(north & BitmapIndex.match(north, "ne"), len(VALUES)).tolist() == []
+    assert not BitmapIndex.supports("gt", "north")
+    assert not BitmapIndex.supports("eq", 1)
@@ -0,0 +1,31 @@
+import numpy as np
+
+from app.services.chart_data import lttb, thin_grid
+
+
+def test_lttb_keeps_ends_and_peaks():
+    """Test that LTTB keeps the first and last points and a spike."""
+    x = np.arange(10000, dtype=float)
+    y = np.sin(x / 500)
+    y[4321] = 50
+    
+    positions = lttb(x, y, 200)
+    
+    assert len(positions) == 200
+    assert positions[0] == 0 and positions[-1] == 9999
+    assert 4321 in positions
+    assert np.all(np.diff(positions) > 0)
+    assert len(lttb(x[:50], y[:50], 200)) == 50
+
+
+def test_thin_grid_keeps_one_point_per_cell():
+    """Test that grid thinning keeps a point per occupied cell with its count."""
+    rng = np.random.default_rng(0)
+    x, y = rng.random(100000), rng.random(100000)
+    
+    positions, counts = thin_grid(x, y, 20, 10)
+    
+    assert len(positions) == 200
+    assert counts.sum() == 100000
+    cells = set(zip((x[positions] * 20).astype(int), (y[positions] * 10).astype(int)))
+    assert len(cells) == 200
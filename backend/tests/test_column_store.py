@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+from app.services.column_store import ColumnStore, ColumnStoreWriter
+
+
+def make_frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        "id": np.arange(10, dtype=np.int64),
+        "price": [1.5, np.nan, 3.0, 4.5, 5.0, 6.5, np.nan, 8.0, 9.5, 10.0],
+        "active": [True, False] * 5,
+        "region": ["north", None, "south", "é", "", "east", "west", None, "north", "x"],
+        "day": pd.date_range("2024-01-01", periods=10)
+    })
+
+
+def test_read_rows_returns_only_the_requested_slice(tmp_path):
+    """Test that a row range reads back with its values and types."""
+    df = make_frame()
+    ColumnStore.write(df, str(tmp_path / "store"))
+    store = ColumnStore(str(tmp_path / "store"))
+    
+    page = store.read_rows(3, 7)
+    
+    assert store.row_count == 10
+    assert list(page.index) == [3, 4, 5, 6]
+    assert page["id"].tolist() == [3, 4, 5, 6]
+    assert page["region"].tolist() == ["é", "", "east", "west"]
+    assert page["active"].dtype == bool
+    assert page["day"].iloc[0] == pd.Timestamp("2024-01-04")
+    assert np.isnan(page["price"].iloc[3])
+
+
+def test_full_read_round_trips_nulls(tmp_path):
+    """Test that text nulls and empty strings stay distinct."""
+    df = make_frame()
+    ColumnStore.write(df, str(tmp_path / "store"))
+    
+    restored = ColumnStore(str(tmp_path / "store")).read(["region", "price"])
+    
+    assert list(restored.columns) == ["price", "region"]
+    assert restored["region"].isnull().tolist() == df["region"].isnull().tolist()
+    assert restored["region"].iloc[4] == ""
+    pd.testing.assert_series_equal(restored["price"], df["price"])
+
+
+def test_take_reads_scattered_rows(tmp_path):
+    """Test that rows picked by position match the same rows of a full read."""
+    df = make_frame()
+    ColumnStore.write(df, str(tmp_path / "store"))
+    positions = np.array([0, 1, 3, 4, 9])
+    
+    taken = ColumnStore(str(tmp_path / "store")).take(positions)
+    
+    assert list(taken.index) == [0, 1, 3, 4, 9]
+    assert taken["region"].tolist() == ["north", None, "é", "", "x"]
+    pd.testing.assert_frame_equal(taken, df.iloc[positions], check_index_type=False)
+
+
+def test_read_rows_past_the_end_is_empty(tmp_path):
+    """Test that out-of-range pages return no rows."""
+    ColumnStore.write(make_frame(), str(tmp_path / "store"))
+    
+    page = ColumnStore(str(tmp_path / "store")).read_rows(20, 30)
+    
+    assert len(page) == 0
+    assert list(page.columns) == list(make_frame().columns)
+
+
+def test_categories_are_merged_across_chunks(tmp_path):
+    """Test that per-chunk categories map onto one sorted dictionary."""
+    path = tmp_path / "store"
+    with ColumnStoreWriter(str(path)) as writer:
+        writer.append(pd.DataFrame({"status": pd.Categorical(["open", None, "closed"])}))
+        writer.append(pd.DataFrame({"status": pd.Categorical(["new", "open"])}))
+    
+    status = ColumnStore(str(path)).read_rows(1, 5)["status"]
+    
+    assert list(status.cat.categories) == ["closed", "new", "open"]
+    assert status.tolist()[1:] == ["closed", "new", "open"]
+    assert pd.isna(status.iloc[0])
+
+
+def test_zone_maps_skip_blocks_outside_the_filter_range(tmp_path, monkeypatch):
+    """Test that only blocks whose min/max overlap a range filter are read."""
+    monkeypatch.setattr(ColumnStoreWriter, "BLOCK_ROWS", 4)
+    df = make_frame()
+    ColumnStore.write(df, str(tmp_path / "store"))
+    store = ColumnStore(str(tmp_path / "store"))
+    
+    price = [{"column": "price", "operator": "gte", "value": 8}]
+    day = [{"column": "day", "operator": "lt", "value": "2024-01-03"}]
+    region = [{"column": "region", "operator": "eq", "value": "x"}]
+    
+    assert store.candidate_blocks(price).tolist() == [False, True, True]
+    assert store.candidate_blocks(price + day).tolist() == [False, False, False]
+    assert store.candidate_blocks(price + day, "or").tolist() == [True, True, True]
+    assert store.candidate_blocks(price + region, "or").tolist() == [True, True, True]
+    assert store.candidate_blocks(price + region).tolist() == [False, True, True]
+    
+    matched = store.read_blocks(store.candidate_blocks(price), ["price"])
+    assert list(matched.index) == list(range(4, 10))
+    pd.testing.assert_series_equal(matched["price"], df["price"].iloc[4:])
@@ -0,0 +1,118 @@
+import pandas as pd
+import pytest
+
+from app.services.data_processor import DataProcessor
+
+
+def test_parquet_round_trip_preserves_types(tmp_path):
+    """Test that the columnar copy reads back with the CSV's dtypes."""
+    csv_path = tmp_path / "sales.csv"
+    csv_path.write_text("region,units,price\nnorth,3,1.5\nsouth,,2.25\n")
+    df = DataProcessor.read_csv(str(csv_path))
+    
+    parquet_path = tmp_path / "sales.parquet"
+    DataProcessor.write_parquet(df, str(parquet_path))
+    restored = DataProcessor.read_dataset(str(parquet_path), "parquet")
+    
+    pd.testing.assert_frame_equal(restored, df)
+
+
+def test_read_dataset_prunes_columns(tmp_path):
+    """Test that only the requested columns are read."""
+    path = tmp_path / "sales.parquet"
+    DataProcessor.write_parquet(
+        pd.DataFrame({"region": ["north"], "units": [3], "price": [1.5]}), str(path)
+    )
+    
+    df = DataProcessor.read_dataset(str(path), "parquet", ["units"])
+    
+    assert list(df.columns) == ["units"]
+
+
+def test_write_parquet_handles_mixed_columns(tmp_path):
+    """Test that mixed text/number columns are stored as text."""
+    path = tmp_path / "mixed.parquet"
+    DataProcessor.write_parquet(pd.DataFrame({"code": [1, "A2", None]}), str(path))
+    
+    df = DataProcessor.read_parquet(str(path))
+    
+    assert df["code"].tolist()[:2] == ["1", "A2"]
+    assert df["code"].isnull().iloc[2]
+
+
+def test_to_records_matches_json_semantics():
+    """Test that records use null for missing values and ISO dates."""
+    df = pd.DataFrame({
+        "id": [1, 2],
+        "price": [1.5, float("nan")],
+        "region": ["north", None],
+        "sold_at": pd.to_datetime(["2024-01-02 03:04:05.678", None])
+    })
+    
+    assert DataProcessor.to_records(df) == [
+        {"id": 1, "price": 1.5, "region": "north", "sold_at": "2024-01-02T03:04:05.678"},
+        {"id": 2, "price": None, "region": None, "sold_at": None}
+    ]
+
+
+def test_filters_and_groups_on_categories_match_text():
+    """Test that dictionary-encoded columns filter and group like plain text."""
+    text = pd.DataFrame({
+        "region": ["north", "south", None, "north", "east"],
+        "units": [1, 2, 3, 4, 5]
+    })
+    encoded = text.astype({"region": "category"})
+    
+    for operator, value in [("eq", "north"), ("ne", "north"), ("startswith", "s"), ("gt", "m")]:
+        filters = [{"column": "region", "operator": operator, "value": value}]
+        assert (
+            DataProcessor.apply_filters(encoded, filters).index.tolist()
+            == DataProcessor.apply_filters(text, filters).index.tolist()
+        )
+    
+    assert DataProcessor.aggregate(encoded, "units", "sum", ["region"]) == (
+        DataProcessor.aggregate(text, "units", "sum", ["region"])
+    )
+
+
+def test_sort_frame_multi_key_with_null_placement():
+    """Test sorting by several keys with per-key direction and null position."""
+    df = pd.DataFrame({
+        "region": ["north", "south", None, "north", "east"],
+        "units": [3.0, None, 5.0, 8.0, 1.0]
+    })
+    
+    by_region = DataProcessor.sort_frame(df, [
+        {"column": "region", "direction": "desc", "nulls": "first"},
+        {"column": "units", "direction": "desc"}
+    ])
+    by_units = DataProcessor.sort_frame(df, [{"column": "units", "nulls": "first"}])
+    
+    assert by_region.index.tolist() == [2, 1, 3, 0, 4]
+    assert by_units.index.tolist() == [1, 4, 0, 2, 3]
+
+
+def test_aggregate_many_with_distinct_spread_and_percentiles():
+    """Test the statistical operations, grouped and over the whole frame."""
+    df = pd.DataFrame({
+        "region": ["north", "south", "north", "north", "south"],
+        "units": [1.0, 2.0, 3.0, 5.0, 2.0]
+    })
+    aggregates = [
+        {"column": "units", "operation": "count_distinct", "alias": "distinct"},
+        {"column": "units", "operation": "p50"},
+        {"column": "units", "operation": "variance"},
+        {"column": "units", "operation": "stddev"}
+    ]
+    
+    grouped = DataProcessor.aggregate_many(df, aggregates, ["region"])
+    total = DataProcessor.aggregate_many(df, aggregates)
+    
+    assert list(grouped.columns) == ["region", "distinct", "units_p50", "units_variance", "units_stddev"]
+    assert grouped["distinct"].tolist() == [3, 1]
+    assert grouped["units_p50"].tolist() == [3.0, 2.0]
+    assert grouped["units_variance"].tolist() == [4.0, 0.0]
+    assert total.iloc[0].tolist() == [4, 2.0, 2.3, df["units"].std()]
+    assert DataProcessor.aggregate_frame(df, "units", "p100") == (5.0, None)
+    with pytest.raises(ValueError):
+        DataProcessor.aggregate_many(df, [{"column": "units", "operation": "p101"}])
@@ -0,0 +1,76 @@
+import pandas as pd
+
+from app.services.dataset_cache import MemoryCache, estimate_size, file_version
+
+
+def make_frame(rows: int) -> pd.DataFrame:
+    return pd.DataFrame({"id": range(rows), "value": [float(i) for i in range(rows)]})
+
+
+def test_get_or_load_counts_hits_and_misses():
+    """Test that a second lookup is served from the cache."""
+    cache = MemoryCache(max_bytes=10_000_000)
+    calls = []
+    
+    def loader():
+        calls.append(1)
+        return make_frame(10)
+    
+    first = cache.get_or_load((1, 0, 0), loader)
+    second = cache.get_or_load((1, 0, 0), loader)
+    
+    assert first is second
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_lru_eviction_respects_budget():
+    """Test that least recently used entries are evicted to fit the budget."""
+    frame_size = estimate_size(make_frame(100))
+    cache = MemoryCache(max_bytes=frame_size * 2)
+    
+    cache.put((1,), make_frame(100))
+    cache.put((2,), make_frame(100))
+    cache.get((1,))
+    cache.put((3,), make_frame(100))
+    
+    assert cache.get((1,)) is not None
+    assert cache.get((2,)) is None
+    assert cache.get((3,)) is not None
+    assert cache.stats()["current_bytes"] <= cache.max_bytes
+    assert cache.stats()["evictions"] == 1
+
+
+def test_oversized_values_are_not_cached():
+    """Test that a value larger than the budget is never stored."""
+    cache = MemoryCache(max_bytes=10)
+    cache.put((1,), make_frame(100))
+    
+    assert cache.get((1,)) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_invalidate_drops_all_dataset_entries():
+    """Test invalidation of every version cached for a dataset."""
+    cache = MemoryCache(max_bytes=10_000_000)
+    cache.put((1, 100, 10), make_frame(5))
+    cache.put((1, 200, 20), make_frame(5))
+    cache.put((2, 100, 10), make_frame(5))
+    
+    cache.invalidate(1)
+    
+    assert cache.get((1, 100, 10)) is None
+    assert cache.get((1, 200, 20)) is None
+    assert cache.get((2, 100, 10)) is not None
+
+
+def test_file_version_changes_with_content(tmp_path):
+    """Test that rewriting a file changes its cache fingerprint."""
+    path = tmp_path / "data.csv"
+    path.write_text("a\n1\n")
+    before = file_version(str(path))
+    path.write_text("a\n1\n2\n")
+    
+    assert file_version(str(path)) != before
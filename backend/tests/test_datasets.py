@@ -0,0 +1,761 @@
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import pyarrow as pa
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.api.responses import ARROW_STREAM, COLUMNS_JSON
+from app.core.database import Base, get_db
+from app.models.dataset import Dataset
+from app.core.config import settings
+from app.services.column_store import ColumnStore
+from app.services.data_processor import DataProcessor
+from app.services.ingest_jobs import ingest_jobs
+from app.services.process_pool import ProcessPool
+from app.services.text_index import TextIndex
+
+# Create test database
+TEST_DATABASE_URL = "sqlite:///./test_datasets.db"
+engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base.metadata.create_all(bind=engine)
+
+CSV = (
+    "id,region,units,price\n"
+    "1,north,3,1.5\n"
+    "2,south,4,2.5\n"
+    "3,north,,3.5\n"
+    "4,east,7,4.5\n"
+    "5,north,8,5.5\n"
+)
+
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Test client using the database above."""
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture(autouse=True)
+def test_settings(tmp_path, monkeypatch):
+    """Act as the demo user and store uploads in a temporary directory."""
+    monkeypatch.setattr(settings, "DISABLE_AUTH", True)
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+
+
+def upload(client, csv: str = CSV, file_name: str = "sales.csv") -> dict:
+    """Upload a CSV and wait for its ingest job to finish."""
+    response = client.post(
+        "/api/datasets",
+        data={"name": "Sales"},
+        files={"file": (file_name, csv.encode(), "text/csv")}
+    )
+    assert response.status_code == 201
+    ingest_jobs.wait(response.json()["id"], timeout=30)
+    return response.json()
+
+
+def test_upload_is_processed_in_background(client):
+    """Test that upload returns immediately and the job marks the dataset ready."""
+    dataset = upload(client)
+    assert dataset["status"] == "processing"
+    
+    response = client.get(f"/api/datasets/{dataset['id']}/status")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "ready"
+    assert data["row_count"] == 5
+    assert data["column_count"] == 4
+
+
+def test_failed_ingest_reports_error(client):
+    """Test that an unparseable file ends in the failed state."""
+    dataset = upload(client, csv="", file_name="empty.csv")
+    
+    data = client.get(f"/api/datasets/{dataset['id']}/status").json()
+    assert data["status"] == "failed"
+    assert data["error"]
+    
+    response = client.get(f"/api/datasets/{dataset['id']}/data")
+    assert response.status_code == 409
+
+
+def test_interrupted_ingest_is_resumed(client):
+    """Test that datasets a restart left processing are requeued or failed."""
+    resumed, lost = upload(client), upload(client, file_name="lost.csv")
+    db = TestingSessionLocal()
+    try:
+        for dataset in db.query(Dataset).filter(Dataset.id.in_([resumed["id"], lost["id"]])):
+            dataset.status = "processing"
+            if dataset.id == lost["id"]:
+                Path(dataset.file_path).unlink()
+        db.commit()
+    finally:
+        db.close()
+    
+    ingest_jobs.resume(TestingSessionLocal)
+    ingest_jobs.wait(resumed["id"], timeout=30)
+    
+    data = client.get(f"/api/datasets/{resumed['id']}/status").json()
+    assert data["status"] == "ready"
+    assert data["row_count"] == 5
+    data = client.get(f"/api/datasets/{lost['id']}/status").json()
+    assert data["status"] == "failed"
+    assert "restarted" in data["error"]
+
+
+def test_get_dataset_data(client):
+    """Test reading a page of an ingested dataset."""
+    dataset = upload(client)
+    
+    response = client.get(
+        f"/api/datasets/{dataset['id']}/data",
+        params={"page": 2, "page_size": 2}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [row["id"] for row in data["data"]] == [3, 4]
+    assert data["data"][0]["units"] is None
+    assert data["total_rows"] == 5
+    assert data["total_pages"] == 3
+
+
+def test_sorted_pages(client):
+    """Test multi-key sorting of data pages and filtered results."""
+    dataset = upload(client)
+    
+    response = client.get(
+        f"/api/datasets/{dataset['id']}/data",
+        params={"sort": ["units:desc:nulls_first"], "page": 1, "page_size": 3}
+    )
+    assert response.status_code == 200
+    assert [row["id"] for row in response.json()["data"]] == [3, 5, 4]
+    
+    response = client.post(
+        f"/api/datasets/{dataset['id']}/filter",
+        json={
+            "filters": [{"column": "price", "operator": "gt", "value": 2}],
+            "sort": [{"column": "region"}, {"column": "price", "direction": "desc"}]
+        }
+    )
+    assert [row["id"] for row in response.json()["data"]] == [4, 5, 3, 2]
+    assert response.json()["total_rows"] == 4
+    
+    response = client.get(
+        f"/api/datasets/{dataset['id']}/data", params={"sort": ["missing"]}
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("storage_format", ["columns", "csv"])
+def test_text_filters_use_the_text_index(client, monkeypatch, storage_format):
+    """Test that text filters served through the index match and it is removed with the dataset."""
+    monkeypatch.setattr(settings, "DATASET_STORAGE_FORMAT", storage_format)
+    monkeypatch.setattr(settings, "TEXT_INDEX_MIN_ROWS", 0)
+    dataset = upload(client)
+    index_dirs = list(Path(settings.UPLOAD_DIR).rglob("*.textidx"))
+    assert len(index_dirs) == 1
+    
+    response = client.post(
+        f"/api/datasets/{dataset['id']}/filter",
+        json={
+            "filters": [
+                {"column": "region", "operator": "contains", "value": "ORT"},
+                {"column": "price", "operator": "gt", "value": 2}
+            ]
+        }
+    )
+    assert [row["id"] for row in response.json()["data"]] == [3, 5]
+    
+    client.delete(f"/api/datasets/{dataset['id']}")
+    assert not index_dirs[0].exists()
+
+
+def test_text_index_of_older_data_is_ignored(client, monkeypatch):
+    """Test that a text index is not used once the data is rewritten with as many rows."""
+    monkeypatch.setattr(settings, "TEXT_INDEX_MIN_ROWS", 0)
+    dataset = upload(client)
+    index_dir = next(Path(settings.UPLOAD_DIR).rglob("*.textidx"))
+    data_path = str(index_dir)[:-len(TextIndex.SUFFIX)]
+    
+    df = DataProcessor.read_dataset(data_path, "columns")
+    df["region"] = df["region"].replace({"north": "west"})
+    DataProcessor.write_dataset(df, data_path, "columns")
+    
+    response = client.post(
+        f"/api/datasets/{dataset['id']}/filter",
+        json={"filters": [{"column": "region", "operator": "contains", "value": "wes"}]}
+    )
+    assert [row["id"] for row in response.json()["data"]] == [1, 3, 5]
+
+
+@pytest.mark.parametrize("storage_format", ["columns", "parquet"])
+@pytest.mark.parametrize("category_ratio", [0.0, 1.0])
+def test_text_filters_never_match_nulls(client, monkeypatch, storage_format, category_ratio):
+    """Test that null text cells don't match text filters as the string "None"."""
+    monkeypatch.setattr(settings, "DATASET_STORAGE_FORMAT", storage_format)
+    monkeypatch.setattr(settings, "CATEGORY_MAX_RATIO", category_ratio)
+    dataset = upload(client, "id,name\n1,Monday\n2,\n3,bone\n4,\n5,Nonce\n")
+    
+    def matching(operator: str, value: str) -> list:
+        response = client.post(
+            f"/api/datasets/{dataset['id']}/filter",
+            json={"filters": [{"column": "name", "operator": operator, "value": value}]}
+        )
+        return [row["id"] for row in response.json()["data"]]
+    
+    assert matching("contains", "on") == [1, 3, 5]
+    assert matching("contains", "one") == [3]
+    assert matching("startswith", "No") == [5]
+    assert matching("endswith", "ne") == [3]
+
+
+def region(operator: str, value: str) -> dict:
+    return {"column": "region", "operator": operator, "value": value}
+
+
+@pytest.mark.parametrize("filters,logic,expected", [
+    ([region("eq", "north"), region("eq", "south")], "or", [1, 2, 3, 5]),
+    ([region("ne", "north"), region("ne", "east")], "and", [2]),
+    ([region("eq", "north"), {"column": "price", "operator": "gt", "value": 2}], "and", [3, 5])
+])
+def test_equality_filters_on_categories_use_bitmaps(client, monkeypatch, filters, logic, expected):
+    """Test faceted filters answered from category bitmaps, alone and with other filters."""
+    monkeypatch.setattr(settings, "CATEGORY_MAX_RATIO", 1.0)
+    dataset = upload(client)
+    
+    response = client.post(
+        f"/api/datasets/{dataset['id']}/filter",
+        json={"filters": filters, "logic": logic}
+    )
+    assert response.status_code == 200
+    assert [row["id"] for row in response.json()["data"]] == expected
+
+
+def test_filter_pages_reuse_matching_positions(client, monkeypatch):
+    """Test that later pages of a filtered, sorted view do not evaluate filters again."""
+    dataset = upload(client)
+    evaluations = []
+    filter_mask = DataProcessor.filter_mask
+    
+    def counting_filter_mask(*args, **kwargs):
+        evaluations.append(args)
+        return filter_mask(*args, **kwargs)
+    
+    monkeypatch.setattr(DataProcessor, "filter_mask", staticmethod(counting_filter_mask))
+    pages = []
+    for page in (1, 2, 3):
+        response = client.post(
+            f"/api/datasets/{dataset['id']}/filter",
+            json={
+                "filters": [{"column": "price", "operator": "gt", "value": 2}],
+                "sort": [{"column": "price", "direction": "desc"}],
+                "page": page,
+                "page_size": 2
+            }
+        )
+        pages.append([row["id"] for row in response.json()["data"]])
+    
+    assert pages == [[5, 4], [3, 2], []]
+    assert len(evaluations) == 1
+
+
+def test_cursor_pagination(client, monkeypatch):
+    """Test walking data and filter results by cursor, with totals on request."""
+    monkeypatch.setattr("app.services.dataset_cache.SCAN_CHUNK_ROWS", 2)
+    dataset = upload(client)
+    url = f"/api/datasets/{dataset['id']}"
+    
+    ids, cursor = [], ""
+    while cursor is not None:
+        body = client.get(
+            f"{url}/data", params={"cursor": cursor, "page_size": 2, "sort": ["price:desc"]}
+        ).json()
+        ids.append([row["id"] for row in body["data"]])
+        cursor = body["next_cursor"]
+    assert ids == [[5, 4], [3, 2], [1]]
+    assert body["total_rows"] == 5
+    
+    query = {
+        "filters": [{"column": "region", "operator": "ne", "value": "south"}],
+        "page_size": 2,
+        "cursor": ""
+    }
+    first = client.post(f"{url}/filter", json=query).json()
+    assert [row["id"] for row in first["data"]] == [1, 3]
+    assert first["total_rows"] is None
+    
+    second = client.post(
+        f"{url}/filter", json={**query, "cursor": first["next_cursor"], "include_total": True}
+    ).json()
+    assert [row["id"] for row in second["data"]] == [4, 5]
+    assert second["total_rows"] == 4
+    
+    response = client.post(
+        f"{url}/filter", json={**query, "logic": "or", "cursor": first["next_cursor"]}
+    )
+    assert response.status_code == 400
+
+
+def test_csv_storage_pages_through_row_index(client, monkeypatch):
+    """Test that datasets kept as CSV serve pages through their row index."""
+    monkeypatch.setattr(settings, "DATASET_STORAGE_FORMAT", "csv")
+    monkeypatch.setattr(settings, "ROW_INDEX_STRIDE", 2)
+    dataset = upload(client)
+    
+    response = client.get(
+        f"/api/datasets/{dataset['id']}/data",
+        params={"page": 2, "page_size": 2}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["data"] == [
+        {"id": 3, "region": "north", "units": None, "price": 3.5},
+        {"id": 4, "region": "east", "units": 7.0, "price": 4.5}
+    ]
+    assert data["total_rows"] == 5
+
+
+def test_data_content_negotiation(client):
+    """Test columnar JSON and Arrow IPC responses selected by the Accept header."""
+    dataset = upload(client)
+    url = f"/api/datasets/{dataset['id']}/data"
+    params = {"page": 1, "page_size": 2}
+    
+    response = client.get(url, params=params, headers={"Accept": COLUMNS_JSON})
+    assert response.headers["content-type"] == COLUMNS_JSON
+    assert response.json()["data"]["region"] == ["north", "south"]
+    assert response.json()["total_rows"] == 5
+    
+    response = client.get(url, params=params, headers={"Accept": ARROW_STREAM})
+    assert response.headers["content-type"] == ARROW_STREAM
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column("id").to_pylist() == [1, 2]
+    assert json.loads(table.schema.metadata[b"sigmalite"])["total_pages"] == 3
+
+
+def test_aggregate_as_arrow(client):
+    """Test grouped aggregates streamed as Arrow."""
+    dataset = upload(client)
+    
+    response = client.post(
+        f"/api/datasets/{dataset['id']}/aggregate",
+        json={"column": "units", "operation": "sum", "group_by": ["region"]},
+        headers={"Accept": f"{ARROW_STREAM}, application/json;q=0.5"}
+    )
+    assert response.status_code == 200
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert dict(zip(table.column("region").to_pylist(), table.column("units").to_pylist())) == {
+        "east": 7.0, "north": 11.0, "south": 4.0
+    }
+
+
+def test_batched_aggregates(client):
+    """Test several aggregates in one request, with and without groups."""
+    dataset = upload(client)
+    aggregates = [
+        {"column": "units", "operation": "sum", "alias": "units"},
+        {"column": "price", "operation": "max"},
+        {"column": "region", "operation": "count_distinct", "alias": "regions"}
+    ]
+    
+    response = client.post(
+        f"/api/datasets/{dataset['id']}/aggregate", json={"aggregates": aggregates}
+    )
+    assert response.status_code == 200
+    assert response.json()["results"] == {"units": 22.0, "price_max": 5.5, "regions": 3}
+    
+    response = client.post(
+        f"/api/datasets/{dataset['id']}/aggregate",
+        json={"aggregates": aggregates[:2], "group_by": ["region"]}
+    )
+    assert response.json()["group_results"] == [
+        {"region": "east", "units": 7.0, "price_max": 4.5},
+        {"region": "north", "units": 11.0, "price_max": 5.5},
+        {"region": "south", "units": 4.0, "price_max": 2.5}
+    ]
+    
+    response = client.post(f"/api/datasets/{dataset['id']}/aggregate", json={})
+    assert response.status_code == 400
+
+
+def test_pool_workers_filter_and_aggregate(client, monkeypatch):
+    """Test that filters and aggregates run in pool workers give the same results."""
+    pool = ProcessPool(workers=1, min_rows=0)
+    monkeypatch.setattr("app.services.dataset_cache.process_pool", pool)
+    try:
+        dataset = upload(client)
+        
+        response = client.post(
+            f"/api/datasets/{dataset['id']}/filter",
+            json={"filters": [{"column": "units", "operator": "gt", "value": 3}]}
+        )
+        assert response.status_code == 200
+        assert [row["id"] for row in response.json()["data"]] == [2, 4, 5]
+        
+        response = client.post(
+            f"/api/datasets/{dataset['id']}/aggregate",
+            json={
+                "aggregates": [{"column": "units", "operation": "sum", "alias": "units"}],
+                "group_by": ["region"]
+            }
+        )
+        assert response.json()["group_results"] == [
+            {"region": "east", "units": 7.0},
+            {"region": "north", "units": 11.0},
+            {"region": "south", "units": 4.0}
+        ]
+        
+        response = client.post(
+            f"/api/datasets/{dataset['id']}/aggregate",
+            json={"column": "price", "operation": "max", "group_by": ["region"]}
+        )
+        assert response.json()["group_results"][1] == {"region": "north", "price": 5.5}
+    finally:
+        pool.shutdown()
+
+
+@pytest.fixture
+def slow_filters(monkeypatch):
+    """Test filters one row at a time, taking 50ms per row."""
+    filter_mask = DataProcessor._filter_mask
+    
+    def slow_filter_mask(*args, **kwargs):
+        time.sleep(0.05)
+        return filter_mask(*args, **kwargs)
+    
+    monkeypatch.setattr(DataProcessor, "FILTER_CHUNK_ROWS", 1)
+    monkeypatch.setattr(DataProcessor, "_filter_mask", staticmethod(slow_filter_mask))
+
+
+def test_slow_queries_time_out(client, monkeypatch, slow_filters):
+    """Test endpoint and per-request time limits on a filter scan."""
+    dataset = upload(client)
+    url = f"/api/datasets/{dataset['id']}/filter"
+    query = {"filters": [{"column": "region", "operator": "contains", "value": "th"}]}
+    
+    monkeypatch.setattr(settings, "QUERY_TIMEOUTS", {"filter": 0.1})
+    response = client.post(url, json=query)
+    assert response.status_code == 504
+    assert "time limit" in response.json()["detail"]
+    
+    response = client.post(url, params={"timeout": 10}, json=query)
+    assert response.status_code == 200
+    assert [row["id"] for row in response.json()["data"]] == [1, 2, 3, 5]
+    
+    response = client.post(url, params={"timeout": 0}, json=query)
+    assert response.status_code == 422
+
+
+def test_queries_stop_when_the_client_disconnects(client, monkeypatch, slow_filters):
+    """Test that a filter is cancelled with 499 once its client goes away."""
+    monkeypatch.setattr("app.api.deps.DISCONNECT_POLL_SECONDS", 0.01)
+    dataset = upload(client)
+    body = json.dumps(
+        {"filters": [{"column": "region", "operator": "contains", "value": "th"}]}
+    ).encode()
+    sent = []
+    
+    async def request():
+        gone = asyncio.Event()
+        asyncio.get_running_loop().call_later(0.1, gone.set)
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+        
+        async def receive():
+            if messages:
+                return messages.pop()
+            await gone.wait()
+            return {"type": "http.disconnect"}
+        
+        async def send(message):
+            sent.append(message)
+        
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "POST",
+            "scheme": "http",
+            "path": f"/api/datasets/{dataset['id']}/filter",
+            "raw_path": f"/api/datasets/{dataset['id']}/filter".encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"content-type", b"application/json")],
+            "client": ("testclient", 50000),
+            "server": ("testserver", 80)
+        }
+        await app(scope, receive, send)
+    
+    started = time.monotonic()
+    asyncio.run(request())
+    
+    assert sent[0]["status"] == 499
+    assert time.monotonic() - started < 0.25
+
+
+def test_chart_aggregates_use_rollups(client, monkeypatch):
+    """Test that saving a chart builds a rollup that answers its aggregates."""
+    monkeypatch.setattr("app.services.rollups.RollupStore.MAX_ROW_RATIO", 1.0)
+    dataset = upload(client)
+    sheet = client.post("/api/sheets", json={"name": "Sales", "dataset_id": dataset["id"]}).json()
+    response = client.post(
+        "/api/charts",
+        json={
+            "name": "Units",
+            "chart_type": "bar",
+            "sheet_id": sheet["id"],
+            "config": {"x_axis": "region", "y_axis": "units"}
+        }
+    )
+    assert response.status_code == 201
+    
+    monkeypatch.setattr(
+        "app.api.routes.datasets.compute_aggregate",
+        lambda *args, **kwargs: pytest.fail("aggregate read the data")
+    )
+    response = client.post(
+        f"/api/datasets/{dataset['id']}/aggregate",
+        json={"column": "units", "operation": "avg", "group_by": ["region"]}
+    )
+    assert response.status_code == 200
+    assert response.json()["group_results"] == [
+        {"region": "east", "units": 7.0},
+        {"region": "north", "units": 5.5},
+        {"region": "south", "units": 4.0}
+    ]
+
+
+def test_chart_data_is_downsampled(client):
+    """Test that line and scatter chart data is reduced for the viewport."""
+    rows = "\n".join(f"{i},{i % 7},{(i * 37) % 1000}" for i in range(5000))
+    dataset = upload(client, "t,band,value\n" + rows + "\n")
+    sheet = client.post("/api/sheets", json={"name": "Series", "dataset_id": dataset["id"]}).json()
+    
+    def chart_data(chart_type: str, config: dict, **params) -> dict:
+        chart = client.post(
+            "/api/charts",
+            json={"name": chart_type, "chart_type": chart_type, "sheet_id": sheet["id"], "config": config}
+        ).json()
+        response = client.get(f"/api/charts/{chart['id']}/data", params=params)
+        assert response.status_code == 200
+        return response.json()
+    
+    line = chart_data("line", {"x_axis": "t", "y_axis": "value"}, width=300)
+    assert line["total_points"] == 5000 and line["downsampled"]
+    assert len(line["series"][0]["x"]) == 300
+    assert line["series"][0]["x"][0] == 0 and line["series"][0]["x"][-1] == 4999
+    
+    bars = chart_data("bar", {"x_axis": "band", "y_axis": "value", "aggregation": "count"})
+    assert bars["series"][0]["x"] == list(range(7))
+    assert sum(bars["series"][0]["y"]) == 5000
+    
+    scatter = chart_data("scatter", {"x_axis": "t", "y_axis": "value"}, width=80, height=80)
+    assert len(scatter["series"][0]["x"]) <= 100
+    assert sum(scatter["series"][0]["counts"]) == 5000
+    
+    for chart_type in ("scatter", "line"):
+        chart = client.post(
+            "/api/charts",
+            json={
+                "name": "Missing",
+                "chart_type": chart_type,
+                "sheet_id": sheet["id"],
+                "config": {"x_axis": "t", "y_axis": "missing"}
+            }
+        ).json()
+        response = client.get(f"/api/charts/{chart['id']}/data")
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Column 'missing' not found"
+
+
+def test_histogram_endpoint(client):
+    """Test 1D and 2D binning of filtered rows and its errors."""
+    dataset = upload(client)
+    url = f"/api/datasets/{dataset['id']}/histogram"
+    
+    response = client.post(url, json={"column": "units", "bins": 5})
+    assert response.status_code == 200
+    assert response.json()["edges"] == [3.0, 4.0, 5.0, 6.0, 7.0, 8.0]
+    assert response.json()["counts"] == [1, 1, 0, 0, 2]
+    
+    response = client.post(
+        url,
+        json={
+            "column": "units",
+            "y_column": "price",
+            "bins": 2,
+            "filters": [{"column": "region", "operator": "eq", "value": "north"}]
+        }
+    )
+    assert response.json()["count"] == 2
+    assert response.json()["counts"] == [[1, 0], [0, 1]]
+    
+    assert client.post(url, json={"column": "region"}).status_code == 400
+    assert client.post(url, json={"column": "units", "method": "log"}).status_code == 400
+    assert client.post(url, json={"column": "missing"}).status_code == 400
+
+
+def test_query_aggregates_a_filtered_subset(client):
+    """Test filtering, grouping with several aggregates and sorting in one query."""
+    dataset = upload(client)
+    
+    response = client.post(
+        f"/api/datasets/{dataset['id']}/query",
+        json={
+            "filters": [{"column": "price", "operator": "gt", "value": 2}],
+            "group_by": ["region"],
+            "aggregates": [
+                {"column": "units", "operation": "sum", "alias": "units"},
+                {"column": "price", "operation": "max"}
+            ],
+            "sort": [{"column": "units", "direction": "desc"}]
+        }
+    )
+    assert response.status_code == 200
+    assert response.json()["data"] == [
+        {"region": "north", "units": 8.0, "price_max": 5.5},
+        {"region": "east", "units": 7.0, "price_max": 4.5},
+        {"region": "south", "units": 4.0, "price_max": 2.5}
+    ]
+
+
+def test_query_projects_and_pages_rows(client):
+    """Test projection, sort and paging of filtered rows."""
+    dataset = upload(client)
+    
+    response = client.post(
+        f"/api/datasets/{dataset['id']}/query",
+        json={
+            "filters": [{"column": "region", "operator": "eq", "value": "north"}],
+            "columns": ["id", "price"],
+            "sort": [{"column": "price", "direction": "desc"}],
+            "page_size": 2
+        }
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["data"] == [{"id": 5, "price": 5.5}, {"id": 3, "price": 3.5}]
+    assert data["total_rows"] == 3
+    
+    response = client.post(
+        f"/api/datasets/{dataset['id']}/query", json={"columns": ["missing"]}
+    )
+    assert response.status_code == 400
+
+
+def test_row_queries_read_only_the_page(client, monkeypatch):
+    """Test that an unfiltered row query reads only the selected columns of the page."""
+    dataset = upload(client)
+    monkeypatch.setattr(
+        "app.services.dataset_cache.load_dataframe",
+        lambda *args, **kwargs: pytest.fail("query loaded whole columns")
+    )
+    read = []
+    read_column = ColumnStore._read_column
+    
+    def spy(self, name, start, stop):
+        read.append(name)
+        return read_column(self, name, start, stop)
+    
+    monkeypatch.setattr(ColumnStore, "_read_column", spy)
+    
+    response = client.post(
+        f"/api/datasets/{dataset['id']}/query",
+        json={"columns": ["price", "id"], "page": 2, "page_size": 2}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["data"] == [{"price": 3.5, "id": 3}, {"price": 4.5, "id": 4}]
+    assert data["total_rows"] == 5
+    assert sorted(read) == ["id", "price"]
+
+
+def test_bool_column_stats(client):
+    """Test statistics of a True/False column uploaded end to end."""
+    dataset = upload(client, "id,flag\n1,True\n2,False\n3,True\n4,True\n")
+    
+    response = client.get(f"/api/datasets/{dataset['id']}/columns/flag/stats")
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["mean"] == 0.75
+    assert stats["min"] == 0.0 and stats["max"] == 1.0
+    assert "histogram" not in stats
+
+
+def test_column_stats_are_cached(client):
+    """Test column statistics and that repeated requests hit the result cache."""
+    dataset = upload(client)
+    url = f"/api/datasets/{dataset['id']}/columns/units/stats"
+    
+    first = client.get(url)
+    assert first.status_code == 200
+    assert first.json()["count"] == 4
+    assert first.json()["null_count"] == 1
+    assert first.json()["max"] == 8
+    
+    hits = client.get("/health").json()["result_cache"]["hits"]
+    assert client.get(url).json() == first.json()
+    assert client.get("/health").json()["result_cache"]["hits"] == hits + 1
+    
+    response = client.get(f"/api/datasets/{dataset['id']}/columns/missing/stats")
+    assert response.status_code == 400
+
+
+def test_stats_and_approximate_aggregates_come_from_the_catalog(client, monkeypatch):
+    """Test that stats and approximate aggregates are answered without reading the data."""
+    dataset = upload(client)
+    monkeypatch.setattr(
+        "app.api.routes.datasets.load_dataframe",
+        lambda *args, **kwargs: pytest.fail("request read the data")
+    )
+    
+    response = client.get(f"/api/datasets/{dataset['id']}/columns/units/stats")
+    assert response.status_code == 200
+    stats = response.json()
+    assert (stats["count"], stats["max"], stats["median"]) == (4, 8, 5.5)
+    assert sum(stats["histogram"]["counts"]) == 4
+    assert stats["histogram"]["edges"][0] == 3
+    
+    response = client.get(f"/api/datasets/{dataset['id']}/columns/region/stats")
+    assert response.json()["top_values"][0] == {"value": "north", "count": 3}
+    
+    response = client.post(
+        f"/api/datasets/{dataset['id']}/aggregate",
+        json={
+            "aggregates": [
+                {"column": "units", "operation": "sum", "alias": "units"},
+                {"column": "price", "operation": "p50"}
+            ],
+            "approximate": True
+        }
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert result["approximate"] is True
+    assert result["results"] == {"units": 22.0, "price_p50": 3.5}
+    assert result["error_bounds"] == {"units": 0.0, "price_p50": 0.0}
+
+
+# Cleanup
+def teardown_module(module):
+    """Clean up test database."""
+    import os
+    if os.path.exists("./test_datasets.db"):
+        os.remove("./test_datasets.db")
@@ -0,0 +1,160 @@
+import pandas as pd
+import pytest
+
+from app.services.data_processor import DataProcessor
+from app.services.ingest import ColumnProfile, ingest_csv
+from app.services.stats_catalog import StatsCatalog, build_column_stats
+
+
+CSV = (
+    "id,region,units,price\n"
+    "1,north,3,1.5\n"
+    "2,south,4,2.5\n"
+    "3,north,,3.5\n"
+    "4,east,7,4.5\n"
+    "5,x1,8,5.5\n"
+)
+
+
+@pytest.mark.parametrize("storage_format", ["columns", "parquet"])
+def test_chunked_ingest_matches_full_read(tmp_path, storage_format):
+    """Test that small chunks produce the same data and schema as a full read."""
+    csv_path = tmp_path / "sales.csv"
+    csv_path.write_text(CSV)
+    storage_path = tmp_path / f"sales.{storage_format}"
+    
+    schema = ingest_csv(str(csv_path), str(storage_path), storage_format, chunk_rows=2)
+    
+    expected = DataProcessor.read_csv(str(csv_path))
+    stored = DataProcessor.read_dataset(str(storage_path), storage_format)
+    pd.testing.assert_frame_equal(stored, expected, check_dtype=False)
+    
+    full_schema = DataProcessor.infer_schema(expected)
+    assert schema["row_count"] == full_schema["row_count"] == 5
+    for streamed, full in zip(schema["columns"], full_schema["columns"]):
+        assert streamed["type"] == full["type"]
+        assert streamed["nullable"] == full["nullable"]
+        assert streamed["unique_count"] == full["unique_count"]
+        assert streamed["semantic_type"] == full["semantic_type"]
+        assert streamed.get("mean") == pytest.approx(full.get("mean"))
+
+
+def test_ingest_widens_dtypes_across_chunks(tmp_path):
+    """Test that a column that turns to text in a later chunk is stored as text."""
+    csv_path = tmp_path / "codes.csv"
+    csv_path.write_text("code\n1\n2\nA3\n")
+    
+    schema = ingest_csv(str(csv_path), str(tmp_path / "codes.columns"), "columns", chunk_rows=2)
+    stored = DataProcessor.read_dataset(str(tmp_path / "codes.columns"), "columns")
+    
+    assert schema["columns"][0]["type"] == "object"
+    assert stored["code"].tolist() == ["1", "2", "A3"]
+
+
+@pytest.mark.parametrize("storage_format", ["columns", "parquet", "csv"])
+def test_ingest_dictionary_encodes_low_cardinality_text(tmp_path, storage_format):
+    """Test that repetitive text columns are stored and loaded as categories."""
+    csv_path = tmp_path / "orders.csv"
+    csv_path.write_text("id,status\n1,open\n2,closed\n3,open\n4,\n5,open\n6,closed\n")
+    storage_path = None if storage_format == "csv" else str(tmp_path / f"orders.{storage_format}")
+    
+    schema = ingest_csv(
+        str(csv_path), storage_path, storage_format, chunk_rows=2, category_ratio=0.5
+    )
+    stored = DataProcessor.read_dataset(
+        storage_path or str(csv_path), storage_format, dtypes={"status": "category"}
+    )
+    
+    assert [c["type"] for c in schema["columns"]] == ["int64", "category"]
+    assert schema["columns"][1]["unique_count"] == 2
+    assert stored["status"].dtype == "category"
+    assert list(stored["status"].cat.categories) == ["closed", "open"]
+    assert stored["status"].iloc[2] == "open"
+    assert pd.isna(stored["status"].iloc[3])
+
+
+def test_ingest_keeps_high_cardinality_text_plain(tmp_path):
+    """Test that text with too many distinct values is not dictionary encoded."""
+    csv_path = tmp_path / "events.csv"
+    rows = [f"{i},user{i % 6},{'open' if i % 2 else 'closed'}" for i in range(24)]
+    csv_path.write_text("id,user,status\n" + "\n".join(rows) + "\n")
+    
+    schema = ingest_csv(
+        str(csv_path), str(tmp_path / "events.columns"), "columns",
+        chunk_rows=4, category_ratio=0.5, category_max_distinct=4
+    )
+    
+    # Both are under the ratio, but only status is under the distinct cap
+    assert [c["type"] for c in schema["columns"]] == ["int64", "object", "category"]
+    assert schema["columns"][1]["unique_count"] == 6
+    
+    
+    
+    """Test that a CSV with no rows still records its columns."""
+    csv_path = tmp_path / "empty.csv"
+    csv_path.write_text("a,b\n")
+    
+    schema = ingest_csv(str(csv_path), str(tmp_path / "empty.columns"), "columns", chunk_rows=2)
+    
+    assert schema["row_count"] == 0
+    assert [c["name"] for c in schema["columns"]] == ["a", "b"]
+
+
+def test_column_profiles_merge():
+    """Test that merged chunk profiles equal a profile of the whole column."""
+    values = pd.Series([1.0, 5.0, None, 3.0, 5.0, 9.0])
+    whole = ColumnProfile("v", "float64")
+    whole.update(values)
+    
+    left, right = ColumnProfile("v", "float64"), ColumnProfile("v", "float64")
+    left.update(values.iloc[:3])
+    right.update(values.iloc[3:])
+    left.merge(right)
+    
+    assert left.to_schema() == whole.to_schema()
+
+
+def test_ingest_records_stats_catalog(tmp_path):
+    """Test that the catalog written at ingest answers stats without the data."""
+    csv_path = tmp_path / "sales.csv"
+    csv_path.write_text(CSV)
+    storage_path = tmp_path / "sales.columns"
+    ingest_csv(str(csv_path), str(storage_path), "columns", chunk_rows=2)
+    
+    catalog = StatsCatalog.load(StatsCatalog.path_for(str(storage_path)))
+    expected = DataProcessor.get_column_stats(DataProcessor.read_csv(str(csv_path)), "units")
+    stats = catalog.column_stats("units")
+    for key in ("count", "null_count", "unique_count", "mean", "std", "min", "max", "median"):
+        assert stats[key] == pytest.approx(expected[key])
+    
+    assert catalog.aggregate("price", "sum") == (17.5, 0.0)
+    assert catalog.aggregate("region", "count_distinct") == (4, 0.0)
+    assert catalog.aggregate("region", "sum") is None
+    assert catalog.column_stats("missing") is None
+
+
+def test_column_stats_cover_bool_columns_and_survive_failures(tmp_path, monkeypatch):
+    """Test exact stats of a bool column, and that one failing column leaves the others."""
+    csv_path = tmp_path / "flags.csv"
+    csv_path.write_text("id,flag,region\n1,True,north\n2,False,south\n3,True,north\n4,True,east\n")
+    storage_path = str(tmp_path / "flags.columns")
+    schema = ingest_csv(str(csv_path), storage_path, "columns", chunk_rows=2)
+    
+    build_column_stats(storage_path, "columns", schema)
+    catalog = StatsCatalog.load(StatsCatalog.path_for(storage_path))
+    assert catalog.exact_stats("flag")["mean"] == 0.75
+    assert catalog.exact_stats("flag")["top_values"][0] == {"value": True, "count": 3}
+    
+    get_column_stats = DataProcessor.get_column_stats
+    
+    def failing_stats(df, column):
+        if column == "flag":
+            raise TypeError("unsupported column")
+        return get_column_stats(df, column)
+    
+    monkeypatch.setattr(DataProcessor, "get_column_stats", staticmethod(failing_stats))
+    build_column_stats(storage_path, "columns", schema)
+    catalog = StatsCatalog.load(StatsCatalog.path_for(storage_path))
+    assert catalog.exact_stats("flag") is None
+    assert catalog.exact_stats("region")["unique_count"] == 3
+    assert catalog.exact_stats("id")["max"] == 4.0
@@ -0,0 +1,97 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.deadlines import Deadline, QueryCancelled, QueryTimeout, check_deadline, deadline_scope
+from app.services.process_pool import ProcessPool
+
+
+def make_result(rows: int):
+    frame = pd.DataFrame({
+        "id": np.arange(rows),
+        "region": pd.Categorical(["north", "south"] * (rows // 2)),
+        "value": np.linspace(0, 1, rows)
+    })
+    return frame, np.arange(rows, dtype=np.int64) * 2, "done"
+
+
+def fail(message: str):
+    raise ValueError(message)
+
+
+def spin(seconds: float) -> int:
+    stop = time.monotonic() + seconds
+    checks = 0
+    while time.monotonic() < stop:
+        check_deadline()
+        checks += 1
+    return checks
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = ProcessPool(workers=1, min_rows=0)
+    yield pool
+    pool.shutdown()
+
+
+def test_results_come_back_through_shared_memory(pool):
+    """Test that frames, arrays and plain values returned by a worker round-trip."""
+    frame, positions, status = pool.run(make_result, 1000)
+    
+    expected_frame, expected_positions, _ = make_result(1000)
+    pd.testing.assert_frame_equal(frame, expected_frame)
+    np.testing.assert_array_equal(positions, expected_positions)
+    assert status == "done"
+    
+    frame, positions, _ = pool.run(make_result, 0)
+    assert len(frame) == 0 and len(positions) == 0
+
+
+def test_worker_errors_are_raised(pool):
+    """Test that an exception in a worker reaches the caller."""
+    with pytest.raises(ValueError, match="bad column"):
+        pool.run(fail, "bad column")
+
+
+def test_tasks_stop_at_the_deadline(pool):
+    """Test that the caller's deadline holds both while waiting and in the worker."""
+    pool.run(spin, 0)
+    started = time.monotonic()
+    with deadline_scope(Deadline(0.2)):
+        with pytest.raises(QueryTimeout):
+            pool.run(spin, 5)
+    assert time.monotonic() - started < 1
+    
+    # The worker gave up too, so it is free for the next task
+    started = time.monotonic()
+    assert pool.run(spin, 0) == 0
+    assert time.monotonic() - started < 1
+
+
+def test_tasks_stop_when_cancelled(pool):
+    """Test that cancelling a query, as a disconnect does, stops the worker too."""
+    pool.run(spin, 0)
+    deadline = Deadline(None)
+    threading.Timer(0.2, deadline.cancel).start()
+    started = time.monotonic()
+    with deadline_scope(deadline):
+        with pytest.raises(QueryCancelled):
+            pool.run(spin, 5)
+    assert time.monotonic() - started < 1
+    
+    # Without a time limit only the shared flag could have stopped the worker
+    started = time.monotonic()
+    assert pool.run(spin, 0) == 0
+    assert time.monotonic() - started < 1
+
+
+def test_disabled_pool_runs_inline():
+    """Test that a pool without workers calls the task directly."""
+    pool = ProcessPool(workers=0, min_rows=0)
+    
+    assert not pool.offloads(10 ** 9)
+    assert pool.run(len, "abc") == 3
@@ -0,0 +1,34 @@
+import time
+
+from app.services.result_cache import LocalResultCache
+
+
+def test_local_cache_roundtrip_and_invalidate():
+    """Test that cached results are returned until their dataset is invalidated."""
+    cache = LocalResultCache(max_bytes=1_000_000, ttl=60, max_entry_bytes=10_000)
+    key = (1, "v1", "aggregate", "abc")
+    cache.set(key, b'{"result":3}')
+    
+    assert cache.get(key) == b'{"result":3}'
+    
+    cache.invalidate(1)
+    assert cache.get(key) is None
+
+
+def test_local_cache_expires_entries():
+    """Test that entries are not served after their TTL."""
+    cache = LocalResultCache(max_bytes=1_000_000, ttl=0, max_entry_bytes=10_000)
+    key = (1, "v1", "filter", "abc")
+    cache.set(key, b'{"data":[]}')
+    time.sleep(0.01)
+    
+    assert cache.get(key) is None
+
+
+def test_local_cache_skips_large_results():
+    """Test that results over the entry size limit are not stored."""
+    cache = LocalResultCache(max_bytes=1_000_000, ttl=60, max_entry_bytes=100)
+    key = (1, "v1", "filter", "abc")
+    cache.set(key, b"x" * 200)
+    
+    assert cache.get(key) is None
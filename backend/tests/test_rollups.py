@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.data_processor import DataProcessor
+from app.services.rollups import Rollup, RollupStore, chart_rollup_spec
+
+AGGREGATES = [
+    {"column": "units", "operation": "sum"},
+    {"column": "units", "operation": "avg", "alias": "mean_units"},
+    {"column": "price", "operation": "min"},
+    {"column": "price", "operation": "max"},
+    {"column": "price", "operation": "count"}
+]
+
+
+def sample_frame() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = 5000
+    df = pd.DataFrame({
+        "region": pd.Series(rng.choice(["east", "north", "south", None], n)).astype("category"),
+        "year": rng.integers(2019, 2024, n).astype(float),
+        "units": rng.integers(0, 100, n).astype(float),
+        "price": rng.normal(10, 3, n)
+    })
+    df.loc[rng.random(n) < 0.05, "year"] = np.nan
+    df.loc[rng.random(n) < 0.05, "units"] = np.nan
+    df.loc[df["region"] == "south", "price"] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("group_by", [["region", "year"], ["region"], ["year"]])
+def test_rollup_matches_raw_aggregates(group_by):
+    """Test that rollups and coarser rollups derived from them match a scan."""
+    df = sample_frame()
+    fine = Rollup.build(df, ["region", "year"], ["units", "price"])
+    expected = DataProcessor.aggregate_many(df, AGGREGATES, group_by)
+    
+    for rollup in (fine, fine.derive(group_by, ["units", "price"])):
+        assert rollup.covers(group_by, AGGREGATES)
+        pd.testing.assert_frame_equal(
+            rollup.aggregate(group_by, AGGREGATES), expected, check_dtype=False
+        )
+    
+    assert not fine.covers(group_by, [{"column": "units", "operation": "median"}])
+    assert not fine.covers(["units"], AGGREGATES[:1])
+
+
+def test_store_round_trip_and_plan(tmp_path):
+    """Test that charts sharing groups share a rollup and the store reloads."""
+    path = tmp_path / "sales.parquet"
+    DataProcessor.write_parquet(sample_frame(), str(path))
+    specs = [
+        chart_rollup_spec("bar", {"x_axis": "region", "y_axis": ["units", "price"]}),
+        chart_rollup_spec("pie", {"labels": "region", "values": "units"}),
+        chart_rollup_spec("line", {"x_axis": "year", "y_axis": "units", "group_by": ["region"]}),
+        chart_rollup_spec("scatter", {"x_axis": "units", "y_axis": "price"})
+    ]
+    assert specs[3] is None
+    
+    store = RollupStore.build(str(path), "parquet", (1, 2), specs[:3])
+    assert [r.group_by for r in store.rollups] == [["year", "region"], ["region"]]
+    
+    store.save(RollupStore.directory_for(str(path)))
+    loaded = RollupStore.load(RollupStore.directory_for(str(path)))
+    assert loaded.version == (1, 2)
+    rollup = loaded.find(["region"], AGGREGATES[:2])
+    assert rollup.group_by == ["region"]
+    pd.testing.assert_frame_equal(
+        rollup.aggregate(["region"], AGGREGATES[:2]),
+        store.rollups[1].aggregate(["region"], AGGREGATES[:2])
+    )
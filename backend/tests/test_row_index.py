@@ -0,0 +1,75 @@
+import os
+
+import pandas as pd
+import pytest
+
+from app.services.row_index import CsvRowIndex
+
+
+CSV = 'a,"b\nc"\n1,"x\ny"\n\n2,"q"""\r\n3,z\r\n\r\n4,w\n5,"\n"\n'
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "quoted.csv"
+    path.write_text(CSV, newline="")
+    return str(path)
+
+
+@pytest.mark.parametrize("stride", [1, 2, 3, 10])
+def test_read_rows_matches_full_read(csv_path, stride, monkeypatch):
+    """Test every page against pandas, with quoted newlines and blank lines."""
+    # Tiny blocks exercise records that span block boundaries
+    monkeypatch.setattr(CsvRowIndex, "BLOCK_SIZE", 5)
+    full = pd.read_csv(csv_path)
+    index = CsvRowIndex.build(csv_path, stride)
+    
+    assert index.row_count == len(full) == 5
+    for start in range(len(full)):
+        for stop in range(start + 1, len(full) + 2):
+            page = index.read_rows(
+                csv_path, start, stop, list(full.columns), {"a": "int64", "b\nc": object}
+            )
+            pd.testing.assert_frame_equal(page, full.iloc[start:stop], check_index_type=False)
+
+
+def test_read_rows_parses_only_selected_columns(csv_path):
+    """Test that a projected page holds only the requested columns."""
+    index = CsvRowIndex.build(csv_path, 2)
+    names = ["a", "b\nc"]
+    
+    page = index.read_rows(csv_path, 1, 4, names, {"a": "int64"}, ["a"])
+    assert list(page.columns) == ["a"]
+    assert page["a"].tolist() == [2, 3, 4]
+    assert list(index.read_rows(csv_path, 5, 5, names, columns=["a"]).columns) == ["a"]
+
+
+def test_load_or_build_rebuilds_stale_index(csv_path):
+    """Test that an index is rebuilt after the CSV changes."""
+    CsvRowIndex.load_or_build(csv_path, 2)
+    with open(csv_path, "a", newline="") as f:
+        f.write("6,v\n")
+    
+    index = CsvRowIndex.load_or_build(csv_path, 2)
+    
+    assert index.row_count == 6
+    assert CsvRowIndex.load(CsvRowIndex.path_for(csv_path)).row_count == 6
+
+
+def test_load_or_build_rebuilds_after_same_size_rewrite(csv_path):
+    """Test that rewriting the CSV in place with the same length invalidates the index."""
+    rows = "a,b\n1,x\n2,y\n3,z\n"
+    with open(csv_path, "w", newline="") as f:
+        f.write(rows)
+    stat = os.stat(csv_path)
+    CsvRowIndex.load_or_build(csv_path, 1)
+    
+    with open(csv_path, "w", newline="") as f:
+        f.write("a,b\n10,x\n2\n3,zz\n")
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert os.path.getsize(csv_path) == len(rows)
+    
+    index = CsvRowIndex.load_or_build(csv_path, 1)
+    page = index.read_rows(csv_path, 2, 3, ["a", "b"])
+    assert page["a"].tolist() == [3]
+    assert page["b"].tolist() == ["zz"]
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+from app.services.sketches import DistinctCounter, HyperLogLog, KllSketch, hash_values
+
+
+def test_hyperloglog_estimate_within_error():
+    """Test that the estimate is within a few standard errors."""
+    sketch = HyperLogLog()
+    sketch.add_hashes(hash_values(pd.Series(np.arange(200000))))
+    
+    assert abs(sketch.count() - 200000) / 200000 < 4 * sketch.relative_error
+
+
+def test_hyperloglog_merge_matches_union():
+    """Test that merging sketches equals sketching the union."""
+    left, right, union = HyperLogLog(), HyperLogLog(), HyperLogLog()
+    a = hash_values(pd.Series(np.arange(0, 50000)))
+    b = hash_values(pd.Series(np.arange(25000, 75000)))
+    left.add_hashes(a)
+    right.add_hashes(b)
+    union.add_hashes(np.concatenate([a, b]))
+    
+    left.merge(right)
+    
+    assert left.count() == union.count()
+
+
+def test_distinct_counter_is_exact_below_limit():
+    """Test exact counting until the limit, then approximation."""
+    counter = DistinctCounter(exact_limit=100)
+    counter.add(pd.Series(["a", "b", "a", None]))
+    assert counter.is_exact
+    assert counter.count() == 2
+    
+    counter.add(pd.Series(np.arange(1000)))
+    assert not counter.is_exact
+    assert abs(counter.count() - 1002) < 50
+
+
+def test_kll_quantiles_within_rank_error():
+    """Test that merged KLL quantiles stay within the stated rank error."""
+    values = np.random.default_rng(1).lognormal(size=400000)
+    left, right = KllSketch(), KllSketch()
+    left.add(values[:250000])
+    right.add(values[250000:])
+    left.merge(right)
+    
+    assert left.count == len(values)
+    ordered = np.sort(values)
+    for q in (0.01, 0.25, 0.5, 0.9, 0.99):
+        rank = np.searchsorted(ordered, left.quantile(q)) / len(values)
+        assert abs(rank - q) <= 2 * left.rank_error
+
+
+def test_kll_is_exact_while_small():
+    """Test that a sketch below its capacity gives exact quantiles."""
+    sketch = KllSketch()
+    sketch.add(np.arange(101, dtype=float))
+    
+    assert sketch.rank_error == 0.0
+    assert sketch.quantile(0.5) == 50.0
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.data_processor import DataProcessor
+from app.services.text_index import TextIndex
+
+
+VALUES = pd.Series(
+    ["North Bay", None, "south", "Straße", "northeast", "", "NORTH", "x.y", None, "bay north"],
+    dtype=object
+)
+
+
+@pytest.fixture
+def index(tmp_path):
+    TextIndex.build(VALUES, (123, 456)).save(str(tmp_path / "0"))
+    return TextIndex.load(str(tmp_path / "0"))
+
+
+@pytest.mark.parametrize("operator,value", [
+    ("contains", "north"),
+    ("contains", "ORTH B"),
+    ("contains", "STRASSE"),
+    ("contains", "one"),
+    ("startswith", "N"),
+    ("startswith", "north"),
+    ("startswith", "zzz"),
+    ("endswith", "bay"),
+    ("endswith", "Bay")
+])
+def test_verified_candidates_match_a_full_scan(index, operator, value):
+    """Test that filtering only the candidate rows gives the full-scan result."""
+    expected = np.flatnonzero(DataProcessor._filter_mask(VALUES, operator, value).to_numpy())
+    
+    candidates = index.candidates(operator, value)
+    
+    assert candidates is not None
+    verified = DataProcessor._filter_mask(VALUES.iloc[candidates], operator, value).to_numpy()
+    assert candidates[verified].tolist() == expected.tolist()
+    assert not {1, 8} & set(candidates.tolist())
+
+
+def test_index_narrows_to_matching_rows(index):
+    """Test that trigram and prefix lookups skip rows that cannot match."""
+    assert index.candidates("contains", "north").tolist() == [0, 4, 6, 9]
+    assert index.candidates("startswith", "north").tolist() == [4]
+    assert index.row_count == len(VALUES)
+    assert index.version == (123, 456)
+
+
+def test_unindexable_searches_fall_back_to_scanning(index, tmp_path):
+    """Test that short values and regular expressions are not served by the index."""
+    assert index.candidates("contains", "no") is None
+    assert index.candidates("contains", "x.y") is None
+    assert index.candidates("startswith", "") is None
+    assert index.candidates("eq", "north") is None
+    assert TextIndex.load(str(tmp_path / "missing")) is None
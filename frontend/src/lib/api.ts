@@ -6,13 +6,19 @@ import type {
   User,
   Dataset,
   DatasetData,
+  DatasetStatus,
   FilterQuery,
+  SortKey,
   AggregateRequest,
   AggregateResult,
+  BinRequest,
+  BinResult,
   Sheet,
   SheetCreate,
   Chart,
   ChartCreate,
+  ChartData,
+  QueryOptions,
 } from '@/types';
 
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
@@ -24,6 +30,11 @@ const api = axios.create({
   },
 });
 
+const queryConfig = ({ signal, timeout }: QueryOptions = {}) => ({
+  signal,
+  params: timeout === undefined ? {} : { timeout },
+});
+
 // Request interceptor to add auth token
 api.interceptors.request.use(
   (config) => {
@@ -125,20 +136,41 @@ export const datasetAPI = {
     return response.data;
   },
 
-  getData: async (id: number, page = 1, pageSize = 100): Promise<DatasetData> => {
-    const response = await api.get(`/api/datasets/${id}/data`, {
-      params: { page, page_size: pageSize },
-    });
+  getStatus: async (id: number): Promise<DatasetStatus> => {
+    const response = await api.get(`/api/datasets/${id}/status`);
     return response.data;
   },
 
-  filter: async (id: number, query: FilterQuery): Promise<DatasetData> => {
-    const response = await api.post(`/api/datasets/${id}/filter`, query);
+  getData: async (
+    id: number,
+    page = 1,
+    pageSize = 100,
+    sort: SortKey[] = []
+  ): Promise<DatasetData> => {
+    const params = new URLSearchParams({ page: String(page), page_size: String(pageSize) });
+    sort.forEach((key) =>
+      params.append('sort', `${key.column}:${key.direction}:nulls_${key.nulls ?? 'last'}`)
+    );
+    const response = await api.get(`/api/datasets/${id}/data`, { params });
     return response.data;
   },
 
-  aggregate: async (id: number, request: AggregateRequest): Promise<AggregateResult> => {
-    const response = await api.post(`/api/datasets/${id}/aggregate`, request);
+  filter: async (id: number, query: FilterQuery, options?: QueryOptions): Promise<DatasetData> => {
+    const response = await api.post(`/api/datasets/${id}/filter`, query, queryConfig(options));
+    return response.data;
+  },
+
+  aggregate: async (
+    id: number,
+    request: AggregateRequest,
+    options?: QueryOptions
+  ): Promise<AggregateResult> => {
+    const response = await api.post(`/api/datasets/${id}/aggregate`, request, queryConfig(options));
+    return response.data;
+  },
+
+  histogram: async (id: number, request: BinRequest, options?: QueryOptions): Promise<BinResult> => {
+    const response = await api.post(`/api/datasets/${id}/histogram`, request, queryConfig(options));
     return response.data;
   },
 
@@ -200,6 +232,20 @@ export const chartAPI = {
     return response.data;
   },
 
+  getData: async (
+    id: number,
+    width: number,
+    height: number,
+    options?: QueryOptions
+  ): Promise<ChartData> => {
+    const config = queryConfig(options);
+    const response = await api.get(`/api/charts/${id}/data`, {
+      ...config,
+      params: { width, height, ...config.params },
+    });
+    return response.data;
+  },
+
   update: async (id: number, data: Partial<Chart>): Promise<Chart> => {
     const response = await api.put(`/api/charts/${id}`, data);
     return response.data;
@@ -46,13 +46,16 @@ export default function DashboardPage() {
   const { data: datasets, isLoading } = useQuery({
     queryKey: ['datasets'],
     queryFn: datasetAPI.list,
+    // Poll while uploads are still being ingested in the background
+    refetchInterval: (query) =>
+      query.state.data?.some((dataset) => dataset.status === 'processing') ? 2000 : false,
   });
 
   const uploadMutation = useMutation({
     mutationFn: ({ name, file, description }: { name: string; file: File; description?: string }) =>
       datasetAPI.upload(name, file, description),
     onSuccess: () => {
-      toast.success('Dataset uploaded successfully!');
+      toast.success('Dataset uploaded, processing...');
       queryClient.invalidateQueries({ queryKey: ['datasets'] });
       setShowUpload(false);
       setUploadData({ name: '', description: '', file: null });
@@ -197,6 +200,14 @@ export default function DashboardPage() {
                     <Box sx={{ display: 'flex', gap: 1 }}>
                       <Chip label={`${dataset.row_count.toLocaleString()} rows`} size="small" />
                       <Chip label={`${dataset.column_count} columns`} size="small" />
+                      {dataset.status !== 'ready' && (
+                        <Chip
+                          label={dataset.status}
+                          size="small"
+                          color={dataset.status === 'failed' ? 'error' : 'warning'}
+                          title={dataset.error}
+                        />
+                      )}
                     </Box>
                   </CardContent>
                   <CardActions>
@@ -204,6 +215,7 @@ export default function DashboardPage() {
                       size="small"
                       startIcon={<Visibility />}
                       onClick={() => navigate(`/dataset/${dataset.id}`)}
+                      disabled={dataset.status !== 'ready'}
                     >
                       View
                     </Button>
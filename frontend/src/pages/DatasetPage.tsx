@@ -1,5 +1,6 @@
+import { useState } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
-import { useQuery } from '@tanstack/react-query';
+import { keepPreviousData, useQuery } from '@tanstack/react-query';
 import {
   AppBar,
   Toolbar,
@@ -11,8 +12,9 @@ import {
   IconButton,
 } from '@mui/material';
 import { ArrowBack, BarChart } from '@mui/icons-material';
-import { DataGrid, GridColDef } from '@mui/x-data-grid';
+import { DataGrid, GridColDef, GridPaginationModel, GridSortModel } from '@mui/x-data-grid';
 import { datasetAPI } from '@/lib/api';
+import type { SortKey } from '@/types';
 
 export default function DatasetPage() {
   const { id } = useParams<{ id: string }>();
@@ -23,22 +25,34 @@ export default function DatasetPage() {
     queryFn: () => datasetAPI.get(Number(id)),
   });
 
-  const { data: datasetData } = useQuery({
-    queryKey: ['dataset-data', id],
-    queryFn: () => datasetAPI.getData(Number(id), 1, 100),
+  const [paginationModel, setPaginationModel] = useState<GridPaginationModel>({
+    page: 0,
+    pageSize: 25,
   });
+  const [sortModel, setSortModel] = useState<GridSortModel>([]);
 
-  const columns: GridColDef[] =
-    datasetData?.data[0]
-      ? Object.keys(datasetData.data[0]).map((key) => ({
-          field: key,
-          headerName: key,
-          width: 150,
-          editable: false,
-        }))
-      : [];
+  // Pages and sort order are served by the backend, which caches sort permutations
+  const sort: SortKey[] = sortModel.map((item) => ({
+    column: item.field,
+    direction: item.sort === 'desc' ? 'desc' : 'asc',
+  }));
 
-  const rows = datasetData?.data.map((row, index) => ({ id: index, ...row })) || [];
+  const { data: datasetData, isFetching } = useQuery({
+    queryKey: ['dataset-data', id, paginationModel, sortModel],
+    queryFn: () =>
+      datasetAPI.getData(Number(id), paginationModel.page + 1, paginationModel.pageSize, sort),
+    placeholderData: keepPreviousData,
+  });
+
+  const columns: GridColDef[] = (dataset?.schema?.columns ?? []).map((column) => ({
+    field: column.name,
+    headerName: column.name,
+    width: 150,
+    editable: false,
+  }));
+
+  const offset = paginationModel.page * paginationModel.pageSize;
+  const rows = datasetData?.data.map((row, index) => ({ id: offset + index, ...row })) || [];
 
   return (
     <Box>
@@ -62,10 +76,18 @@ export default function DatasetPage() {
           <DataGrid
             rows={rows}
             columns={columns}
-            pageSizeOptions={[10, 25, 50, 100]}
-            initialState={{
-              pagination: { paginationModel: { pageSize: 25 } },
+            rowCount={datasetData?.total_rows ?? 0}
+            loading={isFetching}
+            paginationMode="server"
+            sortingMode="server"
+            paginationModel={paginationModel}
+            onPaginationModelChange={setPaginationModel}
+            sortModel={sortModel}
+            onSortModelChange={(model) => {
+              setSortModel(model);
+              setPaginationModel((current) => ({ ...current, page: 0 }));
             }}
+            pageSizeOptions={[10, 25, 50, 100]}
             checkboxSelection
             disableRowSelectionOnClick
           />
@@ -33,14 +33,27 @@ export interface Dataset {
   description?: string;
   file_name: string;
   file_size: number;
+  storage_format?: string;
   row_count: number;
   column_count: number;
   schema?: DatasetSchema;
+  status: DatasetStatusValue;
+  error?: string;
   owner_id: number;
   created_at: string;
   updated_at?: string;
 }
 
+export type DatasetStatusValue = 'processing' | 'ready' | 'failed';
+
+export interface DatasetStatus {
+  id: number;
+  status: DatasetStatusValue;
+  error?: string;
+  row_count: number;
+  column_count: number;
+}
+
 export interface DatasetSchema {
   columns: ColumnInfo[];
   row_count: number;
@@ -67,28 +80,96 @@ export interface DatasetData {
   total_pages: number;
 }
 
+export interface DatasetCursorPage {
+  data: Record<string, any>[];
+  page_size: number;
+  next_cursor: string | null;
+  total_rows: number | null;
+}
+
 export interface FilterRequest {
   column: string;
   operator: 'eq' | 'ne' | 'gt' | 'lt' | 'gte' | 'lte' | 'contains' | 'startswith' | 'endswith';
   value: any;
 }
 
+export interface SortKey {
+  column: string;
+  direction: 'asc' | 'desc';
+  nulls?: 'first' | 'last';
+}
+
 export interface FilterQuery {
   filters: FilterRequest[];
   logic: 'and' | 'or';
+  sort?: SortKey[];
   page: number;
   page_size: number;
+  cursor?: string;
+  include_total?: boolean;
+}
+
+export type AggregateOperation =
+  | 'sum'
+  | 'avg'
+  | 'min'
+  | 'max'
+  | 'count'
+  | 'median'
+  | 'count_distinct'
+  | 'stddev'
+  | 'variance'
+  | `p${number}`;
+
+export interface AggregateSpec {
+  column: string;
+  operation: AggregateOperation;
+  alias?: string;
 }
 
 export interface AggregateRequest {
-  column: string;
-  operation: 'sum' | 'avg' | 'min' | 'max' | 'count' | 'median';
+  column?: string;
+  operation?: AggregateOperation;
+  aggregates?: AggregateSpec[];
   group_by?: string[];
+  approximate?: boolean;
 }
 
 export interface AggregateResult {
   result?: any;
+  results?: Record<string, any>;
   group_results?: Record<string, any>[];
+  approximate?: boolean;
+  error_bounds?: Record<string, number>;
+}
+
+export interface BinRequest {
+  column: string;
+  y_column?: string;
+  method?: 'fixed' | 'quantile' | 'fd';
+  bins?: number;
+  shape?: 'rect' | 'hex';
+  filters?: FilterRequest[];
+  logic?: 'and' | 'or';
+}
+
+export interface BinResult {
+  column: string;
+  y_column?: string;
+  count: number;
+  counts: number[] | number[][];
+  edges?: number[];
+  x_edges?: number[];
+  y_edges?: number[];
+  centers?: [number, number][];
+  hex_size?: [number, number];
+}
+
+export interface QueryOptions {
+  // Abort to cancel the query on the server as well
+  signal?: AbortSignal;
+  // Seconds the server may spend before answering 504
+  timeout?: number;
 }
 
 export interface Sheet {
@@ -125,11 +206,27 @@ export interface ChartConfig {
   y_axis?: string | string[];
   labels?: string;
   values?: string;
+  group_by?: string[];
   title?: string;
   colors?: string[];
   [key: string]: any;
 }
 
+export interface ChartSeries {
+  name: string;
+  x: any[];
+  y: any[];
+  counts?: number[];
+}
+
+export interface ChartData {
+  chart_id: number;
+  chart_type: Chart['chart_type'];
+  series: ChartSeries[];
+  total_points: number;
+  downsampled: boolean;
+}
+
 export interface ChartCreate {
   name: string;
   chart_type: 'line' | 'bar' | 'scatter' | 'pie';